@@ -0,0 +1,57 @@
+'''
+    PyGo - a game of Go
+
+    The names below can be imported from app, each module is only imported
+    the first time one of its names is used. The game logic never imports
+    PyQt, so headless tools don't pay for it, only the GUI (Go, Board and
+    ScoreBoard) does
+'''
+import importlib
+
+# The module each name is imported from
+EXPORTS = {
+    'GameLogic': 'game_logic',
+    'Player': 'game_logic',
+    'GameOverPassError': 'game_logic',
+    'KOError': 'game_logic',
+    'OccupiedError': 'game_logic',
+    'SuicideError': 'game_logic',
+    'Piece': 'piece',
+    'Move': 'move',
+    'History': 'history',
+    'Instrumentation': 'instrumentation',
+    'Journal': 'journal',
+    'MCTS': 'mcts',
+    'PlayoutBoard': 'playout',
+    'TranspositionTable': 'transposition',
+    'MoveAnalysis': 'analysis',
+    'runAnalysis': 'analysis',
+    'GameServer': 'server',
+    'Go': 'go',
+    'Board': 'board',
+    'ScoreBoard': 'score_board'
+}
+
+__all__ = sorted(EXPORTS)
+
+
+def __getattr__(name):
+    '''
+        Import a name's module the first time the name is used
+
+        Args:
+            name (str): The name
+
+        Returns:
+            Any
+    '''
+    if name not in EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module('.' + EXPORTS[name], __name__),
+                    name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,52 @@
+'''
+    Runs PyGo from the command line, python -m app COMMAND [OPTIONS]
+
+    Only the command's own module is imported, so the headless commands
+    start without importing PyQt (or NumPy). Pass --help after a command for
+    its options
+
+    Commands:
+        gui:        Play in the window (the default)
+        selfplay:   Play headless games across every core
+        server:     Host games over line-delimited JSON
+        bench:      Benchmark the game logic
+        gtp:        Play over the Go Text Protocol on stdin and stdout
+'''
+import importlib
+import sys
+import textwrap
+
+# The module with the main function for each command
+COMMANDS = {
+    'gui': 'app.go',
+    'selfplay': 'app.selfplay',
+    'server': 'app.server',
+    'bench': 'app.benchmark',
+    'gtp': 'app.gtp'
+}
+
+
+def main(arguments=None):
+    '''
+        Run a command
+
+        Args:
+            arguments (list): The command line arguments, the command first
+
+        Returns:
+            Int (the exit status)
+    '''
+    arguments = sys.argv[1:] if arguments is None else list(arguments)
+    if arguments and arguments[0] in ('-h', '--help'):
+        sys.stdout.write(textwrap.dedent(__doc__).strip() + "\n")
+        return 0
+    command = arguments.pop(0) if arguments else 'gui'
+    if command not in COMMANDS:
+        sys.stderr.write("Unknown command {}, use one of: {}\n".format(
+            command, ", ".join(COMMANDS)))
+        return 2
+    return importlib.import_module(COMMANDS[command]).main(arguments) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
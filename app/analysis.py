@@ -0,0 +1,217 @@
+'''
+    Analyses every legal move of a position across a pool of processes
+'''
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import random
+
+from .game_logic import GameLogic, KOError, OccupiedError, SuicideError
+from .journal import decodeCheckpoint, encodeCheckpoint
+from .playout import PlayoutBoard
+from .selfplay import getSeed
+
+# The position analysed by this process, loaded once by loadPosition
+position = None
+
+
+class MoveAnalysis:
+    '''
+        The analysis of one candidate move
+
+        Args:
+            point       (int):   The flat point index of the move
+            row         (int):   The row of the move
+            col         (int):   The col of the move
+            scoreDelta  (int):   How much the move changes the mover's lead
+                                 over the opponent
+            captures    (int):   The opponent's pieces the move takes
+            winRate     (float): The share of random playouts after the move
+                                 won by the mover, None if none were run
+    '''
+    __slots__ = ('point', 'row', 'col', 'scoreDelta', 'captures', 'winRate')
+
+    def __init__(self, point, row, col, scoreDelta, captures, winRate=None):
+        self.point = point
+        self.row = row
+        self.col = col
+        self.scoreDelta = scoreDelta
+        self.captures = captures
+        self.winRate = winRate
+
+    def toDict(self):
+        '''
+            Get the analysis as a dictionary of plain values
+
+            Returns:
+                Dict
+        '''
+        return {
+            'point': self.point,
+            'row': self.row,
+            'col': self.col,
+            'scoreDelta': self.scoreDelta,
+            'captures': self.captures,
+            'winRate': self.winRate
+        }
+
+
+def loadPosition(data):
+    '''
+        Load the position to analyse into this process, the pool runs this
+        once in each worker so tasks only send their points
+
+        Args:
+            data (bytes): The game, encoded by encodeCheckpoint
+    '''
+    global position
+    generation, rows, columns, clocks, history = decodeCheckpoint(data)
+    position = GameLogic(GameLogic.makeBoard(rows, columns))
+    position.loadHistory(history)
+    position.stopClocks()
+
+
+def getLead(logic, piece):
+    '''
+        Get how far a player's score is ahead of their opponent's
+
+        Args:
+            logic   (GameLogic): The game
+            piece   (Piece):     The player
+
+        Returns:
+            Int
+    '''
+    players = logic.getPlayers()
+    return (players[piece].getScore() -
+            players[logic.getOtherPiece(piece)].getScore())
+
+
+def getWinRate(logic, playouts, generator):
+    '''
+        Play random games from the position, as the computer player's
+        playouts do
+
+        Args:
+            logic       (GameLogic):     The position after the move
+            playouts    (int):           The games to play
+            generator   (random.Random): The random stream
+
+        Returns:
+            Float (the share won by the player who isn't to move)
+    '''
+    start = PlayoutBoard.fromGameLogic(logic)
+    start.superko = False
+    mover = start.getOpponent()
+    limit = 3 * logic.rows * logic.columns
+    wins = 0.0
+    for playout in range(playouts):
+        board = start.copy()
+        moves = 0
+        while not board.isOver() and moves < limit:
+            board.playRandom(generator)
+            moves += 1
+        winner = board.getWinner()
+        wins += 0.5 if winner is None else float(winner == mover)
+    return wins / playouts
+
+
+def analyseMove(point, playouts=0, seed=None):
+    '''
+        Analyse a move in the position loaded by loadPosition, playing it
+        and taking it back again
+
+        Args:
+            point       (int): The flat point index of the move
+            playouts    (int): The random playouts to run after the move
+            seed        (str): The seed for the playouts
+
+        Returns:
+            MoveAnalysis (or None if the move isn't legal)
+    '''
+    logic = position
+    piece = logic.player
+    lead = getLead(logic, piece)
+    row, col = divmod(point, logic.columns)
+    try:
+        logic.updateBoard(row, col)
+    except (KOError, SuicideError, OccupiedError):
+        return None
+    try:
+        captures = len(logic.getMoves()[-1].getCaptured())
+        winRate = None
+        if playouts:
+            winRate = getWinRate(logic, playouts, random.Random(seed))
+        return MoveAnalysis(point, row, col,
+                            getLead(logic, piece) - lead, captures, winRate)
+    finally:
+        logic.undo()
+
+
+def analyseMoves(points, playouts=0, seed=0):
+    '''
+        Analyse a chunk of moves in the loaded position, each with its own
+        random stream so results don't depend on which worker runs them
+
+        Args:
+            points      (list): The flat point indexes
+            playouts    (int):  The random playouts to run after each move
+            seed        (int):  The seed of the analysis
+
+        Returns:
+            List (of MoveAnalysis, leaving out illegal moves)
+    '''
+    results = (analyseMove(point, playouts, getSeed(seed, point))
+               for point in points)
+    return [result for result in results if result is not None]
+
+
+def runAnalysis(logic,
+                playouts=0,
+                workers=None,
+                seed=0,
+                points=None,
+                chunkSize=1):
+    '''
+        Analyse the legal moves of a game's current position across a pool
+        of processes, yielding each analysis as soon as it's done (so not
+        in board order) for a display that fills in as it goes.
+
+        The position is sent to each worker once, when the pool starts,
+        and each task sends only its points. Stopping the generator early
+        cancels the tasks that haven't started
+
+        Args:
+            logic       (GameLogic): The game to analyse
+            playouts    (int):       The random playouts to run after each
+                                     move, 0 for no win rates
+            workers     (int):       The number of processes, defaults to
+                                     one per core
+            seed        (int):       The seed of the analysis
+            points      (list):      The points to analyse, defaults to
+                                     every legal move
+            chunkSize   (int):       The moves sent to a worker at a time
+
+        Returns:
+            Generator (of MoveAnalysis)
+    '''
+    if points is None:
+        points = list(logic.bitBoard.points(logic.legalMoves()))
+    chunks = [
+        points[index:index + chunkSize]
+        for index in range(0, len(points), chunkSize)
+    ]
+    # The whole game is sent, the workers need its history for the KO rule
+    data = encodeCheckpoint(logic, 0)
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=loadPosition,
+                             initargs=(data, )) as executor:
+        futures = [
+            executor.submit(analyseMoves, chunk, playouts, seed)
+            for chunk in chunks
+        ]
+        try:
+            for future in as_completed(futures):
+                for result in future.result():
+                    yield result
+        finally:
+            for future in futures:
+                future.cancel()
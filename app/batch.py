@@ -0,0 +1,255 @@
+'''
+    Steps a batch of games in lockstep with NumPy
+'''
+from .game_logic import GameLogic
+from .piece import Piece
+from .territory import NumpyTerritory, loadNumpy
+from .zobrist import ZobristTable
+
+numpy = loadNumpy()
+
+
+class BatchGameLogic:
+    '''
+        BatchGameLogic plays the same rules as GameLogic on many independent
+        games at once. The boards are held as one [games, rows, columns]
+        int8 array, and each step takes one move per game and applies the
+        placement, capture, KO and suicide checks to every game with array
+        operations.
+
+        Internally each board is flat with one extra point on the end (see
+        NumpyTerritory), which is used as the neighbour for points on the
+        edges and never holds a piece.
+
+        Args:
+            board (list): The board matrix every game starts from
+            games (int):  The number of games to play
+    '''
+    SKIP_LIMIT = GameLogic.SKIP_LIMIT
+    # The move to skip a go
+    SKIP = -1
+    # The result of a step for each game
+    OK = 0
+    OCCUPIED = 1
+    KO = 2
+    SUICIDE = 3
+    GAME_OVER = 4
+
+    def __init__(self, board, games):
+        if numpy is None:
+            raise ImportError("BatchGameLogic requires NumPy")
+        # If a board isn't created, then fail
+        if not board:
+            raise ValueError(
+                "Board must be a list of lists of equal dimensions")
+        self.startingBoard = [list(row) for row in board]
+        self.games = games
+        self.rows, self.columns = len(board), len(board[0])
+        self.points = self.rows * self.columns
+        # Share the neighbour table with territory counting
+        self.territory = NumpyTerritory.forSize(self.rows, self.columns)
+        self.neighbours = self.territory.neighbours
+        # Hold the Zobrist keys as arrays indexed by [piece, point]
+        zobrist = ZobristTable.forSize(self.rows, self.columns)
+        self.keys = numpy.zeros((3, self.points + 1), dtype=numpy.uint64)
+        for piece in (Piece.White, Piece.Black):
+            self.keys[piece, :self.points] = zobrist.keys[piece]
+        self.startingHash = zobrist.hashBoard(self.startingBoard)
+        self.reset()
+
+    def reset(self):
+        '''
+            Reset every game
+        '''
+        self.arrays = numpy.tile(self.territory.makeArray(self.startingBoard),
+                                 (self.games, 1))
+        # The current player in each game
+        self.players = numpy.full(self.games, Piece.White, dtype=numpy.int8)
+        self.skipCounts = numpy.zeros(self.games, dtype=numpy.int8)
+        # Games that have ended on skips
+        self.over = numpy.zeros(self.games, dtype=bool)
+        # The hash of each game, and every position it has seen for superko
+        self.hashes = numpy.full(self.games,
+                                 self.startingHash,
+                                 dtype=numpy.uint64)
+        self.seenPositions = [{self.startingHash}
+                              for game in range(self.games)]
+        # The score and piece count of each game, indexed by [game, piece]
+        self.scores = numpy.zeros((self.games, 3), dtype=numpy.int64)
+        self.pieces = numpy.zeros((self.games, 3), dtype=numpy.int64)
+
+    def getBoards(self):
+        '''
+            Get the boards as a [games, rows, columns] view
+
+            Returns:
+                numpy.ndarray
+        '''
+        return self.arrays[:, :self.points].reshape(self.games, self.rows,
+                                                    self.columns)
+
+    def getPlayers(self):
+        '''
+            Get the current player of each game
+
+            Returns:
+                numpy.ndarray
+        '''
+        return self.players
+
+    def getScores(self):
+        '''
+            Get the scores of each game for each player
+
+            Returns:
+                Dict (of numpy.ndarray)
+        '''
+        return {
+            piece: self.scores[:, piece]
+            for piece in (Piece.White, Piece.Black)
+        }
+
+    def isOver(self):
+        '''
+            Get which games have ended on skips
+
+            Returns:
+                numpy.ndarray
+        '''
+        return self.over
+
+    def step(self, moves):
+        '''
+            Play a move in every game, moves are flat point indexes or SKIP
+
+            Args:
+                moves (iter): The move for each game
+
+            Returns:
+                Tuple (numpy.ndarray, numpy.ndarray) of which games took the
+                move, and the result for each game
+        '''
+        moves = numpy.asarray(moves, dtype=numpy.intp)
+        results = numpy.full(self.games, self.OK, dtype=numpy.int8)
+        results[self.over] = self.GAME_OVER
+        active = ~self.over
+        skipping = active & (moves == self.SKIP)
+        placing = numpy.flatnonzero(active & ~skipping)
+        # Skip the goes, ending games that hit the skip limit
+        self.skipCounts[skipping] += 1
+        ending = skipping & (self.skipCounts >= self.SKIP_LIMIT)
+        self.over |= ending
+        results[ending] = self.GAME_OVER
+        switching = skipping & ~ending
+        self.players[switching] = self.getOtherPieces(self.players[switching])
+        # Play the moves
+        if placing.size:
+            results[placing] = self.play(placing, moves[placing])
+        return skipping | (results == self.OK), results
+
+    def play(self, games, points):
+        '''
+            Place the current player on the point in each of the games
+
+            Args:
+                games   (numpy.ndarray): The games to play in
+                points  (numpy.ndarray): The point to play in each game
+
+            Returns:
+                numpy.ndarray
+        '''
+        results = numpy.full(games.size, self.OK, dtype=numpy.int8)
+        # Is this space occupied?
+        occupied = self.arrays[games, points] != Piece.NoPiece
+        results[occupied] = self.OCCUPIED
+        free = numpy.flatnonzero(~occupied)
+        games, points = games[free], points[free]
+        if not games.size:
+            return results
+        indexes = numpy.arange(games.size)
+        player = self.players[games]
+        opponent = self.getOtherPieces(player)
+        # Make the move on a copy of the boards
+        arrays = self.arrays[games]
+        arrays[indexes, points] = player
+        empty = arrays == Piece.NoPiece
+        empty[:, self.points] = False
+        opponents = arrays == opponent[:, numpy.newaxis]
+        # Label the groups, offsetting the labels so every board has its
+        # own range of them
+        width = self.points + 1
+        offsets = (indexes * width)[:, numpy.newaxis]
+        opponentLabels = self.territory.labelRegions(opponents) + offsets
+        playerLabels = self.territory.labelRegions(
+            arrays == player[:, numpy.newaxis]) + offsets
+        # Find the groups with a liberty
+        breathing = empty[:, self.neighbours].any(axis=-1)
+        alive = numpy.zeros(games.size * width, dtype=bool)
+        alive[opponentLabels[opponents & breathing]] = True
+        alive[playerLabels[~opponents & ~empty & breathing]] = True
+        # Opponent groups next to the move without a liberty are captured
+        rows = indexes[:, numpy.newaxis]
+        sides = self.neighbours[points]
+        touched = numpy.zeros(games.size * width, dtype=bool)
+        touched[opponentLabels[rows, sides][opponents[rows, sides]]] = True
+        captured = opponents & touched[opponentLabels] & ~alive[opponentLabels]
+        # The move is suicide if it captures nothing and has no liberty
+        suicide = ~captured.any(axis=-1) & ~alive[playerLabels[indexes,
+                                                               points]]
+        # Hash the position each move would leave behind
+        capturedKeys = numpy.where(captured, self.keys[opponent],
+                                   numpy.uint64(0))
+        positionHashes = (self.hashes[games] ^ self.keys[player, points]
+                          ^ numpy.bitwise_xor.reduce(capturedKeys, axis=-1))
+        ko = numpy.array([
+            int(positionHash) in self.seenPositions[game]
+            for game, positionHash in zip(games, positionHashes)
+        ])
+        # KO is checked before suicide, as in GameLogic
+        outcome = numpy.where(ko, self.KO,
+                              numpy.where(suicide, self.SUICIDE, self.OK))
+        results[free] = outcome
+        legal = numpy.flatnonzero(outcome == self.OK)
+        if legal.size:
+            self.apply(games[legal], arrays[legal], captured[legal],
+                       positionHashes[legal])
+        return results
+
+    def apply(self, games, arrays, captured, positionHashes):
+        '''
+            Store the legal moves, removing the captured pieces and scoring
+
+            Args:
+                games           (numpy.ndarray): The games the moves were in
+                arrays          (numpy.ndarray): The boards after each move
+                captured        (numpy.ndarray): The pieces each move took
+                positionHashes  (numpy.ndarray): The hash after each move
+        '''
+        arrays[captured] = Piece.NoPiece
+        self.arrays[games] = arrays
+        self.hashes[games] = positionHashes
+        for game, positionHash in zip(games, positionHashes):
+            self.seenPositions[game].add(int(positionHash))
+        # A turn has taken place, so reset the skip counter
+        self.skipCounts[games] = 0
+        # Update the scores for both players
+        territory = self.territory.countMany(arrays)
+        for piece in (Piece.White, Piece.Black):
+            pieces = (arrays == piece).sum(axis=-1)
+            self.pieces[games, piece] = pieces
+            self.scores[games, piece] = territory[piece] + pieces
+        # Turn over, switch players
+        self.players[games] = self.getOtherPieces(self.players[games])
+
+    @staticmethod
+    def getOtherPieces(pieces):
+        '''
+            Get the piece of the other player for each piece
+
+            Args:
+                pieces (numpy.ndarray): The pieces
+
+            Returns:
+                numpy.ndarray
+        '''
+        return (Piece.White + Piece.Black - pieces).astype(numpy.int8)
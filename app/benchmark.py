@@ -0,0 +1,374 @@
+'''
+    Benchmarks GameLogic across board sizes and game phases
+'''
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from .game_logic import (GameLogic, GameOverPassError, KOError, OccupiedError,
+                         SuicideError)
+from .piece import Piece
+from .selfplay import randomPolicy
+from .timings import summarise
+
+SIZES = (7, 9, 13, 19)
+PHASES = ('empty', 'mid', 'captures')
+BENCHMARKS = ('updateBoard', 'scanBoard', 'getCapturedLandCount', 'isKoRule',
+              'replay')
+# The share of the board filled for the mid game position
+MID_GAME_FILL = 0.4
+# The shortest time a sample should take, shorter calls are repeated
+SAMPLE_SECONDS = 0.00002
+
+
+class Game:
+    '''
+        A random game to benchmark, with the move number of each phase
+
+        Args:
+            size (int): The number of rows and columns on the board
+            seed (int): The seed for the random moves
+    '''
+    def __init__(self, size, seed):
+        self.size = size
+        generator = random.Random("{}:{}".format(size, seed))
+        self.logic = GameLogic(GameLogic.makeBoard(size))
+        self.phases = {'empty': 0}
+        mostCaptures = -1
+        for turn in range(3 * size * size):
+            captures = len(getCaptureMoves(self.logic))
+            filled = self.logic.getPieceMask(
+                Piece.NoPiece) ^ (self.logic.bitBoard.full)
+            position = self.logic.getHistory().getPosition()
+            if ('mid' not in self.phases and self.logic.bitBoard.count(filled)
+                    >= MID_GAME_FILL * size * size):
+                self.phases['mid'] = position
+            if captures > mostCaptures:
+                self.phases['captures'] = position
+                mostCaptures = captures
+            if not self.play(generator):
+                break
+        self.phases.setdefault('mid', position)
+        self.moves = list(self.logic.getMoves())
+
+    def play(self, generator):
+        '''
+            Play a random legal move, or skip if there isn't one
+
+            Args:
+                generator (random.Random): The random stream to use
+
+            Returns:
+                Bool (False once the game is over)
+        '''
+        for point in randomPolicy(self.logic, generator):
+            try:
+                self.logic.updateBoard(*divmod(point, self.size))
+                return True
+            except (OccupiedError, KOError, SuicideError):
+                continue
+        try:
+            self.logic.skip()
+        except GameOverPassError:
+            return False
+        return True
+
+    def seek(self, phase):
+        '''
+            Get a new GameLogic at the position for a phase of the game, so
+            benchmarks can play moves without changing the game
+
+            Args:
+                phase (str): The phase in PHASES
+
+            Returns:
+                GameLogic
+        '''
+        logic = GameLogic(self.logic.startingBoard)
+        for move in self.moves[:self.phases[phase]]:
+            if move.isSkip():
+                logic.skip()
+            else:
+                logic.updateBoard(*divmod(move.getPoint(), self.size))
+        return logic
+
+
+def getCaptureMoves(logic):
+    '''
+        Get the legal moves that capture something
+
+        Args:
+            logic (GameLogic): The game
+
+        Returns:
+            List (of flat point indexes)
+    '''
+    return [
+        point for point in logic.bitBoard.points(logic.legalMoves())
+        if logic.getCapturedChains(point)
+    ]
+
+
+def measure(call, samples):
+    '''
+        Time a call, repeating it in each sample if it's too quick to time
+        on its own
+
+        Args:
+            call    (callable): Called with the sample number
+            samples (int):      The number of samples to take
+
+        Returns:
+            Dict
+    '''
+    clock = time.perf_counter
+    # Find how many calls make a sample long enough to time
+    repeat = 1
+    while True:
+        start = clock()
+        for index in range(repeat):
+            call(index)
+        if clock() - start >= SAMPLE_SECONDS or repeat >= 1024:
+            break
+        repeat *= 2
+    timings = []
+    for sample in range(samples):
+        start = clock()
+        for index in range(repeat):
+            call(sample * repeat + index)
+        timings.append((clock() - start) / repeat)
+    return summarise(timings, repeat)
+
+
+def benchUpdateBoard(game, phase, samples):
+    '''
+        Time placing a piece, each move is undone (untimed) after it's made.
+        For the captures phase only the capturing moves are played
+
+        Args:
+            game    (Game): The game to benchmark
+            phase   (str):  The phase in PHASES
+            samples (int):  The number of samples to take
+
+        Returns:
+            Dict
+    '''
+    logic = game.seek(phase)
+    if phase == 'captures':
+        points = getCaptureMoves(logic)
+    else:
+        points = logic.bitBoard.points(logic.legalMoves())
+    if not points:
+        return None
+    moves = [divmod(point, game.size) for point in points]
+    clock = time.perf_counter
+    timings = []
+    for sample in range(samples):
+        row, col = moves[sample % len(moves)]
+        start = clock()
+        logic.updateBoard(row, col)
+        timings.append(clock() - start)
+        logic.undo()
+    return summarise(timings)
+
+
+def benchScanBoard(game, phase, samples):
+    '''
+        Time scanning the board for surrounded pieces
+
+        Args:
+            game    (Game): The game to benchmark
+            phase   (str):  The phase in PHASES
+            samples (int):  The number of samples to take
+
+        Returns:
+            Dict
+    '''
+    logic = game.seek(phase)
+    player, opponent = logic.player, logic.opponent
+    return measure(lambda index: logic.scanBoard(player, opponent), samples)
+
+
+def benchCapturedLandCount(game, phase, samples):
+    '''
+        Time counting the captured land for the current player
+
+        Args:
+            game    (Game): The game to benchmark
+            phase   (str):  The phase in PHASES
+            samples (int):  The number of samples to take
+
+        Returns:
+            Dict
+    '''
+    logic = game.seek(phase)
+    player = logic.player
+    return measure(lambda index: logic.getCapturedLandCount(player), samples)
+
+
+def benchKoRule(game, phase, samples):
+    '''
+        Time the KO check, for the position after each legal move
+
+        Args:
+            game    (Game): The game to benchmark
+            phase   (str):  The phase in PHASES
+            samples (int):  The number of samples to take
+
+        Returns:
+            Dict
+    '''
+    logic = game.seek(phase)
+    hashes = [
+        logic.getMoveHash(point, logic.getCapturedChains(point))
+        for point in logic.bitBoard.points(logic.legalMoves())
+    ] or [logic.getPositionHash()]
+    return measure(lambda index: logic.isKoRule(hashes[index % len(hashes)]),
+                   samples)
+
+
+def benchReplay(game, samples):
+    '''
+        Time replaying the whole game on a new GameLogic
+
+        Args:
+            game    (Game): The game to benchmark
+            samples (int):  The number of samples to take
+
+        Returns:
+            Dict
+    '''
+    board = GameLogic.makeBoard(game.size)
+    moves = [(move.isSkip(), divmod(move.getPoint() or 0, game.size))
+             for move in game.moves]
+
+    def replay(index):
+        logic = GameLogic(board)
+        for isSkip, (row, col) in moves:
+            if isSkip:
+                logic.skip()
+            else:
+                logic.updateBoard(row, col)
+
+    result = measure(replay, samples)
+    result['moves'] = len(moves)
+    return result
+
+
+PHASE_BENCHMARKS = {
+    'updateBoard': benchUpdateBoard,
+    'scanBoard': benchScanBoard,
+    'getCapturedLandCount': benchCapturedLandCount,
+    'isKoRule': benchKoRule
+}
+
+
+def runBenchmarks(sizes=SIZES,
+                  phases=PHASES,
+                  benchmarks=BENCHMARKS,
+                  samples=200,
+                  seed=0):
+    '''
+        Run the benchmarks on a random game for each board size
+
+        Args:
+            sizes       (iter): The board sizes
+            phases      (iter): The phases in PHASES
+            benchmarks  (iter): The benchmarks in BENCHMARKS
+            samples     (int):  The number of samples for each benchmark
+            seed        (int):  The seed for the random games
+
+        Returns:
+            List (of Dict)
+    '''
+    results = []
+    for size in sizes:
+        game = Game(size, seed)
+        for name in benchmarks:
+            if name == 'replay':
+                # A replay is a whole game, so take fewer samples
+                runs = [('game', benchReplay(game, max(samples // 20, 5)))]
+            else:
+                runs = [(phase, PHASE_BENCHMARKS[name](game, phase, samples))
+                        for phase in phases]
+            for phase, result in runs:
+                if result is None:
+                    continue
+                result.update(benchmark=name, size=size, phase=phase)
+                results.append(result)
+    return results
+
+
+def compareResults(results, baseline):
+    '''
+        Add the speedup over a baseline run to each result
+
+        Args:
+            results     (list): The results of this run
+            baseline    (list): The results of an earlier run
+    '''
+    previous = {
+        (result['benchmark'], result['size'], result['phase']): result
+        for result in baseline
+    }
+    for result in results:
+        key = (result['benchmark'], result['size'], result['phase'])
+        if key in previous and previous[key]['opsPerSecond']:
+            before = previous[key]['opsPerSecond']
+            result['baselineOpsPerSecond'] = before
+            result['speedup'] = result['opsPerSecond'] / before
+
+
+def main(arguments=None):
+    '''
+        Run the benchmarks from the command line, writing JSON
+
+        Args:
+            arguments (list): The command line arguments
+    '''
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--phases', nargs='+', choices=PHASES, default=PHASES)
+    parser.add_argument('--benchmarks',
+                        nargs='+',
+                        choices=BENCHMARKS,
+                        default=BENCHMARKS)
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--numpy',
+                        action='store_true',
+                        help="Count territory with NumPy")
+    parser.add_argument('--compare', help="A JSON file from an earlier run")
+    parser.add_argument('--output', help="Write to a file, not stdout")
+    options = parser.parse_args(arguments)
+
+    GameLogic.USE_NUMPY = options.numpy
+    results = runBenchmarks(options.sizes, options.phases, options.benchmarks,
+                            options.samples, options.seed)
+    if options.compare:
+        with open(options.compare) as baseline:
+            compareResults(results, json.load(baseline)['results'])
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': options.numpy,
+            'samples': options.samples,
+            'seed': options.seed,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'results': results
+    }
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as file:
+            file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+'''
+    Bitboard helpers for the board
+'''
+
+
+class BitBoard:
+    '''
+        A bitboard stores one bit per point on the board in an arbitrary
+        precision int, where the bit index is the flat point index
+        (row * columns + col). BitBoard holds the precomputed edge masks for
+        a board size, the adjacent points of every point, and the
+        shift/and/or operations to work with them.
+
+        Use BitBoard.forSize to share the masks between boards of the same
+        size
+
+        Args:
+            rows    (int): The number of rows on the board
+            columns (int): The number of columns on the board
+    '''
+    _sizes = {}
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        # Every point on the board
+        self.full = (1 << (rows * columns)) - 1
+        # Every point in the first / last column
+        firstColumn = sum(1 << (row * columns) for row in range(rows))
+        self.firstColumn = firstColumn
+        self.lastColumn = firstColumn << (columns - 1)
+        # Masks applied after a shift to stop rows wrapping into each other
+        self.notFirstColumn = self.full & ~self.firstColumn
+        self.notLastColumn = self.full & ~self.lastColumn
+        # The adjacent flat indexes of each point (left, up, down, right),
+        # and the same as a mask
+        self.adjacents = []
+        for point in range(rows * columns):
+            row, col = divmod(point, columns)
+            self.adjacents.append(
+                tuple(r * columns + c
+                      for r, c in ((row, col - 1), (row - 1, col),
+                                   (row + 1, col), (row, col + 1))
+                      if 0 <= r < rows and 0 <= c < columns))
+        self.sides = [
+            sum(1 << side for side in points) for points in self.adjacents
+        ]
+        # Where each point goes under each symmetry of the board, the flips
+        # and half turn, then (on square boards) the quarter turns and the
+        # flips across the diagonals
+        last, lastColumn = rows - 1, columns - 1
+        transforms = [
+            lambda row, col: (row, col),
+            lambda row, col: (last - row, col),
+            lambda row, col: (row, lastColumn - col),
+            lambda row, col: (last - row, lastColumn - col)
+        ]
+        if rows == columns:
+            transforms += [
+                lambda row, col: (col, row),
+                lambda row, col: (col, last - row),
+                lambda row, col: (lastColumn - col, row),
+                lambda row, col: (lastColumn - col, last - row)
+            ]
+        self.symmetries = [
+            tuple(r * columns + c
+                  for r, c in (transform(*divmod(point, columns))
+                               for point in range(rows * columns)))
+            for transform in transforms
+        ]
+        # Where each point comes from under each symmetry
+        self.inverseSymmetries = []
+        for symmetry in self.symmetries:
+            inverse = [0] * len(symmetry)
+            for point, image in enumerate(symmetry):
+                inverse[image] = point
+            self.inverseSymmetries.append(tuple(inverse))
+
+    @classmethod
+    def forSize(cls, rows, columns):
+        '''
+            Get the shared BitBoard for the board size
+
+            Args:
+                rows    (int): The number of rows on the board
+                columns (int): The number of columns on the board
+
+            Returns:
+                BitBoard
+        '''
+        key = (rows, columns)
+        if key not in cls._sizes:
+            cls._sizes[key] = cls(rows, columns)
+        return cls._sizes[key]
+
+    def fromBoard(self, board, piece):
+        '''
+            Build the bitboard for a piece from a board matrix
+
+            Args:
+                board (list):  The board matrix
+                piece (Piece): The piece to collect
+
+            Returns:
+                Int
+        '''
+        mask = 0
+        for row, cells in enumerate(board):
+            for col, cell in enumerate(cells):
+                if cell == piece:
+                    mask |= 1 << (row * self.columns + col)
+        return mask
+
+    def bit(self, row, col):
+        '''
+            Get the bit for the position on the board
+
+            Args:
+                row (int): The row on the board
+                col (int): The col on the board
+
+            Returns:
+                Int
+        '''
+        if not (0 <= row < self.rows and 0 <= col < self.columns):
+            raise IndexError("list index out of range")
+        return 1 << (row * self.columns + col)
+
+    def transformPoint(self, point, symmetry):
+        '''
+            Move a point by one of the board's symmetries
+
+            Args:
+                point       (int): The flat point index, None for a skip
+                symmetry    (int): The index of the symmetry
+
+            Returns:
+                Int (or None for a skip)
+        '''
+        if point is None:
+            return None
+        return self.symmetries[symmetry][point]
+
+    def inverseTransformPoint(self, point, symmetry):
+        '''
+            Move a point back from one of the board's symmetries
+
+            Args:
+                point       (int): The flat point index, None for a skip
+                symmetry    (int): The index of the symmetry
+
+            Returns:
+                Int (or None for a skip)
+        '''
+        if point is None:
+            return None
+        return self.inverseSymmetries[symmetry][point]
+
+    def expand(self, mask):
+        '''
+            Grow the mask by one point in each direction
+
+            Args:
+                mask (int): The mask to expand
+
+            Returns:
+                Int
+        '''
+        return (mask
+                | ((mask << 1) & self.notFirstColumn)
+                | ((mask >> 1) & self.notLastColumn)
+                | (mask << self.columns)
+                | (mask >> self.columns)) & self.full
+
+    def neighbours(self, mask):
+        '''
+            Get the points adjacent to the mask, but not in it
+
+            Args:
+                mask (int): The mask to find the neighbours of
+
+            Returns:
+                Int
+        '''
+        return self.expand(mask) & ~mask
+
+    def flood(self, seed, within):
+        '''
+            Flood fill from the seed through the connected points of within
+
+            Args:
+                seed    (int): The mask to start from
+                within  (int): The mask of points the fill can spread over
+
+            Returns:
+                Int
+        '''
+        seed &= within
+        while True:
+            grown = self.expand(seed) & within
+            if grown == seed:
+                return seed
+            seed = grown
+
+    def groups(self, mask):
+        '''
+            Split the mask into its connected groups
+
+            Args:
+                mask (int): The mask to split
+
+            Yields:
+                Int
+        '''
+        while mask:
+            group = self.flood(mask & -mask, mask)
+            mask &= ~group
+            yield group
+
+    def positions(self, mask):
+        '''
+            Get the (row, col) positions of the mask in row order
+
+            Args:
+                mask (int): The mask to read
+
+            Returns:
+                List
+        '''
+        return [divmod(point, self.columns) for point in self.points(mask)]
+
+    @staticmethod
+    def points(mask):
+        '''
+            Get the flat point indexes of the mask in ascending order
+
+            Args:
+                mask (int): The mask to read
+
+            Returns:
+                List
+        '''
+        points = []
+        while mask:
+            lowest = mask & -mask
+            points.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return points
+
+    @staticmethod
+    def count(mask):
+        '''
+            Count the points in the mask
+
+            Args:
+                mask (int): The mask to count
+
+            Returns:
+                Int
+        '''
+        return bin(mask).count("1")
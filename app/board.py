@@ -1,17 +1,22 @@
 '''
     Represents the board
 '''
-from PyQt5.QtWidgets import QFrame
-from PyQt5.QtCore import Qt, QBasicTimer, pyqtSignal, QPoint
-from PyQt5.QtGui import QPainter, QColor, QPen
+import math
+
+from PyQt5.QtWidgets import QApplication, QFrame
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QPointF, QRect
+from PyQt5.QtGui import QPainter, QColor, QPen, QPixmap
 from .piece import Piece
 from .game_logic import (GameLogic, GameOverPassError, KOError, SuicideError,
                          OccupiedError)
+from .mcts import MCTS
+from .transposition import TranspositionTable
+from .worker import EngineWorker
 
 
 class Board(QFrame):  # base the board on a QFrame widget
 
-    # Signal for the player timer being updated by timerEvent
+    # Signal for the players' clocks showing a different second
     updatePlayersTimer = pyqtSignal(object)
     # Signal for updating the score
     updateScoreSignal = pyqtSignal(object)
@@ -21,35 +26,129 @@ class Board(QFrame):  # base the board on a QFrame widget
     updateCurrentPlayerSignal = pyqtSignal(object)
     # Signal for game over
     updateGameOverSignal = pyqtSignal(object)
+    # Signal for the move history changing, with the position and length
+    updateHistorySignal = pyqtSignal(int, int)
 
+    # The default board size, change it with setBoardSize
     boardWidth = 7
     boardHeight = 7
-    # Timer speed is denoted in milliseconds
-    timerSpeed = 1000
+    # The seconds the computer player thinks for
+    computerTime = 1.0
+    # The positions the computer player remembers its searches for
+    tableSize = 4096
 
     # Colours to denote checks each representing an RGB tuple
     checkColours = [(255, 235, 205), (205, 133, 63)]
-
-    def __init__(self, parent):
+    # The opacity of a piece shown before the engine has played it
+    provisionalOpacity = 0.5
+    # Why a move couldn't be played
+    errorMessages = {
+        KOError: "KO",
+        SuicideError: "Suicide",
+        OccupiedError: "Occupied"
+    }
+
+    def __init__(self, parent, size=None):
         super().__init__(parent)
+        if size is not None:
+            self.boardWidth = self.boardHeight = size
         self.initBoard()
 
     def initBoard(self):
         '''
             Initiates the board
         '''
-        # Timer for tracking time
-        self.timer = QBasicTimer()
+        # Timer to wake up when the current player's clock next changes
+        self.clockTimer = QTimer(self)
+        self.clockTimer.setSingleShot(True)
+        self.clockTimer.setTimerType(Qt.PreciseTimer)
+        self.clockTimer.timeout.connect(self.clockEvent)
         # Denotes if the game is underway
         self.isStarted = False
         # The initial board
-        self.boardArray = [[Piece.NoPiece for j in range(self.boardWidth)]
-                           for i in range(self.boardHeight)]
+        self.boardArray = GameLogic.makeBoard(self.boardHeight,
+                                              self.boardWidth)
         # The gameLogic that controls play
         self.gameLogic = GameLogic(self.boardArray)
+        # The computer player (if there is one) plays the second player, its
+        # searches are cached in the table to start from again after an undo
+        self.computer = None
+        self.table = TranspositionTable(self.tableSize)
+        self.computerPiece = Piece.Black
+        # The grid and stone sprites, drawn once for the size of the board
+        self.background = None
+        self.sprites = None
+        # The bitboards last drawn, to find the points that have changed
+        self.drawnBitboards = {}
+        # The worker that plays moves and searches off the GUI thread, and
+        # the (row, col, piece) clicked but not yet played by it
+        self.engine = EngineWorker(self)
+        self.engine.resultSignal.connect(self.engineResult)
+        application = QApplication.instance()
+        if application is not None:
+            application.aboutToQuit.connect(self.engine.stop)
+        self.provisional = None
         # Start the game
         self.start()
 
+    def setBoardSize(self, size):
+        '''
+            Start a new game on a board of a different size
+
+            Args:
+                size (int): The number of rows and columns on the board
+        '''
+        self.cancelEngine()
+        with self.engine.lock:
+            self.boardArray = GameLogic.makeBoard(size)
+            self.boardWidth = self.boardHeight = size
+            # The squares change size, so draw everything again
+            self.invalidateCache()
+            # Start new game logic, keeping any instrumentation measuring it
+            # and journal writing it
+            instrumentation = self.gameLogic.getInstrumentation()
+            journal = self.gameLogic.getJournal()
+            self.gameLogic = GameLogic(self.boardArray)
+            self.gameLogic.setInstrumentation(instrumentation)
+            self.gameLogic.setJournal(journal)
+            # The computer's search tree is for the old board
+            if self.computer is not None:
+                self.computer = MCTS(self.computerTime, table=self.table)
+            self.resetGame()
+        self.scheduleComputerMove()
+
+    def setJournal(self, journal):
+        '''
+            Write the game to a journal, first resuming the game already in
+            it if there is one
+
+            Args:
+                journal (Journal): The journal
+        '''
+        self.cancelEngine()
+        with self.engine.lock:
+            logic = journal.recover()
+            if logic is not None:
+                self.boardWidth, self.boardHeight = logic.columns, logic.rows
+                self.invalidateCache()
+                logic.setInstrumentation(
+                    self.gameLogic.getInstrumentation())
+                self.gameLogic = logic
+                # The computer's search tree is for the old game
+                if self.computer is not None:
+                    self.computer = MCTS(self.computerTime, table=self.table)
+            self.gameLogic.setJournal(journal)
+            self.refreshGame()
+
+    def getBoardSize(self):
+        '''
+            Getter for the board size
+
+            Returns:
+                Int
+        '''
+        return self.boardWidth
+
     def getCurrentPlayer(self):
         '''
             Helper method to fetch the current player from the logic instance
@@ -94,41 +193,157 @@ class Board(QFrame):  # base the board on a QFrame widget
         '''
         self.isStarted = True  # determines if the game has started to TRUE
         self.resetGame()  # reset the game
-        self.timer.start(self.timerSpeed, self)
 
-    def timerEvent(self, event):
+    def clockEvent(self):
         '''
-            This event is automatically called when the timer is updated.
-            Based on the timerSpeed variable.
+            Called when the current player's clock shows a different second,
+            or runs out
+        '''
+        # If there is no time remaining, then game over
+        if not self.getCurrentPlayer().hasTimeLeft():
+            self.gameOver()
+            return
+        self.scheduleClock()
 
-            Args:
-                event (Event): Timer event
-        '''
-        # if the timer that has 'ticked' is the one in this class
-        if event.timerId() == self.timer.timerId():
-            # Get the current player
-            player = self.getCurrentPlayer()
-            # If there is no time remaining, then game over
-            if player.timeRemaining <= 0:
-                self.updateGameOverSignal.emit(self.gameLogic.getLeadingPlayer())
-            else:
-                player.timeRemaining -= 1
-            # Emit the new state of the timer
+    def scheduleClock(self):
+        '''
+            Emit the players' clocks, and wake up when the current player's
+            clock next shows a different second (or runs out)
+        '''
+        self.updatePlayersTimer.emit(self.gameLogic.getPlayers())
+        player = self.getCurrentPlayer()
+        if not player.isClockRunning():
+            self.clockTimer.stop()
+            return
+        remaining = player.getTimeRemaining()
+        # The clock shows whole seconds rounded up, so it next changes when
+        # the fraction of a second left runs out
+        delay = remaining - math.ceil(remaining) + 1 if remaining > 0 else 0
+        self.clockTimer.start(int(math.ceil(delay * 1000)))
+
+    def gameOver(self):
+        '''
+            Stop the clocks and emit the leading player as the winner
+        '''
+        self.cancelEngine()
+        with self.engine.lock:
+            self.gameLogic.stopClocks()
+            self.clockTimer.stop()
             self.updatePlayersTimer.emit(self.gameLogic.getPlayers())
-        else:
-            # if we do not handle an event pass it to the parent class
-            super(Board, self).timerEvent(event)
+            self.updateGameOverSignal.emit(self.gameLogic.getLeadingPlayer())
 
-    def paintEvent(self, event=None):
+    def paintEvent(self, event):
         '''
-            Paints the board and the pieces of the game
+            Paints the board and the pieces of the game, only the part of
+            the board in the event's rect is drawn
 
             Args:
                 event (Event): The paint event
         '''
+        if self.background is None:
+            self.renderCache()
         painter = QPainter(self)
+        # Qt clips the drawing to the area being repainted
+        painter.drawPixmap(0, 0, self.background)
+        self.drawPieces(painter, event.rect())
+
+    def resizeEvent(self, event):
+        '''
+            Draw the grid and sprites again for the new size
+
+            Args:
+                event (Event): The resize event
+        '''
+        self.invalidateCache()
+        super().resizeEvent(event)
+
+    def invalidateCache(self):
+        '''
+            Throw away the grid and sprites, and repaint the whole board
+        '''
+        self.background = None
+        self.sprites = None
+        self.drawnBitboards = {}
+        self.update()
+
+    def renderCache(self):
+        '''
+            Draw the grid into a pixmap, and a sprite for each piece, at the
+            current size of the squares and the screen's pixel ratio
+        '''
+        ratio = self.devicePixelRatioF()
+        self.background = self.makePixmap(self.width(), self.height(), ratio)
+        self.background.fill(self.palette().window().color())
+        painter = QPainter(self.background)
         self.drawBoardSquares(painter)
-        self.drawPieces(painter)
+        painter.end()
+        width = int(self.squareWidth()) + 1
+        height = int(self.squareHeight()) + 1
+        self.sprites = {
+            Piece.White: self.makeSprite(width, height, ratio, Qt.white),
+            Piece.Black: self.makeSprite(width, height, ratio, Qt.black)
+        }
+
+    def makePixmap(self, width, height, ratio):
+        '''
+            Make a pixmap with enough pixels for the screen's pixel ratio
+
+            Args:
+                width   (int):   The width in logical pixels
+                height  (int):   The height in logical pixels
+                ratio   (float): The screen's device pixel ratio
+
+            Returns:
+                QPixmap
+        '''
+        pixmap = QPixmap(max(1, int(width * ratio)), max(1,
+                                                         int(height * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        return pixmap
+
+    def makeSprite(self, width, height, ratio, color):
+        '''
+            Draw a piece onto a transparent pixmap the size of a square
+
+            Args:
+                width   (int):       The width of a square
+                height  (int):       The height of a square
+                ratio   (float):     The screen's device pixel ratio
+                color   (Qt.color):  The color for the piece
+
+            Returns:
+                QPixmap
+        '''
+        sprite = self.makePixmap(width, height, ratio)
+        sprite.fill(Qt.transparent)
+        painter = QPainter(sprite)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor(color), 0))
+        painter.setBrush(QColor(color))
+        radius = (self.squareWidth() - 2) / 5
+        center = QPointF(int(self.squareWidth()) // 2,
+                         int(self.squareHeight()) // 2)
+        painter.drawEllipse(center, radius, radius)
+        painter.end()
+        return sprite
+
+    def updateChanged(self):
+        '''
+            Repaint only the squares whose piece has changed since they were
+            last drawn
+        '''
+        with self.engine.lock:
+            bitboards = dict(self.gameLogic.bitboards)
+            # Paint from a copy of the board, the worker may be changing it
+            self.boardArray = [list(cells) for cells in self.gameLogic.board]
+        changed = 0
+        for piece, bitboard in bitboards.items():
+            changed |= bitboard ^ self.drawnBitboards.get(piece, 0)
+        self.drawnBitboards = bitboards
+        columns = self.gameLogic.columns
+        for point in self.gameLogic.bitBoard.points(changed):
+            row, col = divmod(point, columns)
+            self.update(self.getSquareRect(col, row))
 
     def mousePressEvent(self, event):
         '''
@@ -137,147 +352,264 @@ class Board(QFrame):  # base the board on a QFrame widget
             Args:
                 event (Event): The mouse press event
         '''
+        # Don't let a click play for the computer
+        if self.isComputerTurn():
+            return
         # Get the current row/col where this click occured
         row, col = self.getSquareRowCol(event.x(), event.y())
-        # On mouse press try and update the board logic
-        try:
-            self.gameLogic.updateBoard(row, col)
+        if not (0 <= row < self.boardHeight and 0 <= col < self.boardWidth):
+            return
+        # Show the piece straight away, and have the worker play it
+        self.setProvisional((row, col, self.gameLogic.player))
+        self.engine.play(self.gameLogic, row, col)
+
+    def engineResult(self, result):
+        '''
+            Show the result of a move played by the worker
+
+            Args:
+                result (dict): The result, see EngineWorker
+        '''
+        # Leave out results from before a cancel
+        if self.engine.isCancelled(result['generation']):
+            return
+        self.setProvisional(None)
+        if result['gameOver']:
+            self.gameOver()
+            return
+        error = result['error']
+        if error is not None:
+            message = self.errorMessages[type(error)]
+            self.updateLogicSignal.emit(f"{message}\ntry again")
+        elif 'playoutsPerSecond' in result:
+            rate = result['playoutsPerSecond']
+            self.updateLogicSignal.emit(f"Computer\n{rate:.0f} playouts/s")
+        else:
             self.updateLogicSignal.emit("")
-        # Handle all of the different logical errors that can occur
-        except KOError:
-            self.updateLogicSignal.emit(f"KO\ntry again")
-        except SuicideError:
-            self.updateLogicSignal.emit(f"Suicide\ntry again")
-        except OccupiedError:
-            self.updateLogicSignal.emit(f"Occupied\ntry again")
-        # Whatever happens, update the board
-        finally:
-            self.boardArray = self.gameLogic.board
-        # Emit the current player (this switches in the updateBoard logic)
-        self.updateCurrentPlayerSignal.emit(self.getCurrentPlayer())
-        # Emit the latest player objects
-        self.updateScoreSignal.emit(self.gameLogic.getPlayers())
-        # Redraw the GUI
-        self.update()
+        self.refreshGame()
+
+    def setProvisional(self, provisional):
+        '''
+            Show a piece that's been clicked but not played yet, or stop
+            showing it
+
+            Args:
+                provisional (tuple): The (row, col, piece), None for none
+        '''
+        for shown in (self.provisional, provisional):
+            if shown is not None:
+                self.update(self.getSquareRect(shown[1], shown[0]))
+        self.provisional = provisional
+
+    def cancelEngine(self):
+        '''
+            Cancel the worker's moves and searches, before the game is
+            changed on the GUI thread
+        '''
+        self.engine.cancel()
+        self.setProvisional(None)
 
     def resetGame(self):
         '''
             Clears pieces from the board'
         '''
-        # Reset the logic
-        self.gameLogic.reset()
-        # Reset the board
-        self.boardArray = self.gameLogic.board
-        # Emit the player objects with reset scores
-        self.updateScoreSignal.emit(self.gameLogic.getPlayers())
-        # Emit the current player
-        self.updateCurrentPlayerSignal.emit(self.getCurrentPlayer())
-        # Redraw the GUI
-        self.update()
+        self.cancelEngine()
+        with self.engine.lock:
+            # Reset the logic
+            self.gameLogic.reset()
+            # Emit the player objects with reset scores
+            self.updateScoreSignal.emit(self.gameLogic.getPlayers())
+            # Emit the current player
+            self.updateCurrentPlayerSignal.emit(self.getCurrentPlayer())
+            # Emit the empty move history
+            self.emitHistory()
+            # Redraw the squares that changed
+            self.updateChanged()
+            # Start the clocks
+            self.scheduleClock()
 
     def undo(self):
         '''
             Undo last turn
         '''
-        # TODO implement undo
-        print("Not implemented")
+        self.cancelEngine()
+        with self.engine.lock:
+            # Take back the last turn, if there is one
+            if self.gameLogic.undo():
+                # Take back the computer's turn too, so it's the player's go
+                if self.isComputerTurn():
+                    self.gameLogic.undo()
+                self.updateLogicSignal.emit("")
+            else:
+                self.updateLogicSignal.emit("Nothing\nto undo")
+            self.refreshGame()
+
+    def redo(self):
+        '''
+            Redo the last undone turn
+        '''
+        self.cancelEngine()
+        with self.engine.lock:
+            # Play the last undone turn again, if there is one
+            if self.gameLogic.redo():
+                self.updateLogicSignal.emit("")
+            else:
+                self.updateLogicSignal.emit("Nothing\nto redo")
+            self.refreshGame()
+
+    def seek(self, moveNumber):
+        '''
+            Jump to the position after a number of moves
+
+            Args:
+                moveNumber (int): The number of moves to have played
+        '''
+        # Only seek if this isn't where the game already is
+        if moveNumber != self.gameLogic.getHistory().getPosition():
+            self.cancelEngine()
+            with self.engine.lock:
+                self.gameLogic.seek(moveNumber)
+                self.updateLogicSignal.emit("")
+                self.refreshGame()
+
+    def emitHistory(self):
+        '''
+            Emit the position and length of the move history
+        '''
+        history = self.gameLogic.getHistory()
+        self.updateHistorySignal.emit(history.getPosition(),
+                                      history.getLength())
+
+    def refreshGame(self):
+        '''
+            Emit the state of the game logic, and redraw the board
+        '''
+        with self.engine.lock:
+            # Emit the current player
+            self.updateCurrentPlayerSignal.emit(self.getCurrentPlayer())
+            # Emit the latest player objects
+            self.updateScoreSignal.emit(self.gameLogic.getPlayers())
+            # Emit the move history
+            self.emitHistory()
+            # Redraw the squares that changed
+            self.updateChanged()
+            # Show the clock of the player to move
+            self.scheduleClock()
+        # Let the computer play if it's now its go
+        self.scheduleComputerMove()
 
     def skip(self):
         '''
             Handle skip / passes
         '''
+        self.cancelEngine()
         # Try and skip a go, unless there are two skips - then emit game over
         try:
-            self.gameLogic.skip()
-            self.updateCurrentPlayerSignal.emit(self.getCurrentPlayer())
+            with self.engine.lock:
+                self.gameLogic.skip()
+                self.updateCurrentPlayerSignal.emit(self.getCurrentPlayer())
+                self.emitHistory()
+                self.scheduleClock()
         except GameOverPassError:
-            self.updateGameOverSignal.emit(self.gameLogic.getLeadingPlayer())
+            self.gameOver()
+            return
+        # Let the computer reply
+        self.scheduleComputerMove()
 
-    def drawBoardSquares(self, painter):
+    def setComputerPlayer(self, enabled):
         '''
-            Draw all the square on the board
+            Turn the computer player on or off
 
             Args:
-                painter (QPainter): The painter to paint on the widget with
+                enabled (bool): Should the computer play the second player
         '''
-        for row in range(0, Board.boardHeight):
-            for col in range(0, Board.boardWidth):
-                self.drawSquare(
-                    painter, col, row, self.checkColours[0] if
-                    (col + row) % 2 == 1 else self.checkColours[1])
+        # Stop any search by the computer player being replaced
+        self.cancelEngine()
+        self.computer = None
+        if enabled:
+            self.computer = MCTS(self.computerTime, table=self.table)
+        self.scheduleComputerMove()
 
-    def drawPieces(self, painter):
+    def isComputerTurn(self):
         '''
-            Draw the prices on the board
+            Is it the computer player's go
 
-            Args:
-                painter (QPainter): The painter to paint with
-
-                black and white squares being drawn on board
+            Returns:
+                Bool
         '''
-        for row in range(0, len(self.boardArray)):
-            for col in range(0, len(self.boardArray[0])):
-                square = self.boardArray[row][col]
-                if square == 0:
-                    self.drawEmptySpace(painter, col, row)
-                elif square == 1:
-                    self.drawWhitePiece(painter, col, row)
-                else:
-                    self.drawBlackPiece(painter, col, row)
+        return (self.computer is not None
+                and self.gameLogic.player == self.computerPiece)
 
-    def drawEmptySpace(self, painter, col, row):
+    def scheduleComputerMove(self):
         '''
-            Helper method to draw an empty space at the given col, row
-
-            Args:
-                painter (QPainter): The painter
-                col     (int):      The column to draw at
-                row     (int):      The row to draw at
+            Play the computer's go once the board has been redrawn, if it's
+            the computer's turn
         '''
-        self.drawPiece(painter, col, row, Qt.transparent)
+        if self.isComputerTurn():
+            QTimer.singleShot(0, self.playComputerMove)
 
-    def drawBlackPiece(self, painter, col, row):
+    def playComputerMove(self):
         '''
-            Helper method to draw a black piece at the given col, row
-
-            Args:
-                painter (QPainter): The painter
-                col     (int):      The column to draw at
-                row     (int):      The row to draw at
+            Have the worker search for the computer player's move and play
+            it, the board is updated when it's played
         '''
-        self.drawPiece(painter, col, row, Qt.black)
+        if self.isComputerTurn():
+            self.engine.search(self.gameLogic, self.computer)
 
-    def drawWhitePiece(self, painter, col, row):
+    def drawBoardSquares(self, painter):
         '''
-            Helper method to draw a white piece at the given col, row
+            Draw all the square on the board
 
             Args:
-                painter (QPainter): The painter
-                col     (int):      The column to draw at
-                row     (int):      The row to draw at
+                painter (QPainter): The painter to paint on the widget with
         '''
-        self.drawPiece(painter, col, row, Qt.white)
+        for row in range(0, self.boardHeight):
+            for col in range(0, self.boardWidth):
+                self.drawSquare(
+                    painter, col, row, self.checkColours[0] if
+                    (col + row) % 2 == 1 else self.checkColours[1])
 
-    def drawPiece(self, painter, col, row, color):
+    def drawPieces(self, painter, rect):
         '''
-            Draw a piece at the given col, row
-            pen is doing the circle
-            brush is filling in the circle
+            Draw the pieces on the squares inside the rect
+
+            Args:
+                painter (QPainter): The painter to paint with
+                rect    (QRect):    The area being repainted
+        '''
+        # Find the squares the rect covers
+        firstRow = max(0, int(rect.top() // self.squareHeight()))
+        lastRow = min(self.boardHeight - 1,
+                      int(rect.bottom() // self.squareHeight()))
+        firstCol = max(0, int(rect.left() // self.squareWidth()))
+        lastCol = min(self.boardWidth - 1,
+                      int(rect.right() // self.squareWidth()))
+        for row in range(firstRow, lastRow + 1):
+            cells = self.boardArray[row]
+            for col in range(firstCol, lastCol + 1):
+                if cells[col] != Piece.NoPiece:
+                    self.drawPiece(painter, col, row, cells[col])
+        # Draw a piece the worker hasn't played yet faded
+        if self.provisional is not None:
+            row, col, piece = self.provisional
+            if (firstRow <= row <= lastRow and firstCol <= col <= lastCol
+                    and self.boardArray[row][col] == Piece.NoPiece):
+                painter.setOpacity(self.provisionalOpacity)
+                self.drawPiece(painter, col, row, piece)
+                painter.setOpacity(1.0)
+
+    def drawPiece(self, painter, col, row, piece):
+        '''
+            Draw a piece at the given col, row from its sprite
 
             Args:
                 painter (QPainter): The painter
                 col     (int):      The column to draw at
                 row     (int):      The row to draw at
-                color   (Qt.color): The color for the piece
+                piece   (Piece):    The piece to draw
         '''
-        painter.save()
-        painter.setPen(QPen(QColor(color), 0))
-        painter.setBrush(QColor(color))
-        painter.translate(*self.getSquareCoords(col, row))
-        radius = (self.squareWidth() - 2) / 5
-        center = QPoint(self.squareWidth() // 2, self.squareHeight() // 2)
-        painter.drawEllipse(center, radius, radius)
-        painter.restore()
+        painter.drawPixmap(QPointF(*self.getSquareCoords(col, row)),
+                           self.sprites[piece])
 
     def drawSquare(self, painter, col, row, color):
         '''
@@ -315,6 +647,22 @@ class Board(QFrame):  # base the board on a QFrame widget
         '''
         return (self.squareWidth() * col, self.squareHeight() * row)
 
+    def getSquareRect(self, col, row):
+        '''
+            Get the area covered by a square, rounded out to whole pixels
+
+            Args:
+                col (int): The current col
+                row (int): The current row
+
+            Returns:
+                QRect
+        '''
+        x, y = self.getSquareCoords(col, row)
+        return QRect(int(x), int(y),
+                     int(self.squareWidth()) + 2,
+                     int(self.squareHeight()) + 2)
+
     def getSquareRowCol(self, x, y):
         '''
             Given X and Y find the column and the row
@@ -0,0 +1,136 @@
+'''
+    Sends live games to the clients watching them
+'''
+import json
+
+
+class Broadcaster:
+    '''
+        Broadcaster sends each turn of a game to its watchers as a small
+        delta, encoded once and written to every watcher. A full keyframe
+        of the game is sent every so often, so watchers can check they are
+        in step, and a watcher who joins late starts from one.
+
+        Writing never waits for a watcher. Anything a watcher hasn't read
+        yet waits in its connection's buffer, and a watcher whose buffer
+        grows past the limit is dropped (its connection is closed) so it
+        can't hold up the game or the other watchers
+
+        Args:
+            keyframeInterval    (int): The deltas between keyframes
+            bufferLimit         (int): The bytes that can wait for a watcher
+    '''
+    def __init__(self, keyframeInterval=32, bufferLimit=256 * 1024):
+        self.keyframeInterval = keyframeInterval
+        self.bufferLimit = bufferLimit
+        self.watchers = set()
+        # The deltas sent since the last keyframe
+        self.deltas = 0
+        # Counts of what has been sent
+        self.sent = 0
+        self.dropped = 0
+
+    def hasWatchers(self):
+        '''
+            Is anyone watching
+
+            Returns:
+                Bool
+        '''
+        return bool(self.watchers)
+
+    def getWatcherCount(self):
+        '''
+            Get the number of watchers
+
+            Returns:
+                Int
+        '''
+        return len(self.watchers)
+
+    def subscribe(self, writer):
+        '''
+            Start sending deltas to a watcher, they should be sent a
+            keyframe first
+
+            Args:
+                writer (asyncio.StreamWriter): The watcher's connection
+        '''
+        self.watchers.add(writer)
+
+    def unsubscribe(self, writer):
+        '''
+            Stop sending to a watcher
+
+            Args:
+                writer (asyncio.StreamWriter): The watcher's connection
+        '''
+        self.watchers.discard(writer)
+
+    def publish(self, delta, keyframe):
+        '''
+            Send a delta to every watcher, followed by a keyframe if one is
+            due
+
+            Args:
+                delta       (dict):     The delta for the turn
+                keyframe    (callable): Called for the keyframe, if it's due
+        '''
+        if not self.watchers:
+            return
+        self.broadcast(encode(delta))
+        self.deltas += 1
+        if self.deltas >= self.keyframeInterval:
+            self.broadcast(encode(keyframe()))
+            self.deltas = 0
+
+    def broadcast(self, data):
+        '''
+            Write a message to every watcher, dropping those who have fallen
+            too far behind
+
+            Args:
+                data (bytes): The encoded message
+        '''
+        limit = self.bufferLimit
+        dropped = []
+        for writer in self.watchers:
+            transport = writer.transport
+            if (transport.is_closing()
+                    or transport.get_write_buffer_size() > limit):
+                dropped.append(writer)
+            else:
+                writer.write(data)
+        self.sent += len(self.watchers) - len(dropped)
+        for writer in dropped:
+            self.drop(writer)
+
+    def drop(self, writer):
+        '''
+            Drop a watcher, closing their connection
+
+            Args:
+                writer (asyncio.StreamWriter): The watcher's connection
+        '''
+        self.watchers.discard(writer)
+        self.dropped += 1
+        writer.close()
+
+    def close(self):
+        '''
+            Stop sending to every watcher, leaving their connections open
+        '''
+        self.watchers.clear()
+
+
+def encode(message):
+    '''
+        Encode a message as a line of JSON
+
+        Args:
+            message (dict): The message
+
+        Returns:
+            Bytes
+    '''
+    return json.dumps(message, separators=(',', ':')).encode() + b"\n"
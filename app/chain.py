@@ -0,0 +1,77 @@
+'''
+    Represents a chain of connected stones
+'''
+
+
+class Chain:
+    '''
+        A chain is a group of orthogonally connected stones of the same
+        colour, along with the empty points (liberties) that surround it.
+        Points are flat indexes into the board (row * columns + col)
+
+        Args:
+            piece       (Piece): The piece the chain is made up of
+            stones      (set):   The points occupied by the chain
+            liberties   (set):   The empty points adjacent to the chain
+    '''
+    __slots__ = ('piece', 'stones', 'liberties')
+
+    def __init__(self, piece, stones, liberties):
+        self.piece = piece
+        self.stones = stones
+        self.liberties = liberties
+
+    def getPiece(self):
+        '''
+            Getter for the piece attribute
+
+            Returns:
+                Piece
+        '''
+        return self.piece
+
+    def getStones(self):
+        '''
+            Getter for the stones attribute
+
+            Returns:
+                Set
+        '''
+        return self.stones
+
+    def getLiberties(self):
+        '''
+            Getter for the liberties attribute
+
+            Returns:
+                Set
+        '''
+        return self.liberties
+
+    def isCaptured(self):
+        '''
+            Is the chain without any liberties
+
+            Returns:
+                Bool
+        '''
+        return not self.liberties
+
+    def isInAtari(self):
+        '''
+            Is the chain down to its last liberty
+
+            Returns:
+                Bool
+        '''
+        return len(self.liberties) == 1
+
+    def merge(self, other):
+        '''
+            Absorb another chain of the same colour into this one
+
+            Args:
+                other (Chain): The chain to absorb
+        '''
+        self.stones |= other.stones
+        self.liberties |= other.liberties
@@ -1,7 +1,15 @@
 '''
     Handles the game logic
 '''
+import time
+
+from .bitboard import BitBoard
+from .chain import Chain
+from .history import History, Keyframe
+from .move import Move
 from .piece import Piece
+from .territory import NumpyTerritory, Regions, countTerritory, loadNumpy
+from .zobrist import ZobristTable
 
 
 class GameLogic:
@@ -13,17 +21,49 @@ class GameLogic:
 
     '''
     SKIP_LIMIT = 2
+    # The board sizes offered, and the largest board allowed
+    SIZES = (7, 9, 13, 19)
+    MAX_SIZE = 25
+    # Count territory with NumPy arrays (if NumPy is installed), otherwise
+    # the bitboards are used
+    USE_NUMPY = False
 
     def __init__(self, board):
         # If a board isn't created, then fail
         if not board:
             raise ValueError(
                 "Board must be a list of lists of equal dimensions")
+        if len(board) > self.MAX_SIZE or len(board[0]) > self.MAX_SIZE:
+            raise ValueError(
+                f"Board can't be larger than {self.MAX_SIZE}x{self.MAX_SIZE}")
         # Create copy of the board (we need to ensure this isn't by reference)
         self.startingBoard = self.copyBoard(board)
+        # Instrumentation for updateBoard, off unless one is set
+        self.instrumentation = None
+        # The journal the game is written to, off unless one is set
+        self.journal = None
         # Reset the logic
         self.reset()
 
+    @classmethod
+    def makeBoard(cls, rows, columns=None):
+        '''
+            Make an empty board matrix to start a game on
+
+            Args:
+                rows    (int): The number of rows on the board
+                columns (int): The number of columns, the same as the rows
+                               if not given
+
+            Returns:
+                List
+        '''
+        columns = rows if columns is None else columns
+        if not (0 < rows <= cls.MAX_SIZE and 0 < columns <= cls.MAX_SIZE):
+            raise ValueError(
+                f"Board must be between 1x1 and {cls.MAX_SIZE}x{cls.MAX_SIZE}")
+        return [[Piece.NoPiece] * columns for row in range(rows)]
+
     def getPlayer(self):
         '''
             Returns the current player
@@ -33,6 +73,46 @@ class GameLogic:
         '''
         return self.player
 
+    def setInstrumentation(self, instrumentation):
+        '''
+            Measure updateBoard with the instrumentation, or stop measuring
+            it with None
+
+            Args:
+                instrumentation (Instrumentation): The instrumentation
+        '''
+        self.instrumentation = instrumentation
+
+    def getInstrumentation(self):
+        '''
+            Returns the instrumentation measuring updateBoard
+
+            Returns:
+                Instrumentation (or None)
+        '''
+        return self.instrumentation
+
+    def setJournal(self, journal):
+        '''
+            Write each turn to the journal, so the game can be resumed, or
+            stop writing them with None
+
+            Args:
+                journal (Journal): The journal
+        '''
+        self.journal = journal
+        if journal is not None:
+            journal.attach(self)
+
+    def getJournal(self):
+        '''
+            Returns the journal the game is written to
+
+            Returns:
+                Journal (or None)
+        '''
+        return self.journal
+
     def getPlayers(self):
         '''
             Returns the players
@@ -51,10 +131,35 @@ class GameLogic:
         # Set the heigh / width based on the dimensions of this
         self.height, self.width = len(self.startingBoard) - 1, len(
             self.startingBoard[0]) - 1
+        # Set the row / column counts used for flat point indexes
+        self.rows, self.columns = self.height + 1, self.width + 1
+        # Store a bitboard for each piece, sharing masks between boards
+        self.bitBoard = BitBoard.forSize(self.rows, self.columns)
+        # The shared neighbour table for each flat point index
+        self.neighbours = self.bitBoard.adjacents
+        self.bitboards = {
+            piece: self.bitBoard.fromBoard(self.board, piece)
+            for piece in (Piece.White, Piece.Black)
+        }
+        # Count territory from scratch with NumPy, if it's being used
+        self.numpyTerritory = None
+        if self.USE_NUMPY and loadNumpy() is not None:
+            self.numpyTerritory = NumpyTerritory.forSize(
+                self.rows, self.columns)
+        # Keep the piece counts and empty regions up to date as pieces move
+        self.countPieces()
+        self.regions = Regions(self.bitBoard, self.bitboards)
+        # Build the chains for any pieces already on the board
+        self.buildChains()
+        # Hash the position, and remember every position seen for superko
+        self.zobrist = ZobristTable.forSize(self.rows, self.columns)
+        self.positionHash = self.zobrist.hashBoard(self.board)
+        self.seenPositions = {self.positionHash}
+        # Hash it under every symmetry too, for canonical keys
+        self.symmetryKeys = self.zobrist.symmetryKeys
+        self.symmetryHash = self.zobrist.hashSymmetries(self.bitboards)
         # Set a skip counter
         self.skipCount = 0
-        # Store previous instances of the board
-        self.previousBoards = []
         # Store the players
         self.players = {
             Piece.White: Player("White", (255, 255, 255)),
@@ -63,11 +168,18 @@ class GameLogic:
         # Set the current players
         self.player = Piece.White
         self.opponent = Piece.Black
+        # Store the history of moves, with keyframes to seek through it
+        self.history = History(self.makeKeyframe())
+        # Start the first player's clock
+        self.switchClocks()
+        if self.journal is not None:
+            self.journal.recordReset()
 
     def skip(self):
         '''
             Allow a player to skip there go
         '''
+        move = Move(None, self.player, (), self.skipCount, self.getScores())
         # Increment the skip counter
         self.skipCount += 1
         # Check to see if we have hit the skip limit
@@ -76,6 +188,288 @@ class GameLogic:
             raise GameOverPassError()
         # Switch player and opponent
         self.switchPlayers()
+        self.switchClocks()
+        # Log the skip, this replaces anything that was undone
+        self.history.record(move, self.positionHash, self.makeKeyframe)
+        if self.journal is not None:
+            self.journal.recordSkip()
+
+    def undo(self):
+        '''
+            Take back the last turn, only the pieces placed and captured by
+            the turn are touched
+
+            Returns:
+                Move (or None if there is nothing to undo)
+        '''
+        move = self.history.back()
+        if move is None:
+            return None
+        if not move.isSkip():
+            self.seenPositions.discard(self.positionHash)
+        self.revertMove(move)
+        if not move.isSkip():
+            self.rebuildChains((move.point, ) + move.captured)
+        # Restore the scores from before the move
+        self.setScores(move.scores)
+        self.switchClocks()
+        if self.journal is not None:
+            self.journal.recordUndo()
+        return move
+
+    def redo(self):
+        '''
+            Play the last undone turn again, only the pieces placed and
+            captured by the turn are touched
+
+            Returns:
+                Move (or None if there is nothing to redo)
+        '''
+        move = self.history.forward()
+        if move is None:
+            return None
+        self.applyMove(move)
+        if not move.isSkip():
+            self.seenPositions.add(self.positionHash)
+            self.rebuildChains((move.point, ) + move.captured)
+        self.restoreScores(move)
+        self.switchClocks()
+        if self.journal is not None:
+            self.journal.recordRedo()
+        return move
+
+    def seek(self, moveNumber):
+        '''
+            Jump to the position after a number of moves, loading the nearest
+            keyframe and replaying the moves after it
+
+            Args:
+                moveNumber (int): The number of moves to have played
+        '''
+        keyframe, moves = self.history.seek(moveNumber)
+        # Load the keyframe
+        self.bitboards = dict(keyframe.bitboards)
+        self.board = [[
+            self.getPieceFromBitboards(row * self.columns + col)
+            for col in range(self.columns)
+        ] for row in range(self.rows)]
+        self.countPieces()
+        self.regions.build(self.bitboards)
+        self.positionHash = keyframe.positionHash
+        self.symmetryHash = self.zobrist.hashSymmetries(self.bitboards)
+        self.skipCount = keyframe.skipCount
+        self.player, self.opponent = (keyframe.player,
+                                      self.getOtherPiece(keyframe.player))
+        # Replay the moves on top of it
+        for move in moves:
+            self.applyMove(move)
+        self.buildChains()
+        self.seenPositions = set(self.history.getHashes())
+        if moves:
+            self.restoreScores(moves[-1])
+        else:
+            self.setScores(keyframe.scores)
+        self.switchClocks()
+        if self.journal is not None:
+            self.journal.recordSeek(moveNumber)
+
+    def loadHistory(self, history):
+        '''
+            Load a saved history, playing the game to its cursor
+
+            Args:
+                history (History): The history, for a board of this size
+        '''
+        self.history = history
+        self.seek(history.getPosition())
+
+    def applyMove(self, move):
+        '''
+            Play a logged move onto the board and its empty regions, the
+            chains and scores are left to the caller
+
+            Args:
+                move (Move): The move to play
+        '''
+        if move.isSkip():
+            self.skipCount = move.skipCount + 1
+        else:
+            self.skipCount = 0
+            self.setPiece(move.point, move.piece)
+            self.positionHash ^= self.zobrist.getKey(move.piece, move.point)
+            for stone in move.captured:
+                self.setPiece(stone, Piece.NoPiece)
+                self.positionHash ^= self.zobrist.getKey(
+                    self.getOtherPiece(move.piece), stone)
+            self.regions.update(self.bitboards, 1 << move.point,
+                                self.getMask(move.captured))
+        self.player, self.opponent = (self.getOtherPiece(move.piece),
+                                      move.piece)
+
+    def revertMove(self, move):
+        '''
+            Take a logged move back off the board and its empty regions, the
+            chains and scores are left to the caller
+
+            Args:
+                move (Move): The move to take back
+        '''
+        if not move.isSkip():
+            # Take the piece off the board
+            self.setPiece(move.point, Piece.NoPiece)
+            self.positionHash ^= self.zobrist.getKey(move.piece, move.point)
+            # Put back the captured pieces
+            opponent = self.getOtherPiece(move.piece)
+            for stone in move.captured:
+                self.setPiece(stone, opponent)
+                self.positionHash ^= self.zobrist.getKey(opponent, stone)
+            self.regions.update(self.bitboards, self.getMask(move.captured),
+                                1 << move.point)
+        self.skipCount = move.skipCount
+        # Hand the turn back to the player who made the move
+        self.player, self.opponent = (move.piece,
+                                      self.getOtherPiece(move.piece))
+
+    def restoreScores(self, lastMove):
+        '''
+            Restore the scores after moving forward through the history to
+            just after the last move. The next move holds them if there is
+            one, a skip leaves them as they were, otherwise they are counted
+
+            Args:
+                lastMove (Move): The last move played
+        '''
+        nextMove = self.history.getNextMove()
+        if nextMove is not None:
+            self.setScores(nextMove.scores)
+        elif lastMove.isSkip():
+            self.setScores(lastMove.scores)
+        else:
+            self.updateScores()
+
+    def getMoves(self):
+        '''
+            Returns the log of moves made
+
+            Returns:
+                List
+        '''
+        return self.history.getMoves()
+
+    def getHistory(self):
+        '''
+            Returns the history of the game
+
+            Returns:
+                History
+        '''
+        return self.history
+
+    def makeKeyframe(self):
+        '''
+            Take a keyframe of the current position
+
+            Returns:
+                Keyframe
+        '''
+        return Keyframe(dict(self.bitboards), self.player, self.skipCount,
+                        self.getScores(), self.positionHash)
+
+    def getScores(self):
+        '''
+            Get the (score, pieces) for each player
+
+            Returns:
+                Dict
+        '''
+        return {
+            piece: (player.getScore(), player.getPieces())
+            for piece, player in self.players.items()
+        }
+
+    def setScores(self, scores):
+        '''
+            Set the (score, pieces) for each player
+
+            Args:
+                scores (dict): The (score, pieces) keyed by piece
+        '''
+        for piece, (score, pieces) in scores.items():
+            self.players[piece].setScore(score)
+            self.players[piece].setPieces(pieces)
+
+    def getOtherPiece(self, piece):
+        '''
+            Get the piece of the other player
+
+            Args:
+                piece (Piece): The piece
+
+            Returns:
+                Piece
+        '''
+        return Piece.Black if piece == Piece.White else Piece.White
+
+    def getPieceFromBitboards(self, point):
+        '''
+            Read the piece at the flat point index from the bitboards
+
+            Args:
+                point (int): The flat point index
+
+            Returns:
+                Piece
+        '''
+        for piece, bitboard in self.bitboards.items():
+            if bitboard >> point & 1:
+                return piece
+        return Piece.NoPiece
+
+    def setPiece(self, point, piece):
+        '''
+            Set the piece at the flat point index on the board and bitboards,
+            the chains are left to the caller
+
+            Args:
+                point (int):   The flat point index
+                piece (Piece): The piece to place (or Piece.NoPiece)
+        '''
+        row, col = divmod(point, self.columns)
+        previous = self.board[row][col]
+        if previous != Piece.NoPiece:
+            self.bitboards[previous] &= ~(1 << point)
+            self.pieceCounts[previous] -= 1
+            self.symmetryHash ^= self.symmetryKeys[previous][point]
+        if piece != Piece.NoPiece:
+            self.bitboards[piece] |= 1 << point
+            self.pieceCounts[piece] += 1
+            self.symmetryHash ^= self.symmetryKeys[piece][point]
+        self.board[row][col] = piece
+
+    def countPieces(self):
+        '''
+            Count the pieces for both players from the bitboards, after this
+            the counts are kept up to date by setPiece
+        '''
+        self.pieceCounts = {
+            piece: BitBoard.count(bitboard)
+            for piece, bitboard in self.bitboards.items()
+        }
+
+    def getMask(self, points):
+        '''
+            Get the mask of some flat point indexes
+
+            Args:
+                points (iter): The flat point indexes
+
+            Returns:
+                Int
+        '''
+        mask = 0
+        for point in points:
+            mask |= 1 << point
+        return mask
 
     def copyBoard(self, board):
         '''
@@ -100,75 +494,388 @@ class GameLogic:
             Returns:
                 List
         '''
-        # A turn has taken place, so reset the skip counter
-        self.skipCount = 0
+        probe = self.instrumentation
+        if probe is None:
+            return self.placePiece(row, col)
+        # Measure the move, recording any rule it breaks as the result
+        probe.start()
+        try:
+            board = self.placePiece(row, col, probe)
+        except (OccupiedError, KOError, SuicideError) as error:
+            probe.finish(type(error).__name__)
+            raise
+        probe.finish("OK")
+        return board
+
+    def placePiece(self, row, col, probe=None):
+        '''
+            Place the current player's piece, checking the rules
+
+            Args:
+                row     (int):             The row on the board
+                col     (int):             The col on the board
+                probe   (Instrumentation): Marks each phase, if measuring
+
+            Returns:
+                List
+        '''
         # Is this space occupied?
-        if self.board[row][col] == self.opponent:
+        if self.board[row][col] != Piece.NoPiece:
             raise OccupiedError()
-        # Update the board, and store a copy of the original
-        self.previousBoards.append(self.copyBoard(self.board))
-        # Make the move
-        self.board[row][col] = self.player
-        # Scan the board for pieces and dead pieces
-        for row, col in self.getRemovedPieces(self.player, self.opponent):
-            self.board[row][col] = Piece.NoPiece
-
+        point = row * self.columns + col
+        if probe is not None:
+            probe.mark('occupied')
+        # Find the opponent chains this move takes their last liberty from
+        captured = self.getCapturedChains(point)
+        if probe is not None:
+            probe.mark('captures')
+            probe.count(
+                'chainsVisited',
+                len({
+                    self.chains[neighbour]
+                    for neighbour in self.neighbours[point]
+                } - {None}))
+        # Hash the position this move would leave behind
+        positionHash = self.getMoveHash(point, captured)
+        if probe is not None:
+            probe.mark('hash')
         # Is this a KO instance?
-        if self.isKoRule():
-            self.board = self.previousBoards.pop()
+        if self.isKoRule(positionHash):
             raise KOError()
-
-        # Remove any pieces for the opponent side
-        for row, col in self.getRemovedPieces(self.opponent, self.player):
-            self.board[row][col] = Piece.NoPiece
-
-        # Get the piece count after removing piecees
-        playerPieceCount = len(self.getPositions(self.player))
-        opponentPieceCount = len(self.getPositions(self.opponent))
+        if probe is not None:
+            probe.mark('ko')
 
         # Check if the player has hit the suicide rule
-        if self.isSuicideRule(playerPieceCount):
-            self.board = self.previousBoards.pop()
+        if not captured and self.isSuicideRule(row, col):
             raise SuicideError()
-
+        if probe is not None:
+            probe.mark('suicide')
+
+        # Keep what is needed to take the move back
+        move = Move(
+            point, self.player,
+            tuple(stone for chain in captured for stone in chain.stones),
+            self.skipCount, self.getScores())
+        # A turn has taken place, so reset the skip counter
+        self.skipCount = 0
+        # Make the move, updating the chains around it
+        self.updateChains(point, captured)
+        # Store the new position
+        self.positionHash = positionHash
+        self.seenPositions.add(positionHash)
+        if probe is not None:
+            probe.mark('place')
+            probe.count('chainsCaptured', len(captured))
+            probe.count('stonesCaptured', len(move.captured))
+        # Update the empty regions the move and its captures touched
+        self.regions.update(self.bitboards, 1 << point,
+                            self.getMask(move.captured),
+                            None if probe is None else probe.getCounters())
+        if probe is not None:
+            probe.mark('territory')
         # Update the players
-        # Players current piece count (used for suicide rule checks)
-        self.players[self.player].setPieces(playerPieceCount)
-        # Players current score
-        self.players[self.player].setScore(
-            self.getCapturedLandCount(self.player) + playerPieceCount)
-        # Opponents current piece count (used for suicide rule checks)
-        self.players[self.opponent].setPieces(opponentPieceCount)
-        # Opponents current score
-        self.players[self.opponent].setScore(
-            self.getCapturedLandCount(self.opponent) + opponentPieceCount)
+        self.updateScores()
+        if probe is not None:
+            probe.mark('pieces')
 
         # Turn over, switch players
         self.switchPlayers()
+        self.switchClocks()
+        # Log the move, this replaces anything that was undone
+        self.history.record(move, self.positionHash, self.makeKeyframe)
+        if probe is not None:
+            probe.mark('history')
+            if not self.history.getPosition() % self.history.interval:
+                probe.count('keyframes')
+        if self.journal is not None:
+            self.journal.recordMove(point)
         # Return the latest board
         return self.board
 
-    def isKoRule(self):
+    def isLegal(self, row, col):
         '''
-            Is the KO rule in effect
+            Could the current player place a piece at the position, this
+            checks the same rules as updateBoard from the chain liberties,
+            without changing or copying the board
+
+            Args:
+                row (int): The row on the board
+                col (int): The col on the board
 
             Returns:
                 Bool
         '''
-        # If there haven't been two turns, then there's no chance of this
-        if len(self.previousBoards) < 2:
+        if not (0 <= row < self.rows and 0 <= col < self.columns):
             return False
-        # Compare the last player turn with this player turn
-        return self.previousBoards[-2] == self.board
+        return self.isLegalPoint(row * self.columns + col)
 
-    def isSuicideRule(self, newPieceCount):
+    def isLegalPoint(self, point):
         '''
-            Is the suicide rule in effect
+            Could the current player place a piece at the flat point index
+
+            Args:
+                point (int): The flat point index
 
             Returns:
                 Bool
         '''
-        return self.players[self.player].getPieces() >= newPieceCount
+        # Is this space occupied?
+        if self.chains[point] is not None:
+            return False
+        captured = self.getCapturedChains(point)
+        # Would this be suicide?
+        if not captured and self.isSuicideRule(*divmod(point, self.columns)):
+            return False
+        # Would this repeat a position (KO)?
+        return not self.isKoRule(self.getMoveHash(point, captured))
+
+    def legalMoves(self):
+        '''
+            Get every point the current player could place a piece at
+
+            Returns:
+                Int (a bitboard of the legal points)
+        '''
+        empty = self.bitBoard.full & ~(self.bitboards[Piece.White]
+                                       | self.bitboards[Piece.Black])
+        legal = 0
+        for point in self.bitBoard.points(empty):
+            if self.isLegalPoint(point):
+                legal |= 1 << point
+        return legal
+
+    def updateScores(self):
+        '''
+            Set the scores for both players from the piece counts and the
+            territory of the empty regions, which are kept up to date as
+            pieces are placed and removed
+        '''
+        territory = self.regions.getTerritory()
+        for piece, player in self.players.items():
+            # Players current piece count
+            pieceCount = self.pieceCounts[piece]
+            player.setPieces(pieceCount)
+            # Players current score
+            player.setScore(territory[piece] + pieceCount)
+
+    def getCapturedChains(self, point):
+        '''
+            Find the opponent chains that would be captured by the current
+            player placing a piece at the point
+
+            Args:
+                point (int): The flat index of the move
+
+            Returns:
+                List
+        '''
+        captured = []
+        for neighbour in self.neighbours[point]:
+            chain = self.chains[neighbour]
+            # Only opponent chains in atari on this point are taken
+            if (chain is not None and chain.piece == self.opponent
+                    and chain.liberties == {point} and chain not in captured):
+                captured.append(chain)
+        return captured
+
+    def updateChains(self, point, captured):
+        '''
+            Place the current player on the point, merging and capturing
+            chains around it. Only the chains touching the point are visited,
+            the board and bitboards are updated to match
+
+            Args:
+                point       (int):  The flat index of the move
+                captured    (list): The opponent chains to remove
+        '''
+        self.setPiece(point, self.player)
+        chain = Chain(self.player, {point}, set())
+        self.chains[point] = chain
+        for neighbour in self.neighbours[point]:
+            adjacent = self.chains[neighbour]
+            if adjacent is None:
+                chain.liberties.add(neighbour)
+            elif adjacent.piece != self.player:
+                # The opponent loses this liberty
+                adjacent.liberties.discard(point)
+            elif adjacent is not chain:
+                # Join the chains, keeping the larger one to relabel less
+                if len(adjacent.stones) < len(chain.stones):
+                    chain, adjacent = adjacent, chain
+                adjacent.merge(chain)
+                for stone in chain.stones:
+                    self.chains[stone] = adjacent
+                chain = adjacent
+        chain.liberties.discard(point)
+        # Remove the captured chains, handing back liberties to their
+        # neighbours
+        for capturedChain in captured:
+            for stone in capturedChain.stones:
+                self.chains[stone] = None
+                self.setPiece(stone, Piece.NoPiece)
+            for stone in capturedChain.stones:
+                for neighbour in self.neighbours[stone]:
+                    adjacent = self.chains[neighbour]
+                    if adjacent is not None:
+                        adjacent.liberties.add(stone)
+
+    def buildChains(self):
+        '''
+            Build the chains for the current board from scratch
+
+            Returns:
+                List
+        '''
+        self.chains = [None] * (self.rows * self.columns)
+        for point in range(len(self.chains)):
+            self.floodChain(point)
+        return self.chains
+
+    def rebuildChains(self, points):
+        '''
+            Rebuild the chains around points that have changed on the board,
+            only the chains on or next to the points are visited
+
+            Args:
+                points (iter): The flat point indexes that changed
+        '''
+        seeds = set(points)
+        # Drop any chain on or next to the points
+        for point in points:
+            for adjacent in (point, ) + self.neighbours[point]:
+                chain = self.chains[adjacent]
+                if chain is not None:
+                    for stone in chain.stones:
+                        self.chains[stone] = None
+                    seeds |= chain.stones
+        # Flood them back from the board
+        for point in seeds:
+            self.floodChain(point)
+
+    def floodChain(self, point):
+        '''
+            Flood fill a new chain from the point, if it holds a piece that
+            isn't already in a chain
+
+            Args:
+                point (int): The flat point index
+        '''
+        row, col = divmod(point, self.columns)
+        piece = self.board[row][col]
+        if piece == Piece.NoPiece or self.chains[point] is not None:
+            return
+        chain = Chain(piece, {point}, set())
+        self.chains[point] = chain
+        bucket = [point]
+        while bucket:
+            for neighbour in self.neighbours[bucket.pop()]:
+                row, col = divmod(neighbour, self.columns)
+                adjacent = self.board[row][col]
+                if adjacent == Piece.NoPiece:
+                    chain.liberties.add(neighbour)
+                elif adjacent == piece and self.chains[neighbour] is None:
+                    chain.stones.add(neighbour)
+                    self.chains[neighbour] = chain
+                    bucket.append(neighbour)
+
+    def getChain(self, row, col):
+        '''
+            Get the chain at the position on the board
+
+            Args:
+                row (int): The row on the board
+                col (int): The col on the board
+
+            Returns:
+                Chain
+        '''
+        return self.chains[row * self.columns + col]
+
+    def isKoRule(self, positionHash):
+        '''
+            Is the KO rule in effect, this is positional superko so any
+            position that has been seen before can't be played again
+
+            Args:
+                positionHash (int): The hash of the position after the move
+
+            Returns:
+                Bool
+        '''
+        return positionHash in self.seenPositions
+
+    def getMoveHash(self, point, captured):
+        '''
+            Get the hash of the position after the current player places a
+            piece on the point, without changing the board
+
+            Args:
+                point       (int):  The flat index of the move
+                captured    (list): The opponent chains the move removes
+
+            Returns:
+                Int
+        '''
+        positionHash = self.positionHash ^ self.zobrist.getKey(
+            self.player, point)
+        for chain in captured:
+            for stone in chain.stones:
+                positionHash ^= self.zobrist.getKey(self.opponent, stone)
+        return positionHash
+
+    def getPositionHash(self):
+        '''
+            Get the Zobrist hash of the current position, this can be used as
+            a key for caches and transposition tables
+
+            Returns:
+                Int
+        '''
+        return self.positionHash
+
+    def getSymmetryHash(self):
+        '''
+            Returns the hashes of the position under every symmetry, packed
+            as by ZobristTable.hashSymmetries
+
+            Returns:
+                Int
+        '''
+        return self.symmetryHash
+
+    def getCanonicalKey(self):
+        '''
+            Get the canonical form of the position, the same for every
+            rotation, reflection and colour swap of it
+
+            Returns:
+                Tuple (hash, player to move, symmetry, swapped)
+        '''
+        return self.zobrist.canonicalise(self.symmetryHash, self.player)
+
+    def isSuicideRule(self, row, col):
+        '''
+            Is the suicide rule in effect, would placing a piece for the
+            current player at the position leave it without liberties. This
+            assumes the move doesn't capture anything
+
+            Args:
+                row (int): The row on the board
+                col (int): The col on the board
+
+            Returns:
+                Bool
+        '''
+        point = row * self.columns + col
+        for neighbour in self.neighbours[point]:
+            chain = self.chains[neighbour]
+            # An empty neighbour is a liberty for the new piece
+            if chain is None:
+                return False
+            # A friendly chain with another liberty will share it
+            if chain.piece == self.player and len(chain.liberties) > 1:
+                return False
+        return True
 
     def switchPlayers(self):
         '''
@@ -176,6 +883,24 @@ class GameLogic:
         '''
         (self.player, self.opponent) = self.opponent, self.player
 
+    def switchClocks(self):
+        '''
+            Run the clock of the player to move, stopping the other player's
+            clock and charging them the exact time they took
+        '''
+        for piece, player in self.players.items():
+            if piece == self.player:
+                player.startClock()
+            else:
+                player.stopClock()
+
+    def stopClocks(self):
+        '''
+            Stop both players' clocks, once the game is over
+        '''
+        for player in self.players.values():
+            player.stopClock()
+
     def getRemovedPieces(self, player, opponent):
         '''
             Find the taken pieces to remove
@@ -200,7 +925,25 @@ class GameLogic:
             Returns:
                 Int
         '''
-        return len(self.scanBoard(player, Piece.NoPiece))
+        return self.getCapturedLandCounts()[player]
+
+    def getCapturedLandCounts(self, counters=None):
+        '''
+            Get the captured land for both players in a single pass
+
+            Args:
+                counters (dict): Instrumentation counters to add the regions
+                                 and points flood filled to
+
+            Returns:
+                Dict
+        '''
+        # Play keeps the territory up to date in the regions, this counts
+        # it again from scratch, from a NumPy array made for the count
+        if self.numpyTerritory is not None:
+            territory = self.numpyTerritory
+            return territory.count(territory.makeArray(self.board))
+        return countTerritory(self.bitBoard, self.bitboards, counters)
 
     def getBoard(self):
         '''
@@ -218,16 +961,23 @@ class GameLogic:
             Returns:
                 List
         '''
-        # A store for our opponents
-        opponentsToCheck = []
-        # Nested loop through the board matrix
-        for row in range(0, self.height + 1):
-            for col in range(0, self.width + 1):
-                # If this is an opponent, then add it to the list
-                if self.board[row][col] == opponent:
-                    opponentsToCheck.append((row, col))
-        # Return the list
-        return opponentsToCheck
+        return self.bitBoard.positions(self.getPieceMask(opponent))
+
+    def getPieceMask(self, piece):
+        '''
+            Get the bitboard for a piece, for Piece.NoPiece this is the mask
+            of empty points
+
+            Args:
+                piece (Piece): The piece
+
+            Returns:
+                Int
+        '''
+        if piece == Piece.NoPiece:
+            return self.bitBoard.full & ~(self.bitboards[Piece.White]
+                                          | self.bitboards[Piece.Black])
+        return self.bitboards[piece]
 
     def getAdjacents(self, row, col):
         '''
@@ -240,14 +990,10 @@ class GameLogic:
             Returns:
                 List
         '''
-        # Return a list of indexes as tuples around the given matrix position
+        # Read the positions from the shared neighbour table
         return [
-            adjacent
-            for adjacent in [(row, col - 1) if col > 0 else None, (
-                row - 1, col) if row > 0 else None, (
-                    row + 1, col) if row < self.height else None, (
-                        row, col + 1) if col < self.width else None]
-            if adjacent
+            divmod(adjacent, self.columns)
+            for adjacent in self.neighbours[row * self.columns + col]
         ]
 
     def scanBoard(self, player, opponent):
@@ -257,60 +1003,27 @@ class GameLogic:
             Returns:
                 list
         '''
-        # Create a list to store dead pieces
-        deadPieces = []
-        # Get the opponent positions as a list of tuples representing vertices
-        opponentPositions = self.getPositions(opponent)
-        # If this is empty, then return an empty list
-        if not opponentPositions:
-            return []
-        # Store any checked positions to prevent infinite loops
-        checked = []
-        # Iterate through each opponent position
-        for opponentPosition in opponentPositions:
-            # If this has been previously checked, skip ahead
-            if opponentPosition in checked:
-                continue
-            # Add this to our checked list
-            checked.append(opponentPosition)
-            # Create a bucket for pieces in this group starting with
-            # the current position, this will be emptied
-            opponentGroup = [opponentPosition]
-            # Create a list to store all adjacents around this group
-            adjacentSpots = []
-            # This will be filled with the group
-            group = [opponentPosition]
-            # while we have pieces in the opponent group bucket
-            while opponentGroup:
-                # Get the last elementgit
-                position = opponentGroup.pop()
-                # Get the adjacents for this piece
-                for adjacent in self.getAdjacents(*position):
-                    # Check the adjacent
-                    if (
-                            # If it's already been added into the bucket
-                            adjacent in opponentGroup
-                            # If it's already an adjacent
-                            or adjacent in adjacentSpots
-                            # if it's been checked previously
-                            or adjacent in checked):
-                        continue
-                    # If this adjacent has the opponent piece...
-                    if self.hasSpecificPiece(opponent, *adjacent):
-                        # We need to check this for adjacents
-                        opponentGroup.append(adjacent)
-                        # This is part of the group
-                        group.append(adjacent)
-                        # This piece will be checked so don't check twice
-                        checked.append(adjacent)
-                    else:
-                        # Else this is an adjacent that we need to see
-                        # if the player is covering
-                        adjacentSpots.append(adjacent)
-            if self.areAdjacentsCovered(player, adjacentSpots):
-                # If all adjacents are covered, then these are dead pieces
-                deadPieces += group
-        # Return the dead pieces to be removed
+        return self.bitBoard.positions(self.scanBoardMask(player, opponent))
+
+    def scanBoardMask(self, player, opponent):
+        '''
+            Scan the board for the opponent groups that are surrounded by the
+            player, using bitboard flood fills
+
+            Args:
+                player     (Piece): The player
+                opponent   (Piece): The opponent
+
+            Returns:
+                Int
+        '''
+        # Anything that isn't the player breaks the surrounding
+        uncovered = ~self.getPieceMask(player)
+        deadPieces = 0
+        for group in self.bitBoard.groups(self.getPieceMask(opponent)):
+            # If all adjacents are covered, then these are dead pieces
+            if not self.bitBoard.neighbours(group) & uncovered:
+                deadPieces |= group
         return deadPieces
 
     def areAdjacentsCovered(self, player, adjacents):
@@ -324,10 +1037,10 @@ class GameLogic:
             Returns:
                 bool
         '''
+        mask = 0
         for adjacent in adjacents:
-            if not self.hasSpecificPiece(player, *adjacent):
-                return False
-        return True
+            mask |= self.bitBoard.bit(*adjacent)
+        return not mask & ~self.getPieceMask(player)
 
     def hasSpecificPiece(self, piece, row, col):
         '''
@@ -341,10 +1054,7 @@ class GameLogic:
             Returns:
                 bool
         '''
-        try:
-            return self.board[row][col] == piece
-        except IndexError:
-            raise IndexError("list index out of range")
+        return bool(self.getPieceMask(piece) & self.bitBoard.bit(row, col))
 
     '''
         Get the player with the highest score
@@ -362,12 +1072,17 @@ class GameLogic:
 
 class Player:
     '''
-        Represent a player
+        Represent a player, with a clock of the time they have left. The
+        clock runs from a monotonic timestamp rather than ticking, so the
+        time left is exact whenever it's read and nothing needs to wake up
+        to count it down
 
         Args:
             name (str): The name for the player
     '''
     TIMER = 120
+    # The clock the time is measured with, in seconds
+    clock = time.monotonic
 
     def __init__(self, name, color):
         self.name = name
@@ -393,8 +1108,38 @@ class Player:
         self.pieces = pieces
 
     def deductTimeRemaining(self, time):
+        '''
+            Take time off the player's clock
+
+            Args:
+                time (float): The seconds to take off
+        '''
         self.timeRemaining -= time
 
+    def startClock(self):
+        '''
+            Start the player's clock running, if it isn't already
+        '''
+        if self.started is None:
+            self.started = self.clock()
+
+    def stopClock(self):
+        '''
+            Stop the player's clock, taking off the time since it started
+        '''
+        if self.started is not None:
+            self.deductTimeRemaining(self.clock() - self.started)
+            self.started = None
+
+    def isClockRunning(self):
+        '''
+            Is the player's clock running
+
+            Returns:
+                Bool
+        '''
+        return self.started is not None
+
     def getColor(self):
         return self.color
 
@@ -420,10 +1165,25 @@ class Player:
         return self.name
 
     def getTimeRemaining(self):
-        return self.timeRemaining
+        '''
+            Get the seconds the player has left, counting the time since
+            their clock started
+
+            Returns:
+                Float
+        '''
+        if self.started is None:
+            return self.timeRemaining
+        return self.timeRemaining - (self.clock() - self.started)
 
     def hasTimeLeft(self):
-        return self.timeRemaining > 0
+        '''
+            Does the player have time left
+
+            Returns:
+                Bool
+        '''
+        return self.getTimeRemaining() > 0
 
     def reset(self):
         '''
@@ -431,7 +1191,9 @@ class Player:
         '''
         self.score = 0
         self.pieces = 0
-        self.timeRemaining = self.TIMER
+        self.timeRemaining = float(self.TIMER)
+        # When the clock started running, None while it's stopped
+        self.started = None
 
 
 class GameOverPassError(Exception):
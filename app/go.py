@@ -1,23 +1,34 @@
 '''
     Core Go Application
 '''
-from PyQt5.QtWidgets import (QMainWindow, QDesktopWidget, QDialog, QLCDNumber,
-                             QDialogButtonBox, QLabel, QToolBar, QPushButton,
-                             QHBoxLayout, QVBoxLayout, QMenuBar, QMessageBox,
-                             QWidget, QAction, qApp)
+import math
+import os
+import sys
+
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QDesktopWidget,
+                             QDialog, QLCDNumber, QDialogButtonBox, QLabel,
+                             QToolBar, QPushButton, QHBoxLayout, QVBoxLayout,
+                             QMenuBar, QMessageBox, QWidget, QAction, QSlider,
+                             QComboBox, QInputDialog, qApp)
 from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt, pyqtSlot
 from .board import Board
+from .game_logic import GameLogic
+from .instrumentation import Instrumentation
+from .journal import Journal
 from .score_board import ScoreBoard
 
 
 class Go(QMainWindow):
     '''
         Go extends from QMainWindow
+
+        Args:
+            size (int): The number of rows and columns on the board
     '''
-    def __init__(self):
+    def __init__(self, size=None):
         super().__init__()
-        self.initUI()
+        self.initUI(size)
 
     def getBoard(self):
         '''
@@ -28,6 +39,16 @@ class Go(QMainWindow):
         '''
         return self.board
 
+    def setJournal(self, journal):
+        '''
+            Write the game to a journal, resuming the game already in it
+
+            Args:
+                journal (Journal): The journal
+        '''
+        self.board.setJournal(journal)
+        self.showBoardSize()
+
     def getScoreBoard(self):
         '''
             Getter for score board
@@ -37,11 +58,14 @@ class Go(QMainWindow):
         '''
         return self.scoreBoard
 
-    def initUI(self):
+    def initUI(self, size=None):
         '''
             Initiates application UI
+
+            Args:
+                size (int): The number of rows and columns on the board
         '''
-        self.board = Board(self)
+        self.board = Board(self, size)
         self.setCentralWidget(self.board)
         self.scoreBoard = ScoreBoard()
         self.addDockWidget(Qt.RightDockWidgetArea, self.scoreBoard)
@@ -91,6 +115,38 @@ class Go(QMainWindow):
         undo = QPushButton("Undo")
         undo.clicked.connect(self.board.undo)
         self.toolbar.addWidget(undo)
+
+        # Redo an undone turn
+        redo = QPushButton("Redo")
+        redo.clicked.connect(self.board.redo)
+        self.toolbar.addWidget(redo)
+
+        # Play against the computer
+        computer = QPushButton("Computer")
+        computer.setCheckable(True)
+        computer.toggled.connect(self.board.setComputerPlayer)
+        self.toolbar.addWidget(computer)
+
+        # Start a new game on another size of board
+        self.sizeBox = QComboBox()
+        self.sizeBox.addItems([f"{size}x{size}" for size in GameLogic.SIZES] +
+                              ["Custom..."])
+        self.showBoardSize()
+        self.sizeBox.activated.connect(self.chooseBoardSize)
+        self.toolbar.addWidget(self.sizeBox)
+
+        # Scrub through the moves played
+        history = QWidget()
+        historyLayout = QHBoxLayout()
+        historyLayout.addWidget(QLabel("Move:"))
+        self.moveSlider = QSlider(Qt.Horizontal)
+        self.moveSlider.setRange(0, 0)
+        self.moveSlider.valueChanged.connect(self.board.seek)
+        historyLayout.addWidget(self.moveSlider)
+        self.moveLabel = QLabel("0 / 0")
+        historyLayout.addWidget(self.moveLabel)
+        history.setLayout(historyLayout)
+        self.toolbar.addWidget(history)
         '''
         Charlie code added below
 
@@ -173,6 +229,7 @@ class Go(QMainWindow):
         self.board.updatePlayersTimer.connect(self.updatePlayerTimer)
         self.board.updateCurrentPlayerSignal.connect(self.updatePlayer)
         self.board.updateGameOverSignal.connect(self.updateGameOver)
+        self.board.updateHistorySignal.connect(self.updateHistory)
 
     @pyqtSlot(object)
     def updatePlayer(self, player):
@@ -198,8 +255,61 @@ class Go(QMainWindow):
         '''
             Update the player timer from players
         '''
+        # Show whole seconds, rounded up so zero means the time is up
         self.playerTimeDisplay.display(
-            self.board.getCurrentPlayer().getTimeRemaining())
+            max(0, math.ceil(
+                self.board.getCurrentPlayer().getTimeRemaining())))
+
+    @pyqtSlot(int, int)
+    def updateHistory(self, position, length):
+        '''
+            Update the move slider from the history
+
+            Args:
+                position    (int): The number of moves played
+                length      (int): The number of moves recorded
+        '''
+        # Don't let updating the slider trigger another seek
+        self.moveSlider.blockSignals(True)
+        self.moveSlider.setRange(0, length)
+        self.moveSlider.setValue(position)
+        self.moveSlider.blockSignals(False)
+        self.moveLabel.setText(f"{position} / {length}")
+
+    def chooseBoardSize(self, index):
+        '''
+            Start a new game on the board size picked, asking for the size
+            if a custom one is picked
+
+            Args:
+                index (int): The index of the size picked
+        '''
+        if index < self.sizeBox.count() - 1:
+            size = int(self.sizeBox.itemText(index).split("x")[0])
+        else:
+            size, ok = QInputDialog.getInt(self, "Board size",
+                                           "Rows and columns:",
+                                           self.board.getBoardSize(), 2,
+                                           GameLogic.MAX_SIZE)
+            if not ok:
+                self.showBoardSize()
+                return
+        self.board.setBoardSize(size)
+        self.showBoardSize()
+
+    def showBoardSize(self):
+        '''
+            Show the board's size in the size box, adding it if it's a
+            custom size
+        '''
+        size = self.board.getBoardSize()
+        label = f"{size}x{size}"
+        index = self.sizeBox.findText(label)
+        if index < 0:
+            # Custom sizes go just before the custom option
+            index = self.sizeBox.count() - 1
+            self.sizeBox.insertItem(index, label)
+        self.sizeBox.setCurrentIndex(index)
 
     def trySkip(self):
         '''
@@ -255,3 +365,35 @@ class Go(QMainWindow):
         size = self.geometry()
         self.move((screen.width() - size.width()) / 2,
                   (screen.height() - size.height()) / 2)
+
+
+def main(arguments=None):
+    '''
+        Run the app. Pass a board size to start on it. Set PYGO_INSTRUMENT
+        to time each move, the report is written to stderr when the app
+        closes. Set PYGO_JOURNAL to a file to journal the game to, the game
+        in it is resumed
+
+        Args:
+            arguments (list): The command line arguments
+
+        Returns:
+            Int (the exit status)
+    '''
+    arguments = sys.argv[1:] if arguments is None else arguments
+    application = QApplication(sys.argv[:1])
+    go = Go(int(arguments[0]) if arguments else None)
+    instrumentation = None
+    if os.environ.get('PYGO_INSTRUMENT'):
+        instrumentation = Instrumentation()
+        go.getBoard().gameLogic.setInstrumentation(instrumentation)
+    journal = None
+    if os.environ.get('PYGO_JOURNAL'):
+        journal = Journal(os.environ['PYGO_JOURNAL'])
+        go.setJournal(journal)
+    status = application.exec_()
+    if journal is not None:
+        journal.close()
+    if instrumentation is not None:
+        sys.stderr.write(instrumentation.report() + "\n")
+    return status
@@ -0,0 +1,413 @@
+'''
+    Plays GameLogic over the Go Text Protocol (GTP), on stdin and stdout
+'''
+import argparse
+import sys
+
+from .game_logic import (GameLogic, GameOverPassError, KOError, OccupiedError,
+                         SuicideError)
+from .mcts import MCTS
+from .piece import Piece
+from .transposition import TranspositionTable
+
+# The columns of a GTP vertex, I is left out
+COLUMNS = "ABCDEFGHJKLMNOPQRSTUVWXYZ"
+COLOURS = {
+    'b': Piece.Black,
+    'black': Piece.Black,
+    'w': Piece.White,
+    'white': Piece.White
+}
+
+
+class GTPError(Exception):
+    '''
+        A command that failed, the message is sent back to the controller
+    '''
+    pass
+
+
+class GTPEngine:
+    '''
+        GTPEngine answers GTP commands for a GameLogic game, generating
+        moves with MCTS.
+
+        GTP lets either colour play at any time, and expects Black to go
+        first, where GameLogic has the players take turns starting with
+        White. For a move by the player who isn't to move, the turn is
+        handed over first without a skip, so it doesn't count towards the
+        skip limit or need its own undo. Two passes in a row end the game,
+        after that moves are refused until the last pass is undone or the
+        board is cleared. Komi is added to White's score, which makes up for
+        Black going first
+
+        Args:
+            size        (int):   The number of rows and columns on the board
+            playouts    (int):   The playouts genmove runs
+            timeLimit   (float): The seconds genmove searches for, None for
+                                 no limit
+            seed        (int):   The seed for the computer player
+    '''
+    NAME = "PyGo"
+    VERSION = "1.0"
+    PROTOCOL_VERSION = 2
+
+    def __init__(self, size=19, playouts=1000, timeLimit=None, seed=None):
+        self.playouts = playouts
+        self.timeLimit = timeLimit
+        self.seed = seed
+        self.komi = 0.0
+        self.running = True
+        # The positions the computer player remembers its searches for, it
+        # outlives the games
+        self.table = TranspositionTable(4096)
+        self.commands = {
+            'protocol_version': self.protocolVersion,
+            'name': self.name,
+            'version': self.version,
+            'known_command': self.knownCommand,
+            'list_commands': self.listCommands,
+            'quit': self.quit,
+            'boardsize': self.boardSize,
+            'clear_board': self.clearBoard,
+            'komi': self.setKomi,
+            'play': self.play,
+            'genmove': self.genmove,
+            'undo': self.undo,
+            'final_score': self.finalScore,
+            'showboard': self.showBoard
+        }
+        # The arguments each command takes
+        self.arities = {
+            command: handler.__code__.co_argcount - 1
+            for command, handler in self.commands.items()
+        }
+        self.newGame(size)
+
+    def newGame(self, size):
+        '''
+            Start a game on an empty board
+
+            Args:
+                size (int): The number of rows and columns on the board
+        '''
+        self.size = size
+        self.logic = GameLogic(GameLogic.makeBoard(size))
+        self.over = False
+        self.computer = MCTS(self.timeLimit, self.playouts, self.seed,
+                             self.table)
+
+    def handle(self, line):
+        '''
+            Answer a line from the controller
+
+            Args:
+                line (str): The command line
+
+            Returns:
+                Str (the response, or None for a line with no command)
+        '''
+        # Drop comments and control characters
+        line = line.split('#', 1)[0].replace('\t', ' ').strip()
+        if not line:
+            return None
+        words = line.split()
+        identifier = ""
+        if words[0].isdigit():
+            identifier = words.pop(0)
+            if not words:
+                return None
+        command, arguments = words[0].lower(), words[1:]
+        handler = self.commands.get(command)
+        try:
+            if handler is None:
+                raise GTPError("unknown command")
+            if len(arguments) != self.arities[command]:
+                raise GTPError("syntax error")
+            result = handler(*arguments)
+        except GTPError as error:
+            return "?{} {}\n\n".format(identifier, error)
+        return "={} {}\n\n".format(identifier, result or "")
+
+    def run(self, stdin=None, stdout=None):
+        '''
+            Answer commands until quit or the end of the input. Lines are
+            read through the input's buffer, and each response is written
+            and flushed in one go
+
+            Args:
+                stdin   (file): The commands, stdin by default
+                stdout  (file): Where the responses go, stdout by default
+        '''
+        stdin = sys.stdin if stdin is None else stdin
+        stdout = sys.stdout if stdout is None else stdout
+        write, flush = stdout.write, stdout.flush
+        for line in stdin:
+            response = self.handle(line)
+            if response is None:
+                continue
+            write(response)
+            flush()
+            if not self.running:
+                break
+
+    def protocolVersion(self):
+        return str(self.PROTOCOL_VERSION)
+
+    def name(self):
+        return self.NAME
+
+    def version(self):
+        return self.VERSION
+
+    def knownCommand(self, command):
+        return "true" if command.lower() in self.commands else "false"
+
+    def listCommands(self):
+        return "\n".join(self.commands)
+
+    def quit(self):
+        self.running = False
+
+    def boardSize(self, size):
+        '''
+            Start a game on a board of a different size
+
+            Args:
+                size (str): The number of rows and columns
+        '''
+        if not size.isdigit():
+            raise GTPError("syntax error")
+        size = int(size)
+        if not 2 <= size <= min(GameLogic.MAX_SIZE, len(COLUMNS)):
+            raise GTPError("unacceptable size")
+        self.newGame(size)
+
+    def clearBoard(self):
+        '''
+            Start the game again on the same board
+        '''
+        self.logic.reset()
+        self.over = False
+
+    def setKomi(self, komi):
+        '''
+            Set the points added to White's score
+
+            Args:
+                komi (str): The komi
+        '''
+        try:
+            self.komi = float(komi)
+        except ValueError:
+            raise GTPError("syntax error")
+
+    def play(self, colour, vertex):
+        '''
+            Play a move for a colour
+
+            Args:
+                colour (str): The colour
+                vertex (str): The point, or pass
+        '''
+        piece = self.getColour(colour)
+        point = self.getPoint(vertex)
+        handed = self.takeTurn(piece)
+        if point is None:
+            self.skip()
+            return
+        try:
+            self.logic.updateBoard(*divmod(point, self.size))
+        except (OccupiedError, KOError, SuicideError):
+            if handed:
+                self.handBack()
+            raise GTPError("illegal move")
+
+    def genmove(self, colour):
+        '''
+            Search for a move for a colour and play it
+
+            Args:
+                colour (str): The colour
+
+            Returns:
+                Str (the vertex played, or pass)
+        '''
+        self.takeTurn(self.getColour(colour))
+        self.computer.search(self.logic)
+        # Play the best move that's still legal, or skip
+        move = self.computer.getLegalMove(self.logic)
+        if move is None:
+            self.skip()
+        else:
+            self.logic.updateBoard(*divmod(move, self.size))
+        return self.getVertex(move)
+
+    def undo(self):
+        '''
+            Take back the last move, the pass that ended the game if it's
+            over
+        '''
+        if self.over:
+            self.over = False
+        elif self.logic.undo() is None:
+            raise GTPError("cannot undo")
+
+    def finalScore(self):
+        '''
+            Score the game, stones and territory with komi for White
+
+            Returns:
+                Str (such as W+3.5, B+2 or 0)
+        '''
+        players = self.logic.getPlayers()
+        margin = (players[Piece.White].getScore() + self.komi -
+                  players[Piece.Black].getScore())
+        if not margin:
+            return "0"
+        return "{}+{:g}".format("W" if margin > 0 else "B", abs(margin))
+
+    def showBoard(self):
+        '''
+            Draw the board, Black as X and White as O
+
+            Returns:
+                Str
+        '''
+        marks = {Piece.NoPiece: '.', Piece.Black: 'X', Piece.White: 'O'}
+        columns = " ".join(COLUMNS[:self.size])
+        lines = ["   " + columns]
+        for row, cells in enumerate(self.logic.getBoard()):
+            number = self.size - row
+            lines.append("{:>2} {} {}".format(
+                number, " ".join(marks[cell] for cell in cells), number))
+        lines.append("   " + columns)
+        return "\n" + "\n".join(lines)
+
+    def takeTurn(self, piece):
+        '''
+            Make it the piece's go, handing it over from the other player if
+            it's theirs. Nothing is recorded, undoing the piece's move hands
+            the go back
+
+            Args:
+                piece (Piece): The piece to move
+
+            Returns:
+                Bool (was the go handed over)
+        '''
+        if self.over:
+            raise GTPError("the game is over")
+        if self.logic.player == piece:
+            return False
+        self.logic.switchPlayers()
+        self.logic.switchClocks()
+        return True
+
+    def handBack(self):
+        '''
+            Give the go back to the player takeTurn handed it over from
+        '''
+        self.logic.switchPlayers()
+        self.logic.switchClocks()
+
+    def skip(self):
+        '''
+            Pass the current player's go, ending the game if it's the second
+            pass in a row
+        '''
+        try:
+            self.logic.skip()
+        except GameOverPassError:
+            # GameLogic counts the ending skip without recording it, take the
+            # count back so undoing the pass carries on from before it
+            self.logic.skipCount -= 1
+            self.over = True
+
+    def getColour(self, colour):
+        '''
+            Read a GTP colour
+
+            Args:
+                colour (str): The colour
+
+            Returns:
+                Piece
+        '''
+        piece = COLOURS.get(colour.lower())
+        if piece is None:
+            raise GTPError("invalid color")
+        return piece
+
+    def getPoint(self, vertex):
+        '''
+            Read a GTP vertex, columns are letters from the left and rows are
+            numbered from the bottom
+
+            Args:
+                vertex (str): The vertex, such as D4 or pass
+
+            Returns:
+                Int (the flat point index, or None for a pass)
+        '''
+        vertex = vertex.upper()
+        if vertex == "PASS":
+            return None
+        col = COLUMNS.find(vertex[:1])
+        number = vertex[1:]
+        if col < 0 or not number.isdigit():
+            raise GTPError("invalid vertex")
+        row = self.size - int(number)
+        if not (0 <= row < self.size and col < self.size):
+            raise GTPError("invalid vertex")
+        return row * self.size + col
+
+    def getVertex(self, point):
+        '''
+            Write a flat point index as a GTP vertex
+
+            Args:
+                point (int): The flat point index, None for a pass
+
+            Returns:
+                Str
+        '''
+        if point is None:
+            return "pass"
+        row, col = divmod(point, self.size)
+        return "{}{}".format(COLUMNS[col], self.size - row)
+
+
+def main(arguments=None):
+    '''
+        Answer GTP commands on stdin and stdout
+
+        Args:
+            arguments (list): The command line arguments
+    '''
+    parser = argparse.ArgumentParser(
+        description="Plays PyGo over the Go Text Protocol on stdin and stdout")
+    parser.add_argument('-s',
+                        '--size',
+                        type=int,
+                        default=19,
+                        help="Rows and columns on the board")
+    parser.add_argument('--playouts',
+                        type=int,
+                        default=1000,
+                        help="Playouts for each generated move")
+    parser.add_argument('--seconds',
+                        type=float,
+                        default=None,
+                        help="Seconds to search each generated move for")
+    parser.add_argument('--seed',
+                        type=int,
+                        default=None,
+                        help="Seed for the computer player")
+    options = parser.parse_args(arguments)
+    GTPEngine(options.size, options.playouts, options.seconds,
+              options.seed).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+'''
+    Stores the history of a game
+'''
+
+
+class Keyframe:
+    '''
+        A full snapshot of a position in the game
+
+        Args:
+            bitboards       (dict):  The bitboard for each piece
+            player          (Piece): The player to move
+            skipCount       (int):   The skip counter
+            scores          (dict):  The (score, pieces) of each player
+            positionHash    (int):   The hash of the position
+    '''
+    __slots__ = ('bitboards', 'player', 'skipCount', 'scores', 'positionHash')
+
+    def __init__(self, bitboards, player, skipCount, scores, positionHash):
+        self.bitboards = bitboards
+        self.player = player
+        self.skipCount = skipCount
+        self.scores = scores
+        self.positionHash = positionHash
+
+
+class History:
+    '''
+        History keeps a keyframe of the full position every interval moves,
+        and a compact Move for every turn in between. Any move number can be
+        restored by loading the keyframe before it and replaying at most
+        interval moves.
+
+        The history has a cursor, moves after the cursor have been undone
+        and can be replayed until a new move is recorded over them
+
+        Args:
+            keyframe (Keyframe): The keyframe for the start of the game
+            interval (int):      The number of moves between keyframes
+    '''
+    KEYFRAME_INTERVAL = 32
+
+    def __init__(self, keyframe, interval=None):
+        self.interval = interval or self.KEYFRAME_INTERVAL
+        # Every move recorded, including any that have been undone
+        self.moves = []
+        # The position hash after each move, starting with the first position
+        self.hashes = [keyframe.positionHash]
+        # A keyframe for every interval moves, starting with move 0
+        self.keyframes = [keyframe]
+        # The number of moves that are currently played
+        self.position = 0
+
+    @classmethod
+    def fromRecords(cls, keyframes, moves, hashes, position, interval=None):
+        '''
+            Rebuild a history that was saved
+
+            Args:
+                keyframes   (list): The keyframe for every interval moves
+                moves       (list): Every move recorded
+                hashes      (list): The position hash after each move,
+                                    starting with the first position
+                position    (int):  The number of moves played
+                interval    (int):  The number of moves between keyframes
+
+            Returns:
+                History
+        '''
+        history = cls(keyframes[0], interval)
+        history.keyframes = list(keyframes)
+        history.moves = list(moves)
+        history.hashes = list(hashes)
+        history.position = position
+        return history
+
+    def record(self, move, positionHash, makeKeyframe):
+        '''
+            Record a move at the cursor, replacing anything after it
+
+            Args:
+                move            (Move):     The move made
+                positionHash    (int):      The hash of the position after it
+                makeKeyframe    (callable): Returns a Keyframe for the
+                                            position after the move, this is
+                                            only called when one is due
+        '''
+        # Drop the undone moves, and any keyframes taken after the cursor
+        del self.moves[self.position:]
+        del self.hashes[self.position + 1:]
+        del self.keyframes[self.position // self.interval + 1:]
+        self.moves.append(move)
+        self.hashes.append(positionHash)
+        self.position += 1
+        if self.position % self.interval == 0:
+            self.keyframes.append(makeKeyframe())
+
+    def back(self):
+        '''
+            Step the cursor back a move
+
+            Returns:
+                Move (or None if at the start of the game)
+        '''
+        if not self.position:
+            return None
+        self.position -= 1
+        return self.moves[self.position]
+
+    def forward(self):
+        '''
+            Step the cursor forward a move
+
+            Returns:
+                Move (or None if there are no undone moves)
+        '''
+        if self.position == len(self.moves):
+            return None
+        self.position += 1
+        return self.moves[self.position - 1]
+
+    def seek(self, moveNumber):
+        '''
+            Move the cursor to the move number, returning the keyframe to
+            load and the moves to replay on top of it
+
+            Args:
+                moveNumber (int): The number of moves to have played
+
+            Returns:
+                Tuple (Keyframe, List)
+        '''
+        if not 0 <= moveNumber <= len(self.moves):
+            raise IndexError("move number out of range")
+        index = min(moveNumber // self.interval, len(self.keyframes) - 1)
+        self.position = moveNumber
+        return (self.keyframes[index],
+                self.moves[index * self.interval:moveNumber])
+
+    def getMoves(self):
+        '''
+            Get the moves currently played
+
+            Returns:
+                List
+        '''
+        return self.moves[:self.position]
+
+    def getNextMove(self):
+        '''
+            Get the move after the cursor
+
+            Returns:
+                Move (or None if there are no undone moves)
+        '''
+        if self.position == len(self.moves):
+            return None
+        return self.moves[self.position]
+
+    def getHashes(self):
+        '''
+            Get the hash of every position up to the cursor
+
+            Returns:
+                List
+        '''
+        return self.hashes[:self.position + 1]
+
+    def getPosition(self):
+        '''
+            Getter for the cursor
+
+            Returns:
+                Int
+        '''
+        return self.position
+
+    def getLength(self):
+        '''
+            Get the number of moves recorded, including undone moves
+
+            Returns:
+                Int
+        '''
+        return len(self.moves)
@@ -0,0 +1,191 @@
+'''
+    Opt-in timing and counters for GameLogic.updateBoard
+'''
+import time
+
+
+class Instrumentation:
+    '''
+        Instrumentation times each phase of GameLogic.updateBoard and counts
+        the work done, totalling them across moves. Attach it with
+        GameLogic.setInstrumentation, when nothing is attached updateBoard
+        only pays for one check.
+
+        Hooks are called after each move with a dict of the move's result,
+        the seconds spent in each phase it reached and its counters
+
+        Phases:
+            occupied:   Checking the point is empty
+            captures:   Finding the opponent chains the move takes
+            hash:       Hashing the position after the move
+            ko:         Checking the position hasn't been seen
+            suicide:    Checking the move leaves the piece a liberty
+            place:      Placing the piece, merging and capturing chains
+            territory:  Counting the captured land
+            pieces:     Counting the pieces and setting the scores
+            history:    Logging the move
+
+        Counters:
+            chainsVisited:  Chains next to the move that were looked at
+            chainsCaptured: Opponent chains taken
+            stonesCaptured: Opponent pieces taken
+            regionsFilled:  Empty regions flood filled to count territory
+            cellsFilled:    Empty points flood filled to count territory
+            keyframes:      Full position snapshots taken by the history
+    '''
+    PHASES = ('occupied', 'captures', 'hash', 'ko', 'suicide', 'place',
+              'territory', 'pieces', 'history')
+    COUNTERS = ('chainsVisited', 'chainsCaptured', 'stonesCaptured',
+                'regionsFilled', 'cellsFilled', 'keyframes')
+
+    def __init__(self):
+        self.hooks = []
+        self.clock = time.perf_counter
+        self.reset()
+
+    def reset(self):
+        '''
+            Clear the totals
+        '''
+        self.moves = 0
+        self.results = {}
+        self.totals = dict.fromkeys(self.PHASES, 0.0)
+        self.maximums = dict.fromkeys(self.PHASES, 0.0)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        # The move being measured
+        self.phases = None
+        self.moveCounters = None
+        self.last = None
+
+    def addHook(self, hook):
+        '''
+            Add a callable to be called with the measurements of each move
+
+            Args:
+                hook (callable): Called with a dict of the move's result,
+                                 phases and counters
+        '''
+        self.hooks.append(hook)
+
+    def removeHook(self, hook):
+        '''
+            Remove a hook
+
+            Args:
+                hook (callable): The hook to remove
+        '''
+        self.hooks.remove(hook)
+
+    def start(self):
+        '''
+            Start measuring a move
+        '''
+        self.phases = {}
+        self.moveCounters = dict.fromkeys(self.COUNTERS, 0)
+        self.last = self.clock()
+
+    def mark(self, phase):
+        '''
+            End a phase, timing it from the end of the last one
+
+            Args:
+                phase (str): The phase in PHASES
+        '''
+        now = self.clock()
+        self.phases[phase] = now - self.last
+        self.last = now
+
+    def count(self, counter, amount=1):
+        '''
+            Add to a counter for the move
+
+            Args:
+                counter (str): The counter in COUNTERS
+                amount  (int): The amount to add
+        '''
+        self.moveCounters[counter] += amount
+
+    def getCounters(self):
+        '''
+            Get the counters of the move being measured, these can be passed
+            to the territory counting to fill in
+
+            Returns:
+                Dict
+        '''
+        return self.moveCounters
+
+    def finish(self, result):
+        '''
+            Finish measuring a move, adding it to the totals and calling the
+            hooks
+
+            Args:
+                result (str): The result of the move, OK or the error raised
+        '''
+        self.moves += 1
+        self.results[result] = self.results.get(result, 0) + 1
+        for phase, seconds in self.phases.items():
+            self.totals[phase] += seconds
+            self.calls[phase] += 1
+            if seconds > self.maximums[phase]:
+                self.maximums[phase] = seconds
+        for counter, amount in self.moveCounters.items():
+            self.counters[counter] += amount
+        if self.hooks:
+            measurement = {
+                'result': result,
+                'phases': self.phases,
+                'counters': self.moveCounters
+            }
+            for hook in self.hooks:
+                hook(measurement)
+
+    def getSummary(self):
+        '''
+            Get the totals for every move measured
+
+            Returns:
+                Dict
+        '''
+        return {
+            'moves': self.moves,
+            'results': dict(self.results),
+            'phases': {
+                phase: {
+                    'calls': self.calls[phase],
+                    'totalSeconds': self.totals[phase],
+                    'meanMicros': (self.totals[phase] / self.calls[phase] *
+                                   1e6 if self.calls[phase] else 0.0),
+                    'maxMicros': self.maximums[phase] * 1e6
+                }
+                for phase in self.PHASES
+            },
+            'counters': dict(self.counters)
+        }
+
+    def report(self):
+        '''
+            Get the summary as a table of text
+
+            Returns:
+                Str
+        '''
+        summary = self.getSummary()
+        total = sum(self.totals.values()) or 1.0
+        lines = [
+            "{} moves: {}".format(
+                summary['moves'], ", ".join(
+                    "{} {}".format(count, result)
+                    for result, count in sorted(summary['results'].items())))
+        ]
+        lines.append("{:<10} {:>8} {:>10} {:>10} {:>7}".format(
+            "phase", "calls", "mean us", "max us", "share"))
+        for phase, stats in summary['phases'].items():
+            lines.append("{:<10} {:>8} {:>10.1f} {:>10.1f} {:>6.1f}%".format(
+                phase, stats['calls'], stats['meanMicros'], stats['maxMicros'],
+                100 * stats['totalSeconds'] / total))
+        for counter, amount in summary['counters'].items():
+            lines.append("{:<15} {:>10}".format(counter, amount))
+        return "\n".join(lines)
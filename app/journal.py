@@ -0,0 +1,593 @@
+'''
+    Journals a game to disk so it can be resumed after a crash
+'''
+import os
+import struct
+import time
+import zlib
+
+from .game_logic import GameLogic
+from .history import History, Keyframe
+from .move import Move
+from .piece import Piece
+
+# The turns journaled, each record holds one with its argument
+MOVE, SKIP, RESET, UNDO, REDO, SEEK = range(1, 7)
+# The log starts with a header, then has a record for each turn with the
+# players' clocks after it
+LOG_HEADER = struct.Struct('<8sBBBI')
+RECORD = struct.Struct('<BIff')
+# The checkpoint holds the history after the sealed blocks, then a
+# checksum. Each block holds a keyframe and the moves up to the next one,
+# with the hash after each move, then a checksum
+CHECKPOINT_HEADER = struct.Struct('<8sBBBIddHIIIIQ')
+MOVE_RECORD = struct.Struct('<iBBH4iQ')
+KEYFRAME_RECORD = struct.Struct('<BB4iQ')
+CHECKSUM = struct.Struct('<I')
+
+
+class Journal:
+    '''
+        Journal appends each turn of a game to a compact binary log, and
+        every so often writes a checkpoint of the whole game next to it (at
+        the path with .checkpoint added). A game is resumed by loading the
+        checkpoint and replaying the log after it, so resuming never
+        replays more than a checkpoint interval of turns.
+
+        Each record is flushed to the operating system as it's written, so
+        it survives the app crashing or quitting. Syncing to the disk is
+        batched, every so many records or seconds, so a power cut can only
+        lose the last few turns.
+
+        The history's keyframes split it into blocks. Once the game has
+        passed a block, the block is sealed, appended once to a blocks file
+        (at the path with .blocks added). A checkpoint only holds the moves
+        after the sealed blocks, so each one costs about the same however
+        long the game is. A block whose moves are undone and replaced is
+        dropped from the end of the file.
+
+        A checkpoint is written to a temporary file and moved over the old
+        one, then the log is started again. The log and checkpoint share a
+        generation number, a log left from before the checkpoint is ignored.
+        Blocks are only dropped once the checkpoint on disk doesn't use them
+
+        Args:
+            path                (str):   The file to write the log to
+            checkpointInterval  (int):   The records between checkpoints
+            syncEvery           (int):   The records between syncs
+            syncSeconds         (float): The seconds between syncs
+    '''
+    MAGIC = b'PYGOJRNL'
+    CHECKPOINT_MAGIC = b'PYGOCKPT'
+    VERSION = 2
+    # The clock the sync interval is measured with, in seconds
+    clock = time.monotonic
+
+    def __init__(self,
+                 path,
+                 checkpointInterval=64,
+                 syncEvery=16,
+                 syncSeconds=1.0):
+        self.path = path
+        self.checkpointPath = path + ".checkpoint"
+        self.blocksPath = path + ".blocks"
+        self.checkpointInterval = checkpointInterval
+        self.syncEvery = syncEvery
+        self.syncSeconds = syncSeconds
+        # The game being journaled, and the open log
+        self.logic = None
+        self.file = None
+        self.generation = 0
+        # The open blocks file, the (end offset, last move) of each sealed
+        # block, and the blocks the checkpoint on disk uses (None if it
+        # isn't known)
+        self.blocksFile = None
+        self.blocks = []
+        self.persisted = None
+        # The records since the last checkpoint, and the last sync
+        self.records = 0
+        self.pending = 0
+        self.synced = self.clock()
+
+    def attach(self, logic):
+        '''
+            Start journaling a game, checkpointing it as it is now. Use
+            GameLogic.setJournal rather than calling this directly
+
+            Args:
+                logic (GameLogic): The game to journal
+        '''
+        self.logic = logic
+        # Nothing is known about the blocks already on disk
+        self.blocks = []
+        self.persisted = None
+        self.checkpoint()
+
+    def recordMove(self, point):
+        '''
+            Journal a piece placed
+
+            Args:
+                point (int): The flat point index
+        '''
+        self.write(MOVE, point)
+
+    def recordSkip(self):
+        '''
+            Journal a skipped go
+        '''
+        self.write(SKIP)
+
+    def recordReset(self):
+        '''
+            Journal the game restarting
+        '''
+        self.write(RESET)
+
+    def recordUndo(self):
+        '''
+            Journal a turn taken back
+        '''
+        self.write(UNDO)
+
+    def recordRedo(self):
+        '''
+            Journal an undone turn played again
+        '''
+        self.write(REDO)
+
+    def recordSeek(self, moveNumber):
+        '''
+            Journal a jump through the history
+
+            Args:
+                moveNumber (int): The number of moves played after it
+        '''
+        self.write(SEEK, moveNumber)
+
+    def write(self, op, argument=0):
+        '''
+            Append a record to the log, with the clocks as they are now,
+            checkpointing or syncing if one is due
+
+            Args:
+                op          (int): The turn taken
+                argument    (int): The point or move number of the turn
+        '''
+        players = self.logic.players
+        self.file.write(
+            RECORD.pack(op, argument, players[Piece.White].getTimeRemaining(),
+                        players[Piece.Black].getTimeRemaining()))
+        self.file.flush()
+        self.records += 1
+        self.pending += 1
+        if self.records >= self.checkpointInterval:
+            self.checkpoint()
+        elif (self.pending >= self.syncEvery
+              or self.clock() - self.synced >= self.syncSeconds):
+            self.sync()
+
+    def sync(self):
+        '''
+            Sync the records written to the disk
+        '''
+        if self.file is not None and self.pending:
+            os.fsync(self.file.fileno())
+        self.pending = 0
+        self.synced = self.clock()
+
+    def checkpoint(self):
+        '''
+            Seal the blocks the game has passed, then write a checkpoint of
+            the rest of the game and start the log again
+        '''
+        history = self.logic.getHistory()
+        blocks = self.blocks
+        # Drop the blocks whose moves have been replaced
+        while blocks and not self.isSealed(history, len(blocks) - 1):
+            blocks.pop()
+        if self.persisted is None or len(blocks) < self.persisted:
+            # The checkpoint on disk may use the dropped blocks, so replace
+            # it before they're overwritten
+            self.writeCheckpoint()
+        if self.blocksFile is None:
+            self.blocksFile = open(self.blocksPath, 'ab')
+        end = blocks[-1][0] if blocks else 0
+        self.blocksFile.truncate(end)
+        size = (self.logic.rows * self.logic.columns + 7) // 8
+        interval = history.interval
+        sealed = len(blocks)
+        while (len(blocks) + 1) * interval <= history.getPosition():
+            index = len(blocks)
+            end += self.blocksFile.write(encodeBlock(history, index, size))
+            blocks.append((end, history.moves[(index + 1) * interval - 1]))
+        if len(blocks) > sealed:
+            self.blocksFile.flush()
+            os.fsync(self.blocksFile.fileno())
+        self.writeCheckpoint()
+
+    def isSealed(self, history, index):
+        '''
+            Are a sealed block's moves still in the history
+
+            Args:
+                history (History): The game's history
+                index   (int):     The block
+
+            Returns:
+                Bool
+        '''
+        # Replacing a move replaces every move after it, so the block still
+        # holds if its last move does
+        last = (index + 1) * history.interval - 1
+        return (last < len(history.moves)
+                and history.moves[last] is self.blocks[index][1])
+
+    def writeCheckpoint(self):
+        '''
+            Write a checkpoint of the game after the sealed blocks, then
+            start the log again
+        '''
+        self.generation += 1
+        end = self.blocks[-1][0] if self.blocks else 0
+        writeFile(
+            self.checkpointPath,
+            encodeCheckpoint(self.logic, self.generation, len(self.blocks),
+                             end))
+        self.persisted = len(self.blocks)
+        if self.file is not None:
+            self.file.close()
+        self.file = open(self.path, 'wb')
+        self.file.write(
+            LOG_HEADER.pack(self.MAGIC, self.VERSION, self.logic.rows,
+                            self.logic.columns, self.generation))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.records = 0
+        self.pending = 0
+        self.synced = self.clock()
+
+    def recover(self):
+        '''
+            Resume the journaled game, loading the checkpoint and replaying
+            the log after it. Attach the game to journal it again
+
+            Returns:
+                GameLogic (or None if there is nothing to resume)
+        '''
+        try:
+            with open(self.checkpointPath, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            with open(self.blocksPath, 'rb') as file:
+                blocks = file.read()
+        except FileNotFoundError:
+            blocks = b""
+        checkpoint = decodeCheckpoint(data, blocks)
+        if checkpoint is None:
+            return None
+        generation, rows, columns, clocks, history = checkpoint
+        logic = GameLogic(GameLogic.makeBoard(rows, columns))
+        logic.loadHistory(history)
+        for op, argument, white, black in self.readLog(generation):
+            if op == MOVE:
+                logic.updateBoard(*divmod(argument, columns))
+            elif op == SKIP:
+                logic.skip()
+            elif op == RESET:
+                logic.reset()
+            elif op == UNDO:
+                logic.undo()
+            elif op == REDO:
+                logic.redo()
+            else:
+                logic.seek(argument)
+            clocks = (white, black)
+        # Restore the clocks, the time between the crash and now isn't
+        # counted
+        logic.stopClocks()
+        for piece, seconds in zip((Piece.White, Piece.Black), clocks):
+            logic.players[piece].timeRemaining = seconds
+        logic.switchClocks()
+        # Carry on the generations from the checkpoint
+        self.generation = generation
+        return logic
+
+    def readLog(self, generation):
+        '''
+            Read the records in the log written after a checkpoint, stopping
+            at any record left half written
+
+            Args:
+                generation (int): The checkpoint's generation
+
+            Returns:
+                List (of (op, argument, white clock, black clock) tuples)
+        '''
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return []
+        if len(data) < LOG_HEADER.size:
+            return []
+        magic, version, rows, columns, logGeneration = LOG_HEADER.unpack_from(
+            data)
+        if (magic != self.MAGIC or version != self.VERSION
+                or logGeneration != generation):
+            return []
+        records = []
+        end = len(data) - RECORD.size
+        for offset in range(LOG_HEADER.size, end + 1, RECORD.size):
+            record = RECORD.unpack_from(data, offset)
+            # Anything else is a torn write
+            if not MOVE <= record[0] <= SEEK:
+                break
+            records.append(record)
+        return records
+
+    def close(self):
+        '''
+            Sync and close the log and blocks file
+        '''
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+        if self.blocksFile is not None:
+            self.blocksFile.close()
+            self.blocksFile = None
+
+
+def writeFile(path, data):
+    '''
+        Write a file and sync it, replacing the old one in one step so a
+        crash can't leave half of it
+
+        Args:
+            path (str):   The file to write
+            data (bytes): The contents
+    '''
+    temporary = path + ".tmp"
+    with open(temporary, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    # Sync the directory too, so the rename itself survives a power cut
+    try:
+        directory = os.open(os.path.dirname(os.path.abspath(path)),
+                            os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory)
+    except OSError:
+        pass
+    finally:
+        os.close(directory)
+
+
+def encodeCheckpoint(logic, generation, blockCount=0, blocksLength=0):
+    '''
+        Encode the game after its first blocks, with its clocks. With no
+        blocks this is the whole game
+
+        Args:
+            logic           (GameLogic): The game
+            generation      (int):       The checkpoint's generation
+            blockCount      (int):       The blocks sealed in the blocks file
+            blocksLength    (int):       The bytes they take
+
+        Returns:
+            Bytes
+    '''
+    history = logic.getHistory()
+    players = logic.players
+    size = (logic.rows * logic.columns + 7) // 8
+    first = blockCount * history.interval
+    parts = [
+        CHECKPOINT_HEADER.pack(Journal.CHECKPOINT_MAGIC, Journal.VERSION,
+                               logic.rows, logic.columns, generation,
+                               players[Piece.White].getTimeRemaining(),
+                               players[Piece.Black].getTimeRemaining(),
+                               history.interval, history.getPosition(),
+                               blockCount,
+                               len(history.moves) - first,
+                               len(history.keyframes) - blockCount,
+                               blocksLength)
+    ]
+    for keyframe in history.keyframes[blockCount:]:
+        encodeKeyframe(parts, keyframe, size)
+    encodeMoves(parts, history, first, len(history.moves))
+    data = b"".join(parts)
+    return data + CHECKSUM.pack(zlib.crc32(data))
+
+
+def decodeCheckpoint(data, blocks=b""):
+    '''
+        Decode a checkpoint and the blocks before it, checking they're whole
+
+        Args:
+            data    (bytes): The checkpoint
+            blocks  (bytes): The blocks file
+
+        Returns:
+            Tuple (generation, rows, columns, clocks, History), or None if
+            the checkpoint isn't valid
+    '''
+    if len(data) < CHECKPOINT_HEADER.size + CHECKSUM.size:
+        return None
+    body = data[:-CHECKSUM.size]
+    if CHECKSUM.unpack_from(data, len(body))[0] != zlib.crc32(body):
+        return None
+    (magic, version, rows, columns, generation, white, black, interval,
+     position, blockCount, moveCount, keyframeCount,
+     blocksLength) = CHECKPOINT_HEADER.unpack_from(body)
+    if magic != Journal.CHECKPOINT_MAGIC or version != Journal.VERSION:
+        return None
+    if len(blocks) < blocksLength:
+        return None
+    size = (rows * columns + 7) // 8
+    keyframes, moves, hashes = [], [], []
+    blocks = blocks[:blocksLength]
+    offset = 0
+    try:
+        for index in range(blockCount):
+            start = offset
+            keyframe, offset = decodeKeyframe(blocks, offset, size)
+            offset = decodeMoves(blocks, offset, interval, moves, hashes)
+            checksum = CHECKSUM.unpack_from(blocks, offset)[0]
+            if checksum != zlib.crc32(blocks[start:offset]):
+                return None
+            offset += CHECKSUM.size
+            keyframes.append(keyframe)
+    except struct.error:
+        return None
+    offset = CHECKPOINT_HEADER.size
+    for index in range(keyframeCount):
+        keyframe, offset = decodeKeyframe(body, offset, size)
+        keyframes.append(keyframe)
+    decodeMoves(body, offset, moveCount, moves, hashes)
+    # The first position's hash is the first keyframe's
+    hashes.insert(0, keyframes[0].positionHash)
+    history = History.fromRecords(keyframes, moves, hashes, position, interval)
+    return generation, rows, columns, (white, black), history
+
+
+def encodeBlock(history, index, size):
+    '''
+        Encode a block, a keyframe and the moves up to the next one
+
+        Args:
+            history (History): The history
+            index   (int):     The block
+            size    (int):     The bytes in a bitboard
+
+        Returns:
+            Bytes
+    '''
+    first = index * history.interval
+    parts = []
+    encodeKeyframe(parts, history.keyframes[index], size)
+    encodeMoves(parts, history, first, first + history.interval)
+    data = b"".join(parts)
+    return data + CHECKSUM.pack(zlib.crc32(data))
+
+
+def encodeKeyframe(parts, keyframe, size):
+    '''
+        Encode a keyframe
+
+        Args:
+            parts       (list):     The list to add the encoded parts to
+            keyframe    (Keyframe): The keyframe
+            size        (int):      The bytes in a bitboard
+    '''
+    parts.append(
+        KEYFRAME_RECORD.pack(keyframe.player, keyframe.skipCount,
+                             *encodeScores(keyframe.scores),
+                             keyframe.positionHash))
+    for piece in (Piece.White, Piece.Black):
+        parts.append(keyframe.bitboards[piece].to_bytes(size, 'little'))
+
+
+def decodeKeyframe(data, offset, size):
+    '''
+        Decode a keyframe
+
+        Args:
+            data    (bytes): The encoded data
+            offset  (int):   Where the keyframe starts
+            size    (int):   The bytes in a bitboard
+
+        Returns:
+            Tuple (Keyframe, the offset after it)
+    '''
+    player, skipCount, *rest = KEYFRAME_RECORD.unpack_from(data, offset)
+    offset += KEYFRAME_RECORD.size
+    bitboards = {}
+    for piece in (Piece.White, Piece.Black):
+        bitboards[piece] = int.from_bytes(data[offset:offset + size],
+                                          'little')
+        offset += size
+    return (Keyframe(bitboards, player, skipCount, decodeScores(rest[:4]),
+                     rest[4]), offset)
+
+
+def encodeMoves(parts, history, start, stop):
+    '''
+        Encode a run of moves, each with the position hash after it
+
+        Args:
+            parts   (list):    The list to add the encoded parts to
+            history (History): The history
+            start   (int):     The first move
+            stop    (int):     The move after the last
+    '''
+    hashes = history.hashes
+    for index in range(start, stop):
+        move = history.moves[index]
+        parts.append(
+            MOVE_RECORD.pack(-1 if move.isSkip() else move.point, move.piece,
+                             move.skipCount, len(move.captured),
+                             *encodeScores(move.scores), hashes[index + 1]))
+        parts.append(struct.pack(f'<{len(move.captured)}H', *move.captured))
+
+
+def decodeMoves(data, offset, count, moves, hashes):
+    '''
+        Decode a run of moves, and the position hash after each
+
+        Args:
+            data    (bytes): The encoded data
+            offset  (int):   Where the moves start
+            count   (int):   The number of moves
+            moves   (list):  The list to add the moves to
+            hashes  (list):  The list to add the hashes to
+
+        Returns:
+            Int (the offset after the moves)
+    '''
+    for index in range(count):
+        (point, piece, skipCount, captures, *scores,
+         positionHash) = MOVE_RECORD.unpack_from(data, offset)
+        offset += MOVE_RECORD.size
+        captured = struct.unpack_from(f'<{captures}H', data, offset)
+        offset += 2 * captures
+        moves.append(
+            Move(None if point < 0 else point, piece, captured, skipCount,
+                 decodeScores(scores)))
+        hashes.append(positionHash)
+    return offset
+
+
+def encodeScores(scores):
+    '''
+        Flatten the (score, pieces) of each player
+
+        Args:
+            scores (dict): The (score, pieces) keyed by piece
+
+        Returns:
+            Tuple
+    '''
+    return scores[Piece.White] + scores[Piece.Black]
+
+
+def decodeScores(values):
+    '''
+        Rebuild the (score, pieces) of each player
+
+        Args:
+            values (list): The flattened scores
+
+        Returns:
+            Dict
+    '''
+    return {
+        Piece.White: (values[0], values[1]),
+        Piece.Black: (values[2], values[3])
+    }
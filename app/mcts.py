@@ -0,0 +1,437 @@
+'''
+    Monte Carlo tree search computer player
+'''
+import math
+import random
+import time
+
+from .playout import PlayoutBoard
+from .transposition import positionKey
+
+
+class Node:
+    '''
+        A node in the search tree, for the position after a move
+
+        Args:
+            move    (int):   The flat point played, None for a skip
+            player  (Piece): The player that made the move
+            parent  (Node):  The node the move was made from
+    '''
+    __slots__ = ('move', 'player', 'parent', 'children', 'visits', 'wins',
+                 'amafVisits', 'amafWins')
+
+    def __init__(self, move, player, parent=None):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        # The child for each move from here, None until expanded
+        self.children = None
+        self.visits = 0
+        self.wins = 0.0
+        # The all moves as first (RAVE) statistics
+        self.amafVisits = 0
+        self.amafWins = 0.0
+
+    def getWinRate(self):
+        '''
+            Get the share of playouts through here won by the player
+
+            Returns:
+                Float
+        '''
+        return self.wins / self.visits if self.visits else 0.5
+
+
+class MCTS:
+    '''
+        MCTS picks a move for the current player of a GameLogic by
+        building a tree of moves with UCT, blended with RAVE statistics, and
+        scoring each new leaf with a random playout on a PlayoutBoard.
+
+        The tree is kept between searches, so when search is called after
+        more moves in the same game the subtree for the new position is
+        reused. The search runs until the time limit, or the playout limit,
+        is reached (whichever comes first).
+
+        With a transposition table, the root's statistics are saved after
+        each search. A search from a position already in the table that
+        can't reuse the tree (after an undo, or from another game or
+        player sharing the table) starts from them rather than from nothing
+
+        Args:
+            timeLimit   (float):              The seconds to search for, None
+                                              for no limit
+            playouts    (int):                The playouts to run, None for
+                                              no limit
+            seed        (int):                The seed for the random
+                                              playouts
+            table       (TranspositionTable): The table to share, if any
+    '''
+    # The weight given to exploring less visited moves
+    EXPLORATION = 0.4
+    # The number of visits where a move's own results and its RAVE results
+    # are weighted equally
+    RAVE_EQUIVALENCE = 300
+    # The moves a playout can take, per point on the board
+    PLAYOUT_LENGTH = 3
+
+    def __init__(self, timeLimit=1.0, playouts=None, seed=None, table=None):
+        if timeLimit is None and playouts is None:
+            raise ValueError("A time limit or playout limit is needed")
+        self.timeLimit = timeLimit
+        self.playouts = playouts
+        self.generator = random.Random(seed)
+        self.table = table
+        self.root = None
+        # Where the root is in the game's history, to reuse the tree
+        self.rootPosition = None
+        self.rootHash = None
+        # The root's key in the table
+        self.key = None
+        # Stats from the last search
+        self.playoutCount = 0
+        self.elapsed = 0.0
+        self.reused = 0
+
+    def search(self, logic, cancelled=None):
+        '''
+            Search from the current position of the game
+
+            Args:
+                logic       (GameLogic): The game to search
+                cancelled   (callable):  Returns True once the search should
+                                         stop early
+
+            Returns:
+                Int (the flat point to play, or None to skip)
+        '''
+        return self.run(self.prepare(logic), cancelled)
+
+    def prepare(self, logic):
+        '''
+            Move the root to the current position of the game, ready for
+            run. Only this part reads the game, so the playouts can run while
+            the game is used elsewhere
+
+            Args:
+                logic (GameLogic): The game to search
+
+            Returns:
+                PlayoutBoard (the position to search from)
+        '''
+        self.advance(logic)
+        board = PlayoutBoard.fromGameLogic(logic)
+        self.key = None if self.table is None else positionKey(logic)
+        # Expand the root from the game's own legal moves, or the statistics
+        # saved for the position
+        if self.root.children is None:
+            saved = None if self.key is None else self.table.get(self.key)
+            if saved is not None:
+                self.loadRoot(saved, logic.player)
+            else:
+                self.expand(self.root, board, logic.legalMoves())
+        return board
+
+    def run(self, board, cancelled=None):
+        '''
+            Run playouts from the position made by prepare, until a limit is
+            reached or the search is cancelled
+
+            Args:
+                board       (PlayoutBoard): The position at the root
+                cancelled   (callable):     Returns True once the search
+                                            should stop early
+
+            Returns:
+                Int (the flat point to play, or None to skip)
+        '''
+        clock = time.perf_counter
+        start = clock()
+        deadline = None if self.timeLimit is None else start + self.timeLimit
+        count = 0
+        while self.playouts is None or count < self.playouts:
+            if deadline is not None and clock() >= deadline:
+                break
+            if cancelled is not None and cancelled():
+                break
+            self.simulate(board.copy())
+            count += 1
+        self.playoutCount = count
+        self.elapsed = clock() - start
+        if self.key is not None:
+            self.table.put(self.key, self.saveRoot())
+        return self.getBestMove()
+
+    def saveRoot(self):
+        '''
+            Get the statistics of the root and its children, to save
+
+            Returns:
+                Tuple (visits, wins, and the move, visits, wins, amafVisits
+                and amafWins of each child)
+        '''
+        root = self.root
+        return (root.visits, root.wins,
+                tuple((child.move, child.visits, child.wins, child.amafVisits,
+                       child.amafWins) for child in root.children))
+
+    def loadRoot(self, saved, player):
+        '''
+            Give the root children with the statistics saved by saveRoot
+
+            Args:
+                saved   (tuple): The statistics
+                player  (Piece): The player to move at the root
+        '''
+        root = self.root
+        root.visits, root.wins, children = saved
+        root.children = []
+        for move, visits, wins, amafVisits, amafWins in children:
+            child = Node(move, player, root)
+            child.visits, child.wins = visits, wins
+            child.amafVisits, child.amafWins = amafVisits, amafWins
+            root.children.append(child)
+
+    def advance(self, logic):
+        '''
+            Move the root to the current position of the game, keeping the
+            subtree if the position follows on from the last search
+
+            Args:
+                logic (GameLogic): The game being searched
+        '''
+        history = logic.getHistory()
+        hashes = history.getHashes()
+        position = history.getPosition()
+        node = self.root
+        # Only reuse the tree if the game still passes through the root
+        if (node is None or self.rootPosition > position
+                or hashes[self.rootPosition] != self.rootHash):
+            node = None
+        else:
+            for move in history.getMoves()[self.rootPosition:]:
+                node = self.getChild(node, move.getPoint())
+                if node is None:
+                    break
+        if node is None or node.player == logic.player:
+            node = Node(None, logic.opponent)
+        node.parent = None
+        self.reused = node.visits
+        self.root = node
+        self.rootPosition = position
+        self.rootHash = hashes[position]
+
+    def getChild(self, node, move):
+        '''
+            Get the child of the node for a move
+
+            Args:
+                node (Node): The node to look in
+                move (int):  The flat point, None for a skip
+
+            Returns:
+                Node (or None if it's not in the tree)
+        '''
+        if node.children is None:
+            return None
+        for child in node.children:
+            if child.move == move:
+                return child
+        return None
+
+    def expand(self, node, board, candidates=None):
+        '''
+            Add a child for every candidate point that isn't one of the
+            player's own eyes, and for a skip. The candidates default to the
+            empty points, and any illegal moves among them are found and
+            removed when they are first tried
+
+            Args:
+                node        (Node):         The node to expand
+                board       (PlayoutBoard): The position at the node
+                candidates  (int):          A mask of the points to add
+        '''
+        if candidates is None:
+            candidates = board.getEmpty()
+        player = board.player
+        node.children = [
+            Node(point, player, node)
+            for point in board.bitBoard.points(candidates)
+            if not board.isEye(point)
+        ]
+        node.children.append(Node(None, player, node))
+
+    def select(self, node, board):
+        '''
+            Pick the child with the best UCT/RAVE score and play it on the
+            board, dropping any children that turn out to be illegal
+
+            Args:
+                node    (Node):         The node to pick from
+                board   (PlayoutBoard): The position at the node
+
+            Returns:
+                Node
+        '''
+        logVisits = math.log(node.visits + 1)
+        equivalence, exploration = self.RAVE_EQUIVALENCE, self.EXPLORATION
+        while True:
+            best, bestScore = None, -1.0
+            for child in node.children:
+                visits = child.visits
+                score = child.getWinRate()
+                # Blend the move's results with its RAVE results, trusting
+                # its own results more as it's visited more (skips have no
+                # RAVE results)
+                if child.amafVisits:
+                    beta = math.sqrt(equivalence / (3 * visits + equivalence))
+                    amaf = child.amafWins / child.amafVisits
+                    score += beta * (amaf - score)
+                score += exploration * math.sqrt(logVisits / (visits + 1))
+                if score > bestScore:
+                    best, bestScore = child, score
+            if best.move is None:
+                board.skip()
+                return best
+            if board.play(best.move):
+                return best
+            node.children.remove(best)
+
+    def simulate(self, board):
+        '''
+            Run one playout from the root, walking down the tree, adding a
+            leaf, playing randomly to the end and backing up the result
+
+            Args:
+                board (PlayoutBoard): A copy of the position at the root
+        '''
+        node = self.root
+        path = [node]
+        moves = []
+        # Walk down the tree, expanding the first unexpanded node
+        while not board.isOver():
+            if node.children is None:
+                self.expand(node, board)
+                node = self.select(node, board)
+                path.append(node)
+                moves.append((node.player, node.move))
+                break
+            node = self.select(node, board)
+            path.append(node)
+            moves.append((node.player, node.move))
+        # Play out the rest of the game randomly
+        board.superko = False
+        limit = self.PLAYOUT_LENGTH * board.rows * board.columns
+        while not board.isOver() and len(moves) < limit:
+            player = board.player
+            moves.append((player, board.playRandom(self.generator)))
+        self.backup(path, moves, board.getWinner())
+
+    def backup(self, path, moves, winner):
+        '''
+            Add the result of a playout to the nodes on its path, and the
+            RAVE results to their children
+
+            Args:
+                path    (list):  The nodes walked from the root
+                moves   (list):  The (player, move) of every move played
+                winner  (Piece): The winner of the playout, None for a draw
+        '''
+        # The moves played by each player from the current depth onwards
+        played = {}
+        for player, move in moves[len(path) - 1:]:
+            played.setdefault(player, set()).add(move)
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            node.visits += 1
+            node.wins += self.getResult(node.player, winner)
+            if node.children:
+                for child in node.children:
+                    if child.move is not None and child.move in played.get(
+                            child.player, ()):
+                        child.amafVisits += 1
+                        child.amafWins += self.getResult(child.player, winner)
+            if depth:
+                played.setdefault(node.player, set()).add(node.move)
+
+    @staticmethod
+    def getResult(player, winner):
+        '''
+            Get the result of a playout for a player
+
+            Args:
+                player  (Piece): The player
+                winner  (Piece): The winner, None for a draw
+
+            Returns:
+                Float
+        '''
+        if winner is None:
+            return 0.5
+        return 1.0 if winner == player else 0.0
+
+    def getRankedMoves(self):
+        '''
+            Get the moves from the root, most visited first
+
+            Returns:
+                List (of (move, visits, win rate))
+        '''
+        if not self.root or not self.root.children:
+            return []
+        children = sorted(self.root.children,
+                          key=lambda child: child.visits,
+                          reverse=True)
+        return [(child.move, child.visits, child.getWinRate())
+                for child in children]
+
+    def getBestMove(self):
+        '''
+            Get the most visited move from the root
+
+            Returns:
+                Int (the flat point to play, or None to skip)
+        '''
+        ranked = self.getRankedMoves()
+        return ranked[0][0] if ranked else None
+
+    def getLegalMove(self, logic):
+        '''
+            Get the most visited move from the root that's still legal in
+            the game
+
+            Args:
+                logic (GameLogic): The game searched
+
+            Returns:
+                Int (the flat point to play, or None to skip)
+        '''
+        for point, visits, winRate in self.getRankedMoves():
+            if point is None or logic.isLegalPoint(point):
+                return point
+        return None
+
+    def getPlayoutsPerSecond(self):
+        '''
+            Get the playout rate of the last search
+
+            Returns:
+                Float
+        '''
+        return self.playoutCount / self.elapsed if self.elapsed else 0.0
+
+    def getStats(self):
+        '''
+            Get the stats of the last search
+
+            Returns:
+                Dict
+        '''
+        return {
+            'playouts': self.playoutCount,
+            'seconds': self.elapsed,
+            'playoutsPerSecond': self.getPlayoutsPerSecond(),
+            'reusedVisits': self.reused,
+            'rootVisits': self.root.visits if self.root else 0
+        }
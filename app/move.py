@@ -0,0 +1,62 @@
+'''
+    Represents a Move in the game history
+'''
+
+
+class Move:
+    '''
+        A compact record of a turn, holding only what is needed to take the
+        turn back
+
+        Args:
+            point       (int):   The flat index played, None for a skip
+            piece       (Piece): The piece that was played
+            captured    (tuple): The flat indexes of the pieces removed
+            skipCount   (int):   The skip counter before the turn
+            scores      (dict):  The (score, pieces) of each player before
+                                 the turn
+    '''
+    __slots__ = ('point', 'piece', 'captured', 'skipCount', 'scores')
+
+    def __init__(self, point, piece, captured, skipCount, scores):
+        self.point = point
+        self.piece = piece
+        self.captured = captured
+        self.skipCount = skipCount
+        self.scores = scores
+
+    def isSkip(self):
+        '''
+            Was this turn skipped
+
+            Returns:
+                Bool
+        '''
+        return self.point is None
+
+    def getPoint(self):
+        '''
+            Getter for the point attribute
+
+            Returns:
+                Int
+        '''
+        return self.point
+
+    def getPiece(self):
+        '''
+            Getter for the piece attribute
+
+            Returns:
+                Piece
+        '''
+        return self.piece
+
+    def getCaptured(self):
+        '''
+            Getter for the captured attribute
+
+            Returns:
+                Tuple
+        '''
+        return self.captured
@@ -0,0 +1,298 @@
+'''
+    A lightweight copy of the game state for playouts
+'''
+from .bitboard import BitBoard
+from .piece import Piece
+from .territory import countTerritory
+from .zobrist import ZobristTable
+
+
+class PlayoutBoard:
+    '''
+        PlayoutBoard plays the same rules as GameLogic using only the
+        bitboards, so it's cheap to copy and needs no chains, history or
+        players. Illegal moves return False instead of raising.
+
+        With superko on, moves that repeat a position seen in the game (or
+        since the copy was made) are illegal, as in GameLogic. Turning it off
+        for random playouts swaps it for the simple KO check on the last
+        capture, which saves keeping the positions.
+
+        Use PlayoutBoard.fromGameLogic to copy a game
+
+        Args:
+            rows    (int): The number of rows on the board
+            columns (int): The number of columns on the board
+    '''
+    SKIP_LIMIT = 2
+    # The random points playRandom tries before listing the empty ones
+    GUESSES = 8
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.bitBoard = BitBoard.forSize(rows, columns)
+        # The adjacent flat indexes of each point, and the same as a mask
+        self.neighbours = self.bitBoard.adjacents
+        self.sides = self.bitBoard.sides
+        self.keys = ZobristTable.forSize(rows, columns).keys
+        self.bitboards = {Piece.White: 0, Piece.Black: 0}
+        self.player = Piece.White
+        self.skipCount = 0
+        # The point that can't be played because of a simple KO
+        self.ko = None
+        self.positionHash = 0
+        # The positions seen before the copy (shared, never changed), and
+        # the positions played since
+        self.seenPositions = frozenset()
+        self.playedPositions = set()
+        self.superko = True
+
+    @classmethod
+    def fromGameLogic(cls, logic):
+        '''
+            Copy the current position of a game
+
+            Args:
+                logic (GameLogic): The game to copy
+
+            Returns:
+                PlayoutBoard
+        '''
+        board = cls(logic.rows, logic.columns)
+        board.bitboards = dict(logic.bitboards)
+        board.player = logic.player
+        board.skipCount = logic.skipCount
+        board.positionHash = logic.positionHash
+        board.seenPositions = frozenset(logic.seenPositions)
+        return board
+
+    def copy(self):
+        '''
+            Copy the board, the positions seen are shared
+
+            Returns:
+                PlayoutBoard
+        '''
+        board = PlayoutBoard.__new__(PlayoutBoard)
+        board.rows, board.columns = self.rows, self.columns
+        board.bitBoard = self.bitBoard
+        board.neighbours, board.sides = self.neighbours, self.sides
+        board.keys = self.keys
+        board.bitboards = dict(self.bitboards)
+        board.player = self.player
+        board.skipCount = self.skipCount
+        board.ko = self.ko
+        board.positionHash = self.positionHash
+        board.seenPositions = self.seenPositions
+        board.playedPositions = set(self.playedPositions)
+        board.superko = self.superko
+        return board
+
+    def getSymmetryHash(self):
+        '''
+            Hash the position under every symmetry, packed as by
+            ZobristTable.hashSymmetries. This isn't kept up to date as moves
+            are played, to keep playouts fast
+
+            Returns:
+                Int
+        '''
+        return ZobristTable.forSize(self.rows, self.columns).hashSymmetries(
+            self.bitboards)
+
+    def getOpponent(self):
+        '''
+            Get the piece of the player not to move
+
+            Returns:
+                Piece
+        '''
+        return Piece.Black if self.player == Piece.White else Piece.White
+
+    def getEmpty(self):
+        '''
+            Get the mask of empty points
+
+            Returns:
+                Int
+        '''
+        return self.bitBoard.full & ~(self.bitboards[Piece.White]
+                                      | self.bitboards[Piece.Black])
+
+    def isEye(self, point):
+        '''
+            Is the point surrounded by the current player's pieces
+
+            Args:
+                point (int): The flat point index
+
+            Returns:
+                Bool
+        '''
+        return not self.sides[point] & ~self.bitboards[self.player]
+
+    def isOver(self):
+        '''
+            Has the game ended on skips
+
+            Returns:
+                Bool
+        '''
+        return self.skipCount >= self.SKIP_LIMIT
+
+    def getDeadGroup(self, seed, stones, empty):
+        '''
+            Flood the group from the seed, stopping as soon as it reaches a
+            liberty
+
+            Args:
+                seed    (int): The mask to start from
+                stones  (int): The mask of the group's player
+                empty   (int): The mask of empty points
+
+            Returns:
+                Int (the group if it has no liberties, otherwise 0)
+        '''
+        # BitBoard.expand, kept local as this is the hottest loop
+        bitBoard = self.bitBoard
+        columns, full = bitBoard.columns, bitBoard.full
+        notFirst, notLast = bitBoard.notFirstColumn, bitBoard.notLastColumn
+        group = seed
+        while True:
+            grown = (group
+                     | ((group << 1) & notFirst)
+                     | ((group >> 1) & notLast)
+                     | (group << columns)
+                     | (group >> columns)) & full
+            if grown & empty:
+                return 0
+            grown &= stones
+            if grown == group:
+                return group
+            group = grown
+
+    def play(self, point):
+        '''
+            Place the current player on the point, if it's legal
+
+            Args:
+                point (int): The flat point index
+
+            Returns:
+                Bool
+        '''
+        bit = 1 << point
+        player, opponent = self.player, self.getOpponent()
+        own, other = self.bitboards[player], self.bitboards[opponent]
+        if (own | other) & bit or point == self.ko:
+            return False
+        own |= bit
+        empty = self.bitBoard.full & ~(own | other)
+        sides = self.sides
+        # Take any opponent groups left without a liberty
+        captured = 0
+        for neighbour in self.neighbours[point]:
+            if not other >> neighbour & 1 or captured >> neighbour & 1:
+                continue
+            # A quick check for a liberty next to the neighbour
+            if sides[neighbour] & empty:
+                continue
+            captured |= self.getDeadGroup(1 << neighbour, other, empty)
+        if captured:
+            other &= ~captured
+            empty |= captured
+        elif not sides[point] & empty:
+            # Without a capture or a liberty next to it, check the group
+            if self.getDeadGroup(bit, own, empty):
+                return False
+        # Hash the new position, checking it's not been seen before
+        positionHash = self.positionHash ^ self.keys[player][point]
+        if captured:
+            opponentKeys = self.keys[opponent]
+            for stone in self.bitBoard.points(captured):
+                positionHash ^= opponentKeys[stone]
+        if self.superko:
+            if (positionHash in self.seenPositions
+                    or positionHash in self.playedPositions):
+                return False
+            self.playedPositions.add(positionHash)
+        # Without superko, a single stone taking a single stone can't be
+        # taken straight back
+        self.ko = None
+        if (not self.superko and captured and not captured & (captured - 1)):
+            liberties = sides[point] & empty
+            if (not sides[point] & own and not liberties & (liberties - 1)):
+                self.ko = captured.bit_length() - 1
+        self.bitboards[player] = own
+        self.bitboards[opponent] = other
+        self.positionHash = positionHash
+        self.skipCount = 0
+        self.player = opponent
+        return True
+
+    def skip(self):
+        '''
+            Skip the current player's go
+        '''
+        self.skipCount += 1
+        self.ko = None
+        self.player = self.getOpponent()
+
+    def playRandom(self, generator):
+        '''
+            Play a random legal move that doesn't fill one of the player's
+            own eyes, or skip if there isn't one
+
+            Args:
+                generator (random.Random): The random stream to use
+
+            Returns:
+                Int (or None if the go was skipped)
+        '''
+        random = generator.random
+        size = self.rows * self.columns
+        empty = self.getEmpty()
+        # Guess a few points first, which is quicker than listing the empty
+        # points while the board is still open
+        for guess in range(self.GUESSES):
+            point = int(random() * size)
+            if (empty >> point & 1 and not self.isEye(point)
+                    and self.play(point)):
+                return point
+        points = self.bitBoard.points(empty)
+        while points:
+            # Pick a point, removing it from the list
+            index = int(random() * len(points))
+            point = points[index]
+            points[index] = points[-1]
+            points.pop()
+            if not self.isEye(point) and self.play(point):
+                return point
+        self.skip()
+        return None
+
+    def getScores(self):
+        '''
+            Get the score for each player, counted as in GameLogic
+
+            Returns:
+                Dict
+        '''
+        territory = countTerritory(self.bitBoard, self.bitboards)
+        return {
+            piece: territory[piece] + BitBoard.count(bitboard)
+            for piece, bitboard in self.bitboards.items()
+        }
+
+    def getWinner(self):
+        '''
+            Get the player with the higher score
+
+            Returns:
+                Piece (or None for a draw)
+        '''
+        scores = self.getScores()
+        if scores[Piece.White] == scores[Piece.Black]:
+            return None
+        return max(scores, key=scores.get)
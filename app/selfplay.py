@@ -0,0 +1,257 @@
+'''
+    Runs headless self-play games across a pool of processes
+'''
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import json
+import random
+import sys
+import time
+
+from .game_logic import (GameLogic, GameOverPassError, KOError, OccupiedError,
+                         SuicideError)
+from .piece import Piece
+
+NAMES = {Piece.White: "White", Piece.Black: "Black"}
+
+
+class GameRecord:
+    '''
+        A compact record of a finished self-play game
+
+        Args:
+            game    (int):   The number of the game in the run
+            seed    (str):   The seed of the game's random stream
+            winner  (Piece): The winning piece (or None for a draw)
+            scores  (dict):  The final score of each player
+            moves   (int):   The number of turns taken, including skips
+            timings (tuple): The seconds each turn took
+    '''
+    __slots__ = ('game', 'seed', 'winner', 'scores', 'moves', 'timings')
+
+    def __init__(self, game, seed, winner, scores, moves, timings):
+        self.game = game
+        self.seed = seed
+        self.winner = winner
+        self.scores = scores
+        self.moves = moves
+        self.timings = timings
+
+    def toDict(self):
+        '''
+            Get the record as a dictionary of plain values
+
+            Returns:
+                Dict
+        '''
+        return {
+            'game': self.game,
+            'seed': self.seed,
+            'winner': NAMES.get(self.winner),
+            'scores': {
+                NAMES[piece]: score
+                for piece, score in self.scores.items()
+            },
+            'moves': self.moves,
+            'timings': list(self.timings)
+        }
+
+
+def randomPolicy(logic, generator):
+    '''
+        Try the empty points in a random order, never filling in one of the
+        player's own single point eyes
+
+        Args:
+            logic       (GameLogic):     The game being played
+            generator   (random.Random): The game's random stream
+
+        Returns:
+            List (of flat point indexes)
+    '''
+    empty = logic.bitBoard.full & ~(logic.bitboards[Piece.White]
+                                    | logic.bitboards[Piece.Black])
+    own = logic.bitboards[logic.player]
+    points = [
+        point for point in logic.bitBoard.points(empty) if any(
+            not own >> neighbour & 1 for neighbour in logic.neighbours[point])
+    ]
+    generator.shuffle(points)
+    return points
+
+
+def capturePolicy(logic, generator):
+    '''
+        Try the moves that capture the most pieces first, and the rest of
+        the random policy's moves after them
+
+        Args:
+            logic       (GameLogic):     The game being played
+            generator   (random.Random): The game's random stream
+
+        Returns:
+            List (of flat point indexes)
+    '''
+    points = randomPolicy(logic, generator)
+    # Sorting is stable, so moves capturing the same count stay shuffled
+    points.sort(key=lambda point: -sum(
+        len(chain.stones) for chain in logic.getCapturedChains(point)))
+    return points
+
+
+POLICIES = {'random': randomPolicy, 'capture': capturePolicy}
+
+
+def getSeed(seed, game):
+    '''
+        Get the seed for a game's random stream, each game gets its own
+        stream so results don't depend on which worker plays it
+
+        Args:
+            seed (int): The seed of the run
+            game (int): The number of the game in the run
+
+        Returns:
+            Str
+    '''
+    return "{}:{}".format(seed, game)
+
+
+def playGame(size, seed, game=0, policy='random', maxMoves=None):
+    '''
+        Play a game against GameLogic, each turn plays the first legal move
+        the policy gives, or skips if there isn't one
+
+        Args:
+            size        (int): The number of rows and columns on the board
+            seed        (str): The seed of the game's random stream
+            game        (int): The number of the game in the run
+            policy      (str): The name of the policy in POLICIES
+            maxMoves    (int): The turn limit, defaults to 3 per point
+
+        Returns:
+            GameRecord
+    '''
+    generator = random.Random(seed)
+    choose = POLICIES[policy]
+    logic = GameLogic(GameLogic.makeBoard(size))
+    maxMoves = maxMoves or 3 * size * size
+    clock = time.perf_counter
+    timings = []
+    over = False
+    while not over and len(timings) < maxMoves:
+        start = clock()
+        for point in choose(logic, generator):
+            try:
+                logic.updateBoard(*divmod(point, logic.columns))
+                break
+            except (OccupiedError, KOError, SuicideError):
+                continue
+        else:
+            try:
+                logic.skip()
+            except GameOverPassError:
+                over = True
+        timings.append(clock() - start)
+    scores = {
+        piece: player.getScore()
+        for piece, player in logic.getPlayers().items()
+    }
+    winner = None
+    if scores[Piece.White] != scores[Piece.Black]:
+        winner = max(scores, key=scores.get)
+    return GameRecord(game, seed, winner, scores, len(timings), tuple(timings))
+
+
+def runSelfPlay(games,
+                size,
+                workers=None,
+                seed=0,
+                policy='random',
+                maxMoves=None):
+    '''
+        Play the games across a pool of processes, yielding each record as
+        soon as its game finishes (so not in game order)
+
+        Args:
+            games       (int): The number of games to play
+            size        (int): The number of rows and columns on the board
+            workers     (int): The number of processes, defaults to one per
+                               core
+            seed        (int): The seed of the run
+            policy      (str): The name of the policy in POLICIES
+            maxMoves    (int): The turn limit for each game
+
+        Returns:
+            Generator (of GameRecord)
+    '''
+    if policy not in POLICIES:
+        raise ValueError("Unknown policy {}".format(policy))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(playGame, size, getSeed(seed, game), game, policy,
+                            maxMoves) for game in range(games)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(arguments=None):
+    '''
+        Play self-play games from the command line, writing a JSON line for
+        each game
+
+        Args:
+            arguments (list): The command line arguments
+    '''
+    parser = argparse.ArgumentParser(
+        description="Plays headless games across every core, writing a JSON "
+        "record for each game as it finishes")
+    parser.add_argument('-w',
+                        '--workers',
+                        type=int,
+                        default=None,
+                        help="Worker processes (default: one per core)")
+    parser.add_argument('-g',
+                        '--games',
+                        type=int,
+                        default=100,
+                        help="Games to play")
+    parser.add_argument('-s',
+                        '--size',
+                        type=int,
+                        default=7,
+                        help="Rows and columns on the board")
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help="Seed for the games' random streams")
+    parser.add_argument('--policy',
+                        choices=sorted(POLICIES),
+                        default='random',
+                        help="How moves are chosen")
+    parser.add_argument('--max-moves',
+                        type=int,
+                        default=None,
+                        help="Turn limit for each game")
+    parser.add_argument('--no-timings',
+                        action='store_true',
+                        help="Leave the per-move timings out of the records")
+    options = parser.parse_args(arguments)
+
+    start = time.perf_counter()
+    wins = {}
+    moves = 0
+    for record in runSelfPlay(options.games, options.size, options.workers,
+                              options.seed, options.policy, options.max_moves):
+        result = record.toDict()
+        if options.no_timings:
+            del result['timings']
+        print(json.dumps(result), flush=True)
+        wins[result['winner']] = wins.get(result['winner'], 0) + 1
+        moves += record.moves
+    elapsed = time.perf_counter() - start
+    rate = moves / elapsed if elapsed else 0
+    summary = "{} games, {} moves in {:.2f}s ({:.0f} moves/s), wins: {}"
+    sys.stderr.write(
+        summary.format(options.games, moves, elapsed, rate, wins) + "\n")
@@ -0,0 +1,898 @@
+'''
+    Hosts many games from one process over a line-delimited JSON protocol
+'''
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+from .broadcast import Broadcaster
+from .game_logic import (GameLogic, GameOverPassError, KOError, OccupiedError,
+                         SuicideError)
+from .piece import Piece
+from .timings import summarise
+
+NAMES = {Piece.White: "White", Piece.Black: "Black"}
+CELLS = {Piece.NoPiece: ".", Piece.White: "W", Piece.Black: "B"}
+# The errors a move can raise that are sent back to the client
+RULE_ERRORS = (KOError, OccupiedError, SuicideError)
+
+
+class ProtocolError(Exception):
+    '''
+        Custom exception class for a request the server can't handle
+    '''
+    pass
+
+
+class Session:
+    '''
+        A game hosted by the server. Requests for the game are queued and
+        played in order by the session's own task, so one game can't hold
+        up another, and a timer ends the game when the player to move runs
+        out of time on their clock. Each turn is sent to the game's watchers
+        as a delta
+
+        Args:
+            sessionId   (str):       The id clients use for the game
+            logic       (GameLogic): The game
+            queueSize   (int):       The requests that can wait to be played
+    '''
+    OPS = ('move', 'skip', 'undo', 'state')
+
+    def __init__(self, sessionId, logic, queueSize=16):
+        self.sessionId = sessionId
+        self.logic = logic
+        self.queue = asyncio.Queue(queueSize)
+        self.lastActive = time.monotonic()
+        # How the game ended, None while it's being played
+        self.result = None
+        self.timeout = None
+        self.task = None
+        self.broadcaster = Broadcaster()
+
+    def start(self):
+        '''
+            Start playing queued requests, and timing the player to move
+        '''
+        self.task = asyncio.ensure_future(self.run())
+        if self.result is None:
+            self.scheduleTimeout()
+
+    def stop(self):
+        '''
+            Stop the session's task and timer, charging the player to move
+            for the time they have taken
+        '''
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        if self.timeout is not None:
+            self.timeout.cancel()
+            self.timeout = None
+        self.logic.stopClocks()
+        self.broadcaster.close()
+
+    def isIdle(self, now, idleSeconds):
+        '''
+            Has nothing been asked of the session for a while
+
+            Args:
+                now         (float): The monotonic time now
+                idleSeconds (float): The seconds without a request
+
+            Returns:
+                Bool
+        '''
+        return (now - self.lastActive >= idleSeconds and self.queue.empty()
+                and not self.broadcaster.hasWatchers())
+
+    async def submit(self, request):
+        '''
+            Queue a request for the game, and wait for it to be played
+
+            Args:
+                request (dict): The request
+
+            Returns:
+                Dict
+        '''
+        future = asyncio.get_event_loop().create_future()
+        try:
+            self.queue.put_nowait((request, future))
+        except asyncio.QueueFull:
+            raise ProtocolError("Too many requests waiting for the game")
+        return await future
+
+    async def run(self):
+        '''
+            Play the queued requests in order
+        '''
+        while True:
+            request, future = await self.queue.get()
+            if future.cancelled():
+                continue
+            try:
+                future.set_result(self.apply(request))
+            except Exception as error:
+                future.set_exception(error)
+
+    def apply(self, request):
+        '''
+            Play a request on the game
+
+            Args:
+                request (dict): The request
+
+            Returns:
+                Dict
+        '''
+        op = request.get('op')
+        if op not in self.OPS:
+            raise ProtocolError(f"Unknown op {op!r}")
+        self.lastActive = time.monotonic()
+        if op == 'state':
+            return self.getState(True)
+        if self.result is not None:
+            raise ProtocolError("The game is over")
+        move = None
+        if op == 'move':
+            try:
+                row, col = int(request['row']), int(request['col'])
+            except (KeyError, TypeError, ValueError):
+                raise ProtocolError("A move needs a row and col")
+            if not (0 <= row < self.logic.rows
+                    and 0 <= col < self.logic.columns):
+                raise ProtocolError("The move is off the board")
+            self.logic.updateBoard(row, col)
+            move = self.logic.getMoves()[-1]
+        elif op == 'skip':
+            try:
+                self.logic.skip()
+                move = self.logic.getMoves()[-1]
+            except GameOverPassError:
+                self.end('skips')
+        elif op == 'undo':
+            move = self.logic.undo()
+            if move is None:
+                raise ProtocolError("Nothing to undo")
+        if self.result is None:
+            self.scheduleTimeout()
+        state = self.getState()
+        self.publish(op, move, state)
+        return state
+
+    def watch(self, writer):
+        '''
+            Start sending the game to a watcher
+
+            Args:
+                writer (asyncio.StreamWriter): The watcher's connection
+
+            Returns:
+                Dict (the keyframe to start them from)
+        '''
+        self.broadcaster.subscribe(writer)
+        return self.getKeyframe()
+
+    def publish(self, op, move, state):
+        '''
+            Send the change a turn made to the watchers
+
+            Args:
+                op      (str):  The op played
+                move    (Move): The move made or undone, None if there isn't
+                                one
+                state   (dict): The state of the game after the turn
+        '''
+        if not self.broadcaster.hasWatchers():
+            return
+        delta = dict(state, event='delta', op=op, piece=None, point=None)
+        if move is not None:
+            delta.update(piece=NAMES[move.piece],
+                         point=move.point,
+                         captured=list(move.captured))
+        self.broadcaster.publish(delta, self.getKeyframe)
+
+    def getKeyframe(self):
+        '''
+            Get the whole game for a watcher
+
+            Returns:
+                Dict
+        '''
+        return dict(self.getState(True), event='keyframe')
+
+    def scheduleTimeout(self):
+        '''
+            Wake up when the player to move runs out of time
+        '''
+        if self.timeout is not None:
+            self.timeout.cancel()
+        remaining = self.logic.players[self.logic.player].getTimeRemaining()
+        self.timeout = asyncio.get_event_loop().call_later(
+            max(0.0, remaining), self.checkTimeout)
+
+    def checkTimeout(self):
+        '''
+            End the game if the player to move is out of time
+        '''
+        self.timeout = None
+        if self.logic.players[self.logic.player].hasTimeLeft():
+            self.scheduleTimeout()
+        else:
+            self.end('time')
+            self.publish('timeout', None, self.getState())
+
+    def end(self, reason):
+        '''
+            End the game, the leading player wins
+
+            Args:
+                reason (str): Why the game ended
+        '''
+        self.logic.stopClocks()
+        if self.timeout is not None:
+            self.timeout.cancel()
+            self.timeout = None
+        self.result = {
+            'reason': reason,
+            'winner': self.logic.getLeadingPlayer().getName()
+        }
+
+    def getState(self, board=False):
+        '''
+            Get the state of the game to send to clients
+
+            Args:
+                board (bool): Include the board, a string for each row
+
+            Returns:
+                Dict
+        '''
+        logic = self.logic
+        state = {
+            'session': self.sessionId,
+            'size': logic.rows,
+            'player': NAMES[logic.player],
+            'moves': logic.getHistory().getPosition(),
+            'scores': {
+                player.getName(): player.getScore()
+                for player in logic.players.values()
+            },
+            'clocks': {
+                player.getName(): round(max(0.0, player.getTimeRemaining()), 3)
+                for player in logic.players.values()
+            },
+            'result': self.result
+        }
+        if board:
+            state['board'] = [
+                "".join(CELLS[cell] for cell in row) for row in logic.board
+            ]
+        return state
+
+    def toDict(self):
+        '''
+            Get the session as plain values to save, the clocks should be
+            stopped first so the time taken is counted
+
+            Returns:
+                Dict
+        '''
+        return {
+            'session': self.sessionId,
+            'size': self.logic.rows,
+            'moves': [move.getPoint() for move in self.logic.getMoves()],
+            'clocks': {
+                NAMES[piece]: player.getTimeRemaining()
+                for piece, player in self.logic.players.items()
+            },
+            'result': self.result
+        }
+
+    @classmethod
+    def fromDict(cls, data, queueSize=16):
+        '''
+            Make a session from saved values, replaying its moves
+
+            Args:
+                data        (dict): The values from toDict
+                queueSize   (int):  The requests that can wait to be played
+
+            Returns:
+                Session
+        '''
+        size = data['size']
+        logic = GameLogic(GameLogic.makeBoard(size))
+        for point in data['moves']:
+            if point is None:
+                logic.skip()
+            else:
+                logic.updateBoard(*divmod(point, size))
+        # Restore the clocks, the time spent saved isn't counted
+        logic.stopClocks()
+        for piece, player in logic.players.items():
+            player.timeRemaining = data['clocks'][NAMES[piece]]
+        session = cls(data['session'], logic, queueSize)
+        session.result = data['result']
+        if session.result is None:
+            logic.switchClocks()
+        return session
+
+
+class GameServer:
+    '''
+        GameServer hosts many games, each in its own Session. Clients send
+        a JSON object on each line and get one back on a line, with the
+        request's id (if it had one) and ok set to true, or false with the
+        error's name and message.
+
+        Ops:
+            create: Start a game, with an optional size and time (seconds
+                    on each player's clock)
+            move:   Place a piece at the row and col for the session
+            skip:   Skip the go for the session
+            undo:   Take back the last turn for the session
+            state:  Get the game for the session, with the board
+            watch:  Get a keyframe of the game for the session, then a
+                    delta line (with event set to delta) for every turn
+                    and a keyframe line every so often
+            unwatch: Stop watching the game for the session
+            stats:  Get the number of games and watchers
+
+        Sessions that haven't had a request for idleSeconds are saved to
+        the session directory and dropped from memory, and loaded again
+        when they are next asked for. With no directory they are kept.
+
+        Args:
+            sessionDir  (str):   Where to save idle sessions
+            idleSeconds (float): The seconds before a session is saved
+            queueSize   (int):   The requests that can wait for each game
+    '''
+    def __init__(self, sessionDir=None, idleSeconds=300.0, queueSize=16):
+        self.sessionDir = sessionDir
+        self.idleSeconds = idleSeconds
+        self.queueSize = queueSize
+        self.sessions = {}
+        # The sessions being saved and loaded, keyed by id
+        self.saving = {}
+        self.loading = {}
+        # The sessions each watcher's connection is watching
+        self.watchers = {}
+        self.sweeper = None
+        if sessionDir is not None:
+            os.makedirs(sessionDir, exist_ok=True)
+
+    async def handle(self, request, writer=None):
+        '''
+            Handle a request from a client
+
+            Args:
+                request (dict):                 The request
+                writer  (asyncio.StreamWriter): The client's connection, to
+                                                send watched games to
+
+            Returns:
+                Dict
+        '''
+        try:
+            op = request.get('op')
+            if op == 'create':
+                response = self.create(request.get('size', 7),
+                                       request.get('time')).getState()
+            elif op == 'stats':
+                response = self.getStats()
+            elif op in ('watch', 'unwatch'):
+                if writer is None:
+                    raise ProtocolError("Watching needs a connection")
+                session = await self.getSession(request.get('session'))
+                response = self.watch(session, writer, op == 'watch')
+            else:
+                session = await self.getSession(request.get('session'))
+                response = await session.submit(request)
+            response['ok'] = True
+        except RULE_ERRORS + (ProtocolError, ValueError) as error:
+            response = {
+                'ok': False,
+                'error': type(error).__name__,
+                'message': str(error)
+            }
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    def create(self, size, seconds=None):
+        '''
+            Start a new game
+
+            Args:
+                size    (int):   The rows and columns on the board
+                seconds (float): The time on each player's clock, the
+                                 default if None
+
+            Returns:
+                Session
+        '''
+        try:
+            size = int(size)
+            seconds = None if seconds is None else float(seconds)
+        except (TypeError, ValueError):
+            raise ProtocolError("A game needs a whole size and seconds")
+        logic = GameLogic(GameLogic.makeBoard(size))
+        if seconds is not None:
+            logic.stopClocks()
+            for player in logic.players.values():
+                player.timeRemaining = seconds
+            logic.switchClocks()
+        session = Session(uuid.uuid4().hex, logic, self.queueSize)
+        self.sessions[session.sessionId] = session
+        session.start()
+        return session
+
+    async def getSession(self, sessionId):
+        '''
+            Get a session, loading it if it was saved
+
+            Args:
+                sessionId (str): The id of the session
+
+            Returns:
+                Session
+        '''
+        # Ids are strings, anything else can't be looked up
+        if not isinstance(sessionId, str):
+            raise ProtocolError(f"Unknown session {sessionId!r}")
+        session = self.sessions.get(sessionId)
+        if session is not None:
+            return session
+        if self.sessionDir is None:
+            raise ProtocolError(f"Unknown session {sessionId!r}")
+        if sessionId not in self.loading:
+            self.loading[sessionId] = asyncio.ensure_future(
+                self.load(sessionId))
+        return await asyncio.shield(self.loading[sessionId])
+
+    def getPath(self, sessionId):
+        '''
+            Get the file a session is saved to
+
+            Args:
+                sessionId (str): The id of the session
+
+            Returns:
+                Str
+        '''
+        # Only ids the server made can be saved, so keep to hex
+        if not sessionId or any(char not in "0123456789abcdef"
+                                for char in sessionId):
+            raise ProtocolError(f"Unknown session {sessionId!r}")
+        return os.path.join(self.sessionDir, sessionId + ".json")
+
+    async def load(self, sessionId):
+        '''
+            Load a saved session back into memory
+
+            Args:
+                sessionId (str): The id of the session
+
+            Returns:
+                Session
+        '''
+        try:
+            path = self.getPath(sessionId)
+            # Wait for the session to finish saving, if it's being saved
+            if sessionId in self.saving:
+                await self.saving[sessionId]
+            loop = asyncio.get_event_loop()
+            data = await loop.run_in_executor(None, readSession, path)
+            if data is None:
+                raise ProtocolError(f"Unknown session {sessionId!r}")
+            session = Session.fromDict(data, self.queueSize)
+            self.sessions[sessionId] = session
+            session.start()
+            return session
+        finally:
+            del self.loading[sessionId]
+
+    def evict(self, session):
+        '''
+            Save a session to disk and drop it from memory
+
+            Args:
+                session (Session): The session to evict
+        '''
+        session.stop()
+        del self.sessions[session.sessionId]
+        sessionId = session.sessionId
+        future = asyncio.get_event_loop().run_in_executor(
+            None, writeSession, self.getPath(sessionId), session.toDict())
+        self.saving[sessionId] = future
+        future.add_done_callback(lambda done: self.saving.pop(sessionId, None))
+
+    def evictIdle(self):
+        '''
+            Evict the sessions that have been idle too long
+
+            Returns:
+                Int (the number evicted)
+        '''
+        now = time.monotonic()
+        idle = [
+            session for session in self.sessions.values()
+            if session.isIdle(now, self.idleSeconds)
+        ]
+        for session in idle:
+            self.evict(session)
+        return len(idle)
+
+    async def sweep(self):
+        '''
+            Evict idle sessions every so often
+        '''
+        while True:
+            await asyncio.sleep(max(self.idleSeconds / 2, 0.01))
+            self.evictIdle()
+
+    def watch(self, session, writer, watching=True):
+        '''
+            Start or stop sending a game to a watcher
+
+            Args:
+                session     (Session):              The game
+                writer      (asyncio.StreamWriter): The watcher's connection
+                watching    (bool):                 Start (or stop) watching
+
+            Returns:
+                Dict
+        '''
+        sessions = self.watchers.setdefault(writer, set())
+        if watching:
+            sessions.add(session.sessionId)
+            return session.watch(writer)
+        sessions.discard(session.sessionId)
+        session.broadcaster.unsubscribe(writer)
+        return {'session': session.sessionId}
+
+    def unwatchAll(self, writer):
+        '''
+            Stop sending every game to a watcher who has gone
+
+            Args:
+                writer (asyncio.StreamWriter): The watcher's connection
+        '''
+        for sessionId in self.watchers.pop(writer, ()):
+            session = self.sessions.get(sessionId)
+            if session is not None:
+                session.broadcaster.unsubscribe(writer)
+
+    def getStats(self):
+        '''
+            Get the number of games being hosted, and their watchers
+
+            Returns:
+                Dict
+        '''
+        broadcasters = [
+            session.broadcaster for session in self.sessions.values()
+        ]
+        return {
+            'sessions':
+            len(self.sessions),
+            'saving':
+            len(self.saving),
+            'loading':
+            len(self.loading),
+            'watchers':
+            sum(broadcaster.getWatcherCount() for broadcaster in broadcasters),
+            'sent':
+            sum(broadcaster.sent for broadcaster in broadcasters),
+            'dropped':
+            sum(broadcaster.dropped for broadcaster in broadcasters)
+        }
+
+    async def handleConnection(self, reader, writer):
+        '''
+            Answer each line a client sends until they disconnect
+
+            Args:
+                reader  (asyncio.StreamReader): The client's requests
+                writer  (asyncio.StreamWriter): Where to send the responses
+        '''
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("A request must be an object")
+                except ValueError as error:
+                    response = {
+                        'ok': False,
+                        'error': 'ProtocolError',
+                        'message': str(error)
+                    }
+                else:
+                    response = await self.handle(request, writer)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.unwatchAll(writer)
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=7007, path=None):
+        '''
+            Start listening for clients on TCP, or a Unix socket if a path
+            is given
+
+            Args:
+                host    (str): The host to listen on
+                port    (int): The port to listen on
+                path    (str): The Unix socket to listen on
+
+            Returns:
+                asyncio.AbstractServer
+        '''
+        if self.sessionDir is not None and self.sweeper is None:
+            self.sweeper = asyncio.ensure_future(self.sweep())
+        if path is not None:
+            return await asyncio.start_unix_server(self.handleConnection, path)
+        return await asyncio.start_server(self.handleConnection, host, port)
+
+    async def close(self):
+        '''
+            Stop sweeping, and save every session if there's a session
+            directory
+        '''
+        if self.sweeper is not None:
+            self.sweeper.cancel()
+            self.sweeper = None
+        for session in list(self.sessions.values()):
+            if self.sessionDir is None:
+                session.stop()
+            else:
+                self.evict(session)
+        if self.saving:
+            await asyncio.wait(list(self.saving.values()))
+
+
+def readSession(path):
+    '''
+        Read a saved session
+
+        Args:
+            path (str): The file to read
+
+        Returns:
+            Dict (or None if it doesn't exist)
+    '''
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def writeSession(path, data):
+    '''
+        Write a session, replacing the file in one step so a crash can't
+        leave half of it
+
+        Args:
+            path (str):  The file to write
+            data (dict): The session's values
+    '''
+    temporary = path + ".tmp"
+    with open(temporary, 'w') as file:
+        json.dump(data, file)
+    os.replace(temporary, path)
+
+
+async def playClient(reader, writer, size, generator, timings, watch=None):
+    '''
+        Play a random game as a client, timing each request
+
+        Args:
+            reader      (asyncio.StreamReader): The server's responses
+            writer      (asyncio.StreamWriter): Where to send requests
+            size        (int):                  The size of board
+            generator   (random.Random):        The random stream to use
+            timings     (list):                 Where to add the timings
+            watch       (callable):             Called with the session
+                                                once it's created, returns
+                                                the watchers to wait for
+    '''
+    clock = time.perf_counter
+
+    async def send(request):
+        start = clock()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        timings.append(clock() - start)
+        return response
+
+    state = await send({'op': 'create', 'size': size})
+    session = state['session']
+    watchers = watch(session) if watch is not None else []
+    points = list(range(size * size))
+    skips = 0
+    while state.get('result') is None and skips < 2:
+        generator.shuffle(points)
+        # Try a few random points, the server checks the rules
+        for point in points[:8]:
+            row, col = divmod(point, size)
+            response = await send({
+                'op': 'move',
+                'session': session,
+                'row': row,
+                'col': col
+            })
+            if response['ok']:
+                state, skips = response, 0
+                break
+        else:
+            state = await send({'op': 'skip', 'session': session})
+            skips += 1
+    writer.close()
+    await asyncio.gather(*watchers)
+
+
+async def watchClient(connect, session, received):
+    '''
+        Watch a game as a client until it ends, counting the lines sent
+
+        Args:
+            connect     (callable): Opens a connection to the server
+            session     (str):      The id of the game
+            received    (list):     The count of lines, in a list to share
+    '''
+    reader, writer = await connect()
+    writer.write(
+        json.dumps({
+            'op': 'watch',
+            'session': session
+        }).encode() + b"\n")
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        received[0] += 1
+        if json.loads(line).get('result') is not None:
+            break
+    writer.close()
+
+
+async def runLoadTest(clients,
+                      size=9,
+                      host='127.0.0.1',
+                      port=7007,
+                      path=None,
+                      seed=0,
+                      watchers=0):
+    '''
+        Play random games on a server from many clients at once
+
+        Args:
+            clients     (int): The number of clients, each plays one game
+            size        (int): The size of board
+            host        (str): The server's host
+            port        (int): The server's port
+            path        (str): The server's Unix socket, instead of TCP
+            seed        (int): The seed for the random games
+            watchers    (int): The watchers for each game
+
+        Returns:
+            Dict (the request timings summarised)
+    '''
+    timings = []
+    received = [0]
+
+    def connect():
+        if path is not None:
+            return asyncio.open_unix_connection(path)
+        return asyncio.open_connection(host, port)
+
+    def watch(session):
+        return [
+            asyncio.ensure_future(watchClient(connect, session, received))
+            for watcher in range(watchers)
+        ]
+
+    async def client(number):
+        reader, writer = await connect()
+        generator = random.Random(f"{seed}:{number}")
+        await playClient(reader, writer, size, generator, timings, watch)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    elapsed = time.perf_counter() - start
+    result = summarise(timings)
+    result.update(clients=clients,
+                  requests=len(timings),
+                  seconds=elapsed,
+                  requestsPerSecond=len(timings) / elapsed if elapsed else 0,
+                  watchers=clients * watchers,
+                  watcherLines=received[0])
+    return result
+
+
+async def serve(options):
+    '''
+        Serve games until interrupted
+
+        Args:
+            options (argparse.Namespace): The command line options
+    '''
+    server = GameServer(options.sessions, options.idle, options.queue)
+    listener = await server.start(options.host, options.port, options.unix)
+    address = options.unix or "{}:{}".format(options.host, options.port)
+    sys.stderr.write("Serving games on {}\n".format(address))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(arguments=None):
+    '''
+        Serve games, or load test a running server, from the command line
+
+        Args:
+            arguments (list): The command line arguments
+    '''
+    parser = argparse.ArgumentParser(
+        description="Hosts many games from one process over line-delimited "
+        "JSON, or load tests a running server with --load-test")
+    parser.add_argument('--host', default='127.0.0.1', help="Host to use")
+    parser.add_argument('-p',
+                        '--port',
+                        type=int,
+                        default=7007,
+                        help="Port to use")
+    parser.add_argument('--unix', help="Use a Unix socket at this path")
+    parser.add_argument('--sessions',
+                        default='sessions',
+                        help="Directory idle games are saved to")
+    parser.add_argument('--idle',
+                        type=float,
+                        default=300.0,
+                        help="Seconds before an idle game is saved")
+    parser.add_argument('--queue',
+                        type=int,
+                        default=16,
+                        help="Requests that can wait for each game")
+    parser.add_argument('--load-test',
+                        type=int,
+                        metavar='CLIENTS',
+                        help="Play random games on a running server")
+    parser.add_argument('--watchers',
+                        type=int,
+                        default=0,
+                        help="Watchers for each load test game")
+    parser.add_argument('-s',
+                        '--size',
+                        type=int,
+                        default=9,
+                        help="Rows and columns for the load test games")
+    options = parser.parse_args(arguments)
+
+    if options.load_test:
+        result = asyncio.run(
+            runLoadTest(options.load_test, options.size, options.host,
+                        options.port, options.unix, 0, options.watchers))
+        print(json.dumps(result, indent=2))
+        return
+    try:
+        asyncio.run(serve(options))
+    except KeyboardInterrupt:
+        pass
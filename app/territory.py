@@ -0,0 +1,328 @@
+'''
+    Counts the captured land (territory) for both players
+'''
+from .piece import Piece
+
+# NumPy is only imported once NumpyTerritory is used, it's slow to import
+# and most games count territory with the bitboards
+numpy = None
+
+
+def loadNumpy():
+    '''
+        Import NumPy the first time it's needed
+
+        Returns:
+            Module (or None if NumPy isn't installed)
+    '''
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+    return numpy
+
+
+def countTerritory(bitBoard, bitboards, counters=None):
+    '''
+        Count the territory for both players from their bitboards in a single
+        pass over the empty regions. A region is territory for a player if
+        none of the pieces around it belong to the other player
+
+        Args:
+            bitBoard    (BitBoard): The BitBoard for the board size
+            bitboards   (dict):     The bitboard for each piece
+            counters    (dict):     Instrumentation counters to add the
+                                    regions and points filled to
+
+        Returns:
+            Dict
+    '''
+    white, black = bitboards[Piece.White], bitboards[Piece.Black]
+    territory = {Piece.White: 0, Piece.Black: 0}
+    for region in bitBoard.groups(bitBoard.full & ~(white | black)):
+        border = bitBoard.neighbours(region)
+        if not border & black:
+            territory[Piece.White] += bitBoard.count(region)
+        if not border & white:
+            territory[Piece.Black] += bitBoard.count(region)
+        if counters is not None:
+            counters['regionsFilled'] += 1
+            counters['cellsFilled'] += bitBoard.count(region)
+    return territory
+
+
+class Regions:
+    '''
+        Regions keeps the empty regions of a board, and the territory each
+        one gives the players, up to date as pieces are placed and removed.
+        Only the regions touching the points that changed are looked at, and
+        a piece placed in a region that stays in one piece (checked on the
+        eight points around it) needs no flood fill at all.
+
+        The territory is counted as in countTerritory
+
+        Args:
+            bitBoard    (BitBoard): The BitBoard for the board size
+            bitboards   (dict):     The bitboard for each piece
+    '''
+    _rings = {}
+
+    def __init__(self, bitBoard, bitboards):
+        self.bitBoard = bitBoard
+        self.rings = self.getRings(bitBoard)
+        self.build(bitboards)
+
+    @classmethod
+    def getRings(cls, bitBoard):
+        '''
+            Get the shared masks of the eight points around each point, for
+            the board size
+
+            Args:
+                bitBoard (BitBoard): The BitBoard for the board size
+
+            Returns:
+                List
+        '''
+        key = (bitBoard.rows, bitBoard.columns)
+        if key not in cls._rings:
+            rings = []
+            for point in range(bitBoard.rows * bitBoard.columns):
+                bit = 1 << point
+                row = (bit | ((bit << 1) & bitBoard.notFirstColumn)
+                       | ((bit >> 1) & bitBoard.notLastColumn))
+                rings.append((row | (row << bitBoard.columns)
+                              | (row >> bitBoard.columns)) & bitBoard.full
+                             & ~bit)
+            cls._rings[key] = rings
+        return cls._rings[key]
+
+    def build(self, bitboards):
+        '''
+            Find every region from scratch
+
+            Args:
+                bitboards (dict): The bitboard for each piece
+        '''
+        self.regions = []
+        self.territory = {Piece.White: 0, Piece.Black: 0}
+        white, black = bitboards[Piece.White], bitboards[Piece.Black]
+        self.addRegions(self.bitBoard.groups(self.bitBoard.full
+                                             & ~(white | black)),
+                        bitboards)
+
+    def addRegions(self, regions, bitboards, counters=None):
+        '''
+            Add regions, scoring them from the pieces around them
+
+            Args:
+                regions     (iter): The masks of the regions
+                bitboards   (dict): The bitboard for each piece
+                counters    (dict): Instrumentation counters to add the
+                                    regions and points added to
+        '''
+        bitBoard = self.bitBoard
+        white, black = bitboards[Piece.White], bitboards[Piece.Black]
+        for mask in regions:
+            size = bitBoard.count(mask)
+            border = bitBoard.neighbours(mask)
+            # A region is territory for a player if it only touches them
+            whiteTerritory = 0 if border & black else size
+            blackTerritory = 0 if border & white else size
+            self.territory[Piece.White] += whiteTerritory
+            self.territory[Piece.Black] += blackTerritory
+            self.regions.append((mask, whiteTerritory, blackTerritory))
+            if counters is not None:
+                counters['regionsFilled'] += 1
+                counters['cellsFilled'] += size
+
+    def update(self, bitboards, filled, emptied, counters=None):
+        '''
+            Update the regions after pieces are placed and removed, the
+            bitboards are the position after the change
+
+            Args:
+                bitboards   (dict): The bitboard for each piece
+                filled      (int):  The mask of points given a piece
+                emptied     (int):  The mask of points that lost a piece
+                counters    (dict): Instrumentation counters to add the
+                                    regions and points added to
+        '''
+        bitBoard = self.bitBoard
+        # The regions holding a filled point, or next to an emptied one
+        touched = bitBoard.expand(emptied) if emptied else 0
+        area = emptied
+        kept = []
+        for region in self.regions:
+            if region[0] & (filled | touched):
+                area |= region[0]
+                self.territory[Piece.White] -= region[1]
+                self.territory[Piece.Black] -= region[2]
+            else:
+                kept.append(region)
+        self.regions = kept
+        area &= ~filled
+        if not area:
+            return
+        if not emptied and not filled & (filled - 1):
+            # A single piece placed, the rest of its region stays in one
+            # piece if the empty points beside it join up around it
+            point = filled.bit_length() - 1
+            sides = bitBoard.neighbours(filled) & area
+            if (not sides & (sides - 1) or not sides & ~bitBoard.flood(
+                    sides & -sides, self.rings[point] & area)):
+                self.addRegions((area, ), bitboards)
+                return
+        self.addRegions(bitBoard.groups(area), bitboards, counters)
+
+    def getTerritory(self):
+        '''
+            Get the territory for both players
+
+            Returns:
+                Dict
+        '''
+        return dict(self.territory)
+
+
+class NumpyTerritory:
+    '''
+        Counts territory with NumPy array operations. The board is held as a
+        flat int8 array with one extra point on the end, which is always
+        empty and is used as the neighbour for points on the edges.
+
+        Empty regions are labelled with the lowest point in them, spreading
+        the lowest label to empty neighbours and jumping labels to their
+        own label until nothing changes.
+
+        Use NumpyTerritory.forSize to share the neighbour table between
+        boards of the same size
+
+        Args:
+            rows    (int): The number of rows on the board
+            columns (int): The number of columns on the board
+    '''
+    _sizes = {}
+
+    def __init__(self, rows, columns):
+        if loadNumpy() is None:
+            raise ImportError("NumpyTerritory needs NumPy installed")
+        self.rows = rows
+        self.columns = columns
+        self.points = rows * columns
+        # The neighbours for each point, missing ones point at the end point
+        self.neighbours = numpy.full((self.points + 1, 4),
+                                     self.points,
+                                     dtype=numpy.intp)
+        for point in range(self.points):
+            row, col = divmod(point, columns)
+            if col > 0:
+                self.neighbours[point, 0] = point - 1
+            if row > 0:
+                self.neighbours[point, 1] = point - columns
+            if row < rows - 1:
+                self.neighbours[point, 2] = point + columns
+            if col < columns - 1:
+                self.neighbours[point, 3] = point + 1
+        self.indexes = numpy.arange(self.points + 1, dtype=numpy.intp)
+
+    @classmethod
+    def forSize(cls, rows, columns):
+        '''
+            Get the shared NumpyTerritory for the board size
+
+            Args:
+                rows    (int): The number of rows on the board
+                columns (int): The number of columns on the board
+
+            Returns:
+                NumpyTerritory
+        '''
+        key = (rows, columns)
+        if key not in cls._sizes:
+            cls._sizes[key] = cls(rows, columns)
+        return cls._sizes[key]
+
+    def makeArray(self, board):
+        '''
+            Make the flat int8 array for a board matrix
+
+            Args:
+                board (list): The board matrix
+
+            Returns:
+                numpy.ndarray
+        '''
+        array = numpy.zeros(self.points + 1, dtype=numpy.int8)
+        array[:self.points] = numpy.asarray(board, dtype=numpy.int8).ravel()
+        return array
+
+    def labelRegions(self, empty):
+        '''
+            Label the connected empty regions with the lowest point in them,
+            this works on a single board or a batch of boards
+
+            Args:
+                empty (numpy.ndarray): The mask of empty points
+
+            Returns:
+                numpy.ndarray
+        '''
+        labels = numpy.where(empty, self.indexes, self.points)
+        while True:
+            # Take the lowest label of any empty neighbour
+            spread = numpy.minimum(labels,
+                                   labels[..., self.neighbours].min(axis=-1))
+            spread = numpy.where(empty, spread, self.points)
+            # Jump each label to the label of the point it names
+            spread = numpy.take_along_axis(spread, spread, axis=-1)
+            if numpy.array_equal(spread, labels):
+                return labels
+            labels = spread
+
+    def count(self, array):
+        '''
+            Count the territory for both players in a single pass
+
+            Args:
+                array (numpy.ndarray): The flat board array
+
+            Returns:
+                Dict
+        '''
+        return {
+            piece: int(counts[0])
+            for piece, counts in self.countMany(array[numpy.newaxis]).items()
+        }
+
+    def countMany(self, arrays):
+        '''
+            Count the territory for both players on a batch of boards
+
+            Args:
+                arrays (numpy.ndarray): The flat board arrays, one per row
+
+            Returns:
+                Dict (of numpy.ndarray)
+        '''
+        games, width = arrays.shape
+        empty = arrays == Piece.NoPiece
+        empty[:, self.points] = False
+        # Offset the labels so every board has its own range of them
+        offsets = numpy.arange(games)[:, numpy.newaxis] * width
+        labels = self.labelRegions(empty) + offsets
+        # The size of each region, held against its label
+        sizes = numpy.bincount(labels[empty], minlength=games * width)
+        territory = {}
+        for piece, other in ((Piece.White, Piece.Black), (Piece.Black,
+                                                          Piece.White)):
+            # Find the regions with the other player on the border
+            bordering = arrays[:, self.neighbours] == other
+            touching = empty & bordering.any(axis=-1)
+            bordered = numpy.zeros(games * width, dtype=bool)
+            bordered[labels[touching]] = True
+            counted = numpy.where(bordered, 0, sizes)
+            territory[piece] = counted.reshape(games, width).sum(axis=1)
+        return territory
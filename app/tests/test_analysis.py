@@ -0,0 +1,49 @@
+from app.analysis import analyseMoves, loadPosition, runAnalysis
+from app.game_logic import GameLogic
+from app.journal import encodeCheckpoint
+from app.piece import Piece
+import unittest
+
+
+class TestAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.logic = GameLogic(GameLogic.makeBoard(5))
+        for row, col in ((0, 1), (0, 0), (3, 3), (4, 4)):
+            self.logic.updateBoard(row, col)
+        loadPosition(encodeCheckpoint(self.logic, 0))
+
+    def test_scores_and_captures(self):
+        results = {
+            result.point: result
+            for result in analyseMoves(range(25), playouts=4, seed=1)
+        }
+        # Occupied points are left out
+        self.assertEqual(21, len(results))
+        self.assertNotIn(0, results)
+        # Playing (1, 0) takes the piece at (0, 0)
+        capture = results[5]
+        self.assertEqual((1, 0, 1),
+                         (capture.row, capture.col, capture.captures))
+        before = self.logic.getPlayers()
+        lead = before[Piece.White].getScore() - before[Piece.Black].getScore()
+        self.logic.updateBoard(1, 0)
+        after = self.logic.getPlayers()
+        self.assertEqual(
+            after[Piece.White].getScore() - after[Piece.Black].getScore() -
+            lead, capture.scoreDelta)
+        self.assertTrue(0.0 <= capture.winRate <= 1.0)
+
+    def test_pool_matches_single_process(self):
+        expected = [
+            result.toDict()
+            for result in analyseMoves(range(25), playouts=2, seed=3)
+        ]
+        results = sorted((result.toDict() for result in runAnalysis(
+            self.logic, 2, workers=2, seed=3, chunkSize=4)),
+                         key=lambda result: result['point'])
+        self.assertListEqual(expected, results)
+        self.assertIsNone(next(runAnalysis(self.logic, workers=1)).winRate)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+from app.__main__ import main
+import app
+import contextlib
+import io
+import subprocess
+import sys
+import unittest
+
+
+class TestApp(unittest.TestCase):
+    def test_exports_are_lazy(self):
+        from app.game_logic import GameLogic
+        self.assertIs(GameLogic, app.GameLogic)
+        self.assertIn('Board', dir(app))
+        with self.assertRaises(AttributeError):
+            app.Nothing
+
+    def test_game_logic_imports_without_qt(self):
+        modules = subprocess.check_output([
+            sys.executable, '-c', "import sys, app.game_logic, app.selfplay; "
+            "print(sorted(sys.modules))"
+        ]).decode()
+        self.assertNotIn('PyQt5', modules)
+        self.assertNotIn('numpy', modules)
+
+    def test_unknown_command(self):
+        with contextlib.redirect_stderr(io.StringIO()) as error:
+            self.assertEqual(2, main(['nothing']))
+        self.assertIn("Unknown command", error.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+from app.batch import BatchGameLogic
+from app.game_logic import (GameLogic, GameOverPassError, KOError,
+                            SuicideError, OccupiedError)
+from app.piece import Piece
+from app.territory import loadNumpy
+import random
+import unittest
+
+RESULTS = {
+    None: BatchGameLogic.OK,
+    OccupiedError: BatchGameLogic.OCCUPIED,
+    KOError: BatchGameLogic.KO,
+    SuicideError: BatchGameLogic.SUICIDE,
+    GameOverPassError: BatchGameLogic.GAME_OVER
+}
+
+
+@unittest.skipIf(loadNumpy() is None, "NumPy is not installed")
+class TestBatchGameLogic(unittest.TestCase):
+    def play(self, gl, move):
+        try:
+            if move == BatchGameLogic.SKIP:
+                gl.skip()
+            else:
+                gl.updateBoard(*divmod(move, gl.columns))
+        except (GameOverPassError, KOError, SuicideError,
+                OccupiedError) as error:
+            return type(error)
+        return None
+
+    def test_matches_game_logic(self):
+        generator = random.Random(7)
+        board = [[0 for i in range(0, 5)] for j in range(0, 5)]
+        batch = BatchGameLogic(board, 12)
+        games = [GameLogic(board) for game in range(12)]
+        over = [False] * 12
+        for turn in range(150):
+            moves = [
+                BatchGameLogic.SKIP
+                if generator.random() < 0.05 else generator.randrange(25)
+                for game in games
+            ]
+            legal, results = batch.step(moves)
+            for index, (gl, move) in enumerate(zip(games, moves)):
+                if over[index]:
+                    self.assertEqual(BatchGameLogic.GAME_OVER, results[index])
+                    continue
+                error = self.play(gl, move)
+                over[index] = error is GameOverPassError
+                self.assertEqual(RESULTS[error], results[index])
+                self.assertListEqual(gl.getBoard(),
+                                     batch.getBoards()[index].tolist())
+                self.assertEqual(gl.player, batch.getPlayers()[index])
+                for piece, scores in batch.getScores().items():
+                    self.assertEqual(gl.getPlayers()[piece].getScore(),
+                                     scores[index])
+
+    def test_step_returns_legality(self):
+        board = [[0, 2, 0], [2, 0, 0], [0, 0, 0]]
+        batch = BatchGameLogic(board, 3)
+        legal, results = batch.step([0, 1, BatchGameLogic.SKIP])
+        self.assertListEqual([False, False, True], legal.tolist())
+        self.assertListEqual([
+            BatchGameLogic.SUICIDE, BatchGameLogic.OCCUPIED, BatchGameLogic.OK
+        ], results.tolist())
+        self.assertListEqual([Piece.White, Piece.White, Piece.Black],
+                             batch.getPlayers().tolist())
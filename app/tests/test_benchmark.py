@@ -0,0 +1,18 @@
+from app.benchmark import compareResults, runBenchmarks
+import unittest
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_run_and_compare(self):
+        results = runBenchmarks(sizes=(5, ), samples=3)
+        names = set(
+            (result['benchmark'], result['phase']) for result in results)
+        self.assertIn(('updateBoard', 'mid'), names)
+        self.assertIn(('replay', 'game'), names)
+        baseline = [
+            dict(result, opsPerSecond=result['opsPerSecond'] / 2)
+            for result in results
+        ]
+        compareResults(results, baseline)
+        for result in results:
+            self.assertAlmostEqual(2, result['speedup'])
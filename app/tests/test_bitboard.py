@@ -0,0 +1,58 @@
+from app.bitboard import BitBoard
+import unittest
+
+
+class TestBitBoard(unittest.TestCase):
+    def test_for_size_is_shared(self):
+        self.assertIs(BitBoard.forSize(7, 7), BitBoard.forSize(7, 7))
+        self.assertIsNot(BitBoard.forSize(7, 7), BitBoard.forSize(9, 9))
+
+    def test_expand_middle(self):
+        bb = BitBoard(7, 7)
+        self.assertListEqual([(2, 3), (3, 2), (3, 3), (3, 4), (4, 3)],
+                             bb.positions(bb.expand(bb.bit(3, 3))))
+
+    def test_neighbours_do_not_wrap_edges(self):
+        bb = BitBoard(7, 7)
+        self.assertListEqual([(0, 5), (1, 6)],
+                             bb.positions(bb.neighbours(bb.bit(0, 6))))
+        self.assertListEqual([(0, 0), (2, 0), (1, 1)],
+                             sorted(bb.positions(bb.neighbours(bb.bit(1, 0))),
+                                    key=lambda p: (p[1], p[0])))
+
+    def test_adjacents_match_neighbours(self):
+        bb = BitBoard(19, 19)
+        for point in (0, 18, 180, 360):
+            self.assertEqual(bb.neighbours(1 << point), bb.sides[point])
+            self.assertEqual(bb.sides[point],
+                             sum(1 << side for side in bb.adjacents[point]))
+
+    def test_flood_stays_within(self):
+        bb = BitBoard(7, 7)
+        within = bb.fromBoard([[1, 1, 0, 1, 0, 0, 0], [0, 1, 0, 1, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0]], 1)
+        self.assertListEqual([(0, 0), (0, 1), (1, 1)],
+                             bb.positions(bb.flood(bb.bit(0, 0), within)))
+        self.assertEqual(2, len(list(bb.groups(within))))
+
+    def test_symmetries(self):
+        self.assertEqual(8, len(BitBoard(7, 7).symmetries))
+        bb = BitBoard(3, 4)
+        self.assertEqual(4, len(bb.symmetries))
+        # Flipping the rows moves (0, 1) to (2, 1)
+        self.assertEqual(9, bb.transformPoint(1, 1))
+        self.assertEqual(1, bb.inverseTransformPoint(9, 1))
+        self.assertIsNone(bb.transformPoint(None, 1))
+        for symmetry in bb.symmetries:
+            self.assertListEqual(list(range(12)), sorted(symmetry))
+
+    def test_count(self):
+        bb = BitBoard(7, 7)
+        self.assertEqual(49, BitBoard.count(bb.full))
+        self.assertEqual(7, BitBoard.count(bb.lastColumn))
+
+    def test_bit_out_of_range(self):
+        with self.assertRaises(IndexError):
+            BitBoard(7, 7).bit(7, 0)
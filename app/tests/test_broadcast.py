@@ -0,0 +1,59 @@
+from app.broadcast import Broadcaster
+import json
+import unittest
+
+
+class Transport:
+    def __init__(self):
+        self.buffered = 0
+        self.closing = False
+
+    def is_closing(self):
+        return self.closing
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class Writer:
+    def __init__(self):
+        self.transport = Transport()
+        self.lines = []
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+    def close(self):
+        self.transport.closing = True
+
+
+class TestBroadcaster(unittest.TestCase):
+    def test_sends_deltas_and_keyframes(self):
+        broadcaster = Broadcaster(keyframeInterval=2)
+        writer = Writer()
+        broadcaster.subscribe(writer)
+        for move in range(3):
+            broadcaster.publish({
+                'event': 'delta',
+                'point': move
+            }, lambda: {'event': 'keyframe'})
+        self.assertListEqual(['delta', 'delta', 'keyframe', 'delta'],
+                             [line['event'] for line in writer.lines])
+
+    def test_drops_slow_watchers(self):
+        broadcaster = Broadcaster(bufferLimit=100)
+        slow, fast = Writer(), Writer()
+        broadcaster.subscribe(slow)
+        broadcaster.subscribe(fast)
+        slow.transport.buffered = 101
+        broadcaster.publish({'point': 1}, dict)
+        self.assertEqual(1, broadcaster.getWatcherCount())
+        self.assertEqual(1, broadcaster.dropped)
+        self.assertTrue(slow.transport.is_closing())
+        self.assertEqual([], slow.lines)
+        self.assertEqual([{'point': 1}], fast.lines)
+
+    def test_nothing_is_encoded_without_watchers(self):
+        broadcaster = Broadcaster(keyframeInterval=1)
+        broadcaster.publish({'point': 1}, self.fail)
+        self.assertEqual(0, broadcaster.sent)
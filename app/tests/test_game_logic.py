@@ -54,6 +54,22 @@ class TestGameLogic(unittest.TestCase):
         gl = GameLogic(board)
         self.assertListEqual([(0, 4), (1, 5), (0, 6)], gl.getAdjacents(0, 5))
 
+    def test_neighbours_are_shared_between_games(self):
+        first = GameLogic(GameLogic.makeBoard(19))
+        second = GameLogic(GameLogic.makeBoard(19))
+        self.assertIs(first.neighbours, second.neighbours)
+        self.assertListEqual([(18, 17), (17, 18)], first.getAdjacents(18, 18))
+
+    def test_make_board_sizes(self):
+        self.assertEqual(9, len(GameLogic.makeBoard(9)[0]))
+        self.assertEqual((25, 13),
+                         (len(GameLogic.makeBoard(25, 13)),
+                          len(GameLogic.makeBoard(25, 13)[0])))
+        with self.assertRaises(ValueError):
+            GameLogic.makeBoard(26)
+        with self.assertRaises(ValueError):
+            GameLogic([[0] * 26 for row in range(26)])
+
     #
     # def test_get_adjacents_right_edge(self):
     #
@@ -210,3 +226,253 @@ class TestGameLogic(unittest.TestCase):
         gl.skip()
         with self.assertRaises(GameOverPassError):
             gl.skip()
+
+    def test_update_board_merges_chains(self):
+        board = [[0 for i in range(0, 7)] for j in range(0, 7)]
+        gl = GameLogic(board)
+        gl.updateBoard(3, 2)
+        gl.updateBoard(0, 0)
+        gl.updateBoard(3, 4)
+        gl.updateBoard(0, 6)
+        gl.updateBoard(3, 3)
+        chain = gl.getChain(3, 3)
+        self.assertIs(chain, gl.getChain(3, 2))
+        self.assertIs(chain, gl.getChain(3, 4))
+        self.assertEqual(3, len(chain.getStones()))
+        self.assertEqual(8, len(chain.getLiberties()))
+
+    def test_update_board_capture_restores_liberties(self):
+        board = [[0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 1, 2, 0, 0, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0]]
+        gl = GameLogic(board)
+        gl.updateBoard(3, 3)
+        self.assertEqual(Piece.NoPiece, gl.getBoard()[3][2])
+        self.assertIsNone(gl.getChain(3, 2))
+        self.assertIn(3 * 7 + 2, gl.getChain(3, 3).getLiberties())
+        self.assertIn(3 * 7 + 2, gl.getChain(2, 2).getLiberties())
+
+    def test_update_board_suicide_leaves_board_unchanged(self):
+        board = [[0, 2, 0, 0, 0, 0, 0], [2, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0]]
+        gl = GameLogic(board)
+        with self.assertRaises(SuicideError):
+            gl.updateBoard(0, 0)
+        self.assertEqual(board, gl.getBoard())
+        self.assertIsNone(gl.getChain(0, 0))
+        self.assertTrue(gl.player == Piece.White)
+
+    def test_is_occupied_rule_own_piece(self):
+        board = [[0 for i in range(0, 7)] for j in range(0, 7)]
+        gl = GameLogic(board)
+        gl.updateBoard(0, 0)
+        gl.updateBoard(1, 1)
+        with self.assertRaises(OccupiedError):
+            gl.updateBoard(0, 0)
+
+    def test_position_hash_is_incremental(self):
+        board = [[0 for i in range(0, 7)] for j in range(0, 7)]
+        gl = GameLogic(board)
+        for row, col in [(2, 2), (2, 3), (3, 1), (3, 2), (4, 2), (4, 3),
+                         (1, 1), (3, 4), (3, 3)]:
+            gl.updateBoard(row, col)
+        self.assertEqual(Piece.NoPiece, gl.getBoard()[3][2])
+        self.assertEqual(gl.zobrist.hashBoard(gl.getBoard()),
+                         gl.getPositionHash())
+
+    def test_position_hash_ignores_move_order(self):
+        board = [[0 for i in range(0, 7)] for j in range(0, 7)]
+        first, second = GameLogic(board), GameLogic(board)
+        for row, col in [(0, 0), (6, 6), (1, 1), (5, 5)]:
+            first.updateBoard(row, col)
+        for row, col in [(1, 1), (5, 5), (0, 0), (6, 6)]:
+            second.updateBoard(row, col)
+        self.assertEqual(first.getPositionHash(), second.getPositionHash())
+        self.assertNotEqual(GameLogic(board).getPositionHash(),
+                            first.getPositionHash())
+
+    def test_symmetry_hash_is_incremental(self):
+        gl = GameLogic(GameLogic.makeBoard(7))
+        for row, col in [(2, 2), (2, 3), (3, 1), (3, 2), (4, 2), (4, 3),
+                         (1, 1), (3, 4), (3, 3)]:
+            gl.updateBoard(row, col)
+        gl.undo()
+        gl.seek(4)
+        self.assertEqual(gl.zobrist.hashSymmetries(gl.bitboards),
+                         gl.getSymmetryHash())
+        self.assertEqual(gl.getPositionHash(),
+                         gl.zobrist.unpackSymmetries(gl.getSymmetryHash())[0])
+
+    def test_canonical_key_ignores_symmetry_and_colour(self):
+        first = GameLogic(GameLogic.makeBoard(7))
+        first.updateBoard(0, 1)
+        first.updateBoard(2, 5)
+        first.updateBoard(3, 3)
+        # The same position turned a quarter, with the colours swapped
+        second = GameLogic(GameLogic.makeBoard(7))
+        second.skip()
+        second.updateBoard(1, 6)
+        second.updateBoard(5, 4)
+        second.updateBoard(3, 3)
+        positionHash, player, symmetry, swapped = first.getCanonicalKey()
+        self.assertEqual((positionHash, player),
+                         second.getCanonicalKey()[:2])
+        self.assertNotEqual(first.getPositionHash(),
+                            second.getPositionHash())
+        # Moves can be taken into the canonical form and back
+        bb = first.bitBoard
+        self.assertEqual(
+            20, bb.inverseTransformPoint(bb.transformPoint(20, symmetry),
+                                         symmetry))
+
+    def test_is_ko_rule_leaves_board_unchanged(self):
+        board = [[0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 1, 2, 0, 2, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0]]
+        gl = GameLogic(board)
+        gl.updateBoard(3, 3)
+        positionHash = gl.getPositionHash()
+        with self.assertRaises(KOError):
+            gl.updateBoard(3, 2)
+        self.assertEqual(positionHash, gl.getPositionHash())
+        self.assertEqual(Piece.White, gl.getBoard()[3][3])
+        self.assertTrue(gl.isKoRule(positionHash))
+
+    def test_undo_restores_captured_pieces(self):
+        board = [[0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 1, 2, 0, 0, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0]]
+        gl = GameLogic(board)
+        positionHash = gl.getPositionHash()
+        gl.updateBoard(3, 3)
+        move = gl.undo()
+        self.assertEqual((3 * 7 + 2, ), move.getCaptured())
+        self.assertEqual(board, gl.getBoard())
+        self.assertEqual(positionHash, gl.getPositionHash())
+        self.assertTrue(gl.player == Piece.White)
+        self.assertEqual(1, len(gl.getChain(3, 2).getLiberties()))
+        self.assertIsNone(gl.undo())
+
+    def test_redo_replays_undone_moves(self):
+        board = [[0 for i in range(0, 7)] for j in range(0, 7)]
+        gl = GameLogic(board)
+        gl.updateBoard(0, 0)
+        gl.skip()
+        gl.updateBoard(0, 1)
+        played = gl.copyBoard(gl.getBoard())
+        scores = gl.getScores()
+        gl.undo()
+        self.assertEqual(1, gl.skipCount)
+        self.assertTrue(gl.player == Piece.White)
+        gl.undo()
+        self.assertTrue(gl.player == Piece.Black)
+        gl.redo()
+        gl.redo()
+        self.assertEqual(played, gl.getBoard())
+        self.assertEqual(scores, gl.getScores())
+        self.assertIsNone(gl.redo())
+
+    def test_undo_restores_territory(self):
+        board = [[0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 1, 2, 0, 0, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0]]
+        gl = GameLogic(board)
+        territory = gl.getCapturedLandCounts()
+        gl.updateBoard(3, 3)
+        self.assertEqual(gl.getCapturedLandCounts(),
+                         gl.regions.getTerritory())
+        self.assertEqual(4, gl.getPlayers()[Piece.White].getPieces())
+        gl.undo()
+        self.assertEqual(territory, gl.regions.getTerritory())
+        self.assertEqual({Piece.White: 3, Piece.Black: 3}, gl.pieceCounts)
+
+    def test_clocks_charge_the_exact_time_taken(self):
+        gl = GameLogic(GameLogic.makeBoard(7))
+        now = [100.0]
+        for player in gl.getPlayers().values():
+            player.clock = lambda: now[0]
+            player.reset()
+        white, black = gl.getPlayers()[Piece.White], gl.getPlayers()[
+            Piece.Black]
+        gl.switchClocks()
+        now[0] += 2.25
+        self.assertEqual(117.75, white.getTimeRemaining())
+        gl.updateBoard(0, 0)
+        now[0] += 0.5
+        self.assertEqual(117.75, white.getTimeRemaining())
+        self.assertEqual(119.5, black.getTimeRemaining())
+        gl.skip()
+        gl.stopClocks()
+        now[0] += 10
+        self.assertFalse(white.isClockRunning())
+        self.assertEqual(119.5, black.getTimeRemaining())
+        self.assertTrue(black.hasTimeLeft())
+
+    def test_update_board_clears_redo(self):
+        board = [[0 for i in range(0, 7)] for j in range(0, 7)]
+        gl = GameLogic(board)
+        gl.updateBoard(0, 0)
+        gl.undo()
+        gl.updateBoard(1, 1)
+        self.assertIsNone(gl.redo())
+        self.assertEqual(1, len(gl.getMoves()))
+
+    def test_seek_restores_position(self):
+        board = [[0 for i in range(0, 7)] for j in range(0, 7)]
+        gl = GameLogic(board)
+        gl.history.interval = 2
+        positions = []
+        for row, col in [(2, 2), (2, 3), (3, 1), (3, 2), (4, 2), (4, 3),
+                         (1, 1), (3, 4), (3, 3)]:
+            gl.updateBoard(row, col)
+            positions.append((gl.copyBoard(gl.getBoard()), gl.getScores(),
+                              gl.getPositionHash(), gl.player))
+        gl.seek(3)
+        self.assertEqual(positions[2], (gl.getBoard(), gl.getScores(),
+                                        gl.getPositionHash(), gl.player))
+        gl.seek(9)
+        self.assertEqual(positions[8], (gl.getBoard(), gl.getScores(),
+                                        gl.getPositionHash(), gl.player))
+        gl.seek(0)
+        self.assertEqual(board, gl.getBoard())
+        self.assertEqual(1, len(gl.seenPositions))
+
+    def test_is_legal_matches_update_board(self):
+        board = [[0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 1, 2, 0, 2, 0, 0],
+                 [0, 0, 1, 2, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0]]
+        gl = GameLogic(board)
+        gl.updateBoard(3, 3)
+        positionHash = gl.getPositionHash()
+        # KO, occupied and off the board
+        self.assertFalse(gl.isLegal(3, 2))
+        self.assertFalse(gl.isLegal(3, 3))
+        self.assertFalse(gl.isLegal(7, 0))
+        self.assertTrue(gl.isLegal(0, 0))
+        self.assertEqual(positionHash, gl.getPositionHash())
+        self.assertEqual(Piece.White, gl.getBoard()[3][3])
+
+    def test_is_legal_suicide(self):
+        board = [[0, 2, 0, 0, 0, 0, 0], [2, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0]]
+        gl = GameLogic(board)
+        self.assertFalse(gl.isLegal(0, 0))
+        gl.switchPlayers()
+        self.assertTrue(gl.isLegal(0, 0))
+
+    def test_legal_moves(self):
+        board = [[0, 2, 1], [2, 0, 1], [1, 1, 1]]
+        gl = GameLogic(board)
+        # Both white moves are suicide, black can take white at (1, 1)
+        self.assertEqual(0, gl.legalMoves())
+        gl.switchPlayers()
+        self.assertEqual(1 << 0 | 1 << 4, gl.legalMoves())
@@ -0,0 +1,68 @@
+from app.gtp import GTPEngine
+from app.piece import Piece
+import io
+import unittest
+
+
+class TestGTP(unittest.TestCase):
+    def test_plays_and_reports_errors(self):
+        engine = GTPEngine(7, playouts=20, seed=1)
+        self.assertEqual("=3 2\n\n", engine.handle("3 protocol_version"))
+        self.assertIsNone(engine.handle("# a comment"))
+        self.assertEqual("= \n\n", engine.handle("play black D4"))
+        # The turn was handed to Black to go first, without a pass
+        self.assertEqual(Piece.Black, engine.logic.getBoard()[3][3])
+        self.assertEqual(0, engine.logic.skipCount)
+        self.assertEqual(1, engine.logic.getHistory().getLength())
+        self.assertEqual("? illegal move\n\n", engine.handle("play white D4"))
+        self.assertEqual("? invalid vertex\n\n", engine.handle("play w I4"))
+        self.assertEqual("? syntax error\n\n", engine.handle("play w"))
+        self.assertEqual("? unknown command\n\n", engine.handle("resign"))
+        self.assertEqual("= \n\n", engine.handle("play black A1"))
+        # An illegal move hands the turn back again
+        self.assertEqual("? illegal move\n\n", engine.handle("play black A1"))
+        self.assertEqual(Piece.White, engine.logic.player)
+
+    def test_genmove_and_score(self):
+        engine = GTPEngine(5, playouts=20, seed=2)
+        output = io.StringIO()
+        engine.run(
+            io.StringIO("komi 0.5\ngenmove b\nundo\nundo\n"
+                        "final_score\nquit\nname\n"), output)
+        responses = output.getvalue().split("\n\n")
+        self.assertRegex(responses[1], r"^= ([A-E][1-5]|pass)$")
+        # One undo takes back the move, and the turn handed to Black for it
+        self.assertEqual("= ", responses[2])
+        self.assertEqual("? cannot undo", responses[3])
+        self.assertEqual("= W+0.5", responses[4])
+        # Nothing is answered after quit
+        self.assertEqual(["= "], responses[5:-1])
+
+    def test_passes_end_the_game(self):
+        engine = GTPEngine(5, playouts=20, seed=3)
+        # Handing the first go to Black doesn't count as a pass
+        self.assertEqual("= \n\n", engine.handle("play b pass"))
+        self.assertEqual("= \n\n", engine.handle("play w D4"))
+        self.assertEqual("= \n\n", engine.handle("play b pass"))
+        self.assertEqual("= \n\n", engine.handle("play w pass"))
+        for command in ("play w C3", "play b C3", "genmove w"):
+            self.assertEqual("? the game is over\n\n",
+                             engine.handle(command))
+        # Undoing the last pass carries on the game
+        self.assertEqual("= \n\n", engine.handle("undo"))
+        self.assertEqual("= \n\n", engine.handle("play w C3"))
+        self.assertEqual(Piece.Black, engine.logic.player)
+
+    def test_illegal_move_hands_the_clocks_back(self):
+        engine = GTPEngine(5, playouts=20, seed=4)
+        self.assertEqual("= \n\n", engine.handle("play w C3"))
+        self.assertEqual("? illegal move\n\n", engine.handle("play w C3"))
+        # Black is to move, so only Black's clock runs
+        players = engine.logic.getPlayers()
+        self.assertEqual(Piece.Black, engine.logic.player)
+        self.assertTrue(players[Piece.Black].isClockRunning())
+        self.assertFalse(players[Piece.White].isClockRunning())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+from app.history import History, Keyframe
+from app.piece import Piece
+import unittest
+
+
+class TestHistory(unittest.TestCase):
+    def makeKeyframe(self, positionHash):
+        return Keyframe({}, Piece.White, 0, {}, positionHash)
+
+    def makeHistory(self, interval, moves):
+        history = History(self.makeKeyframe(0), interval)
+        for move in range(moves):
+            history.record(move, move + 1,
+                           lambda: self.makeKeyframe(history.getPosition()))
+        return history
+
+    def test_keyframe_every_interval(self):
+        history = self.makeHistory(4, 10)
+        self.assertEqual(3, len(history.keyframes))
+        keyframe, moves = history.seek(7)
+        self.assertEqual(4, keyframe.positionHash)
+        self.assertListEqual([4, 5, 6], moves)
+
+    def test_back_and_forward(self):
+        history = self.makeHistory(4, 2)
+        self.assertEqual(1, history.back())
+        self.assertEqual(1, history.getNextMove())
+        self.assertListEqual([0], history.getMoves())
+        self.assertEqual(1, history.forward())
+        self.assertIsNone(history.forward())
+
+    def test_record_replaces_undone_moves(self):
+        history = self.makeHistory(2, 5)
+        history.seek(1)
+        history.record("x", 9, lambda: self.makeKeyframe(9))
+        self.assertListEqual([0, "x"], history.getMoves())
+        self.assertListEqual([0, 1, 9], history.getHashes())
+        self.assertEqual(2, len(history.keyframes))
+        self.assertEqual(9, history.keyframes[-1].positionHash)
+
+    def test_seek_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.makeHistory(2, 0).seek(1)
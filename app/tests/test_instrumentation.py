@@ -0,0 +1,60 @@
+from app.game_logic import GameLogic, OccupiedError
+from app.instrumentation import Instrumentation
+from app.piece import Piece
+import unittest
+
+
+class TestInstrumentation(unittest.TestCase):
+    def makeGame(self, board=None):
+        if board is None:
+            board = [[Piece.NoPiece] * 7 for row in range(7)]
+        logic = GameLogic(board)
+        instrumentation = Instrumentation()
+        logic.setInstrumentation(instrumentation)
+        return logic, instrumentation
+
+    def test_records_every_phase(self):
+        logic, instrumentation = self.makeGame()
+        logic.updateBoard(3, 3)
+        summary = instrumentation.getSummary()
+        self.assertEqual(1, summary['moves'])
+        self.assertDictEqual({'OK': 1}, summary['results'])
+        for phase in Instrumentation.PHASES:
+            self.assertEqual(1, summary['phases'][phase]['calls'])
+
+    def test_hooks_get_each_move(self):
+        logic, instrumentation = self.makeGame()
+        measurements = []
+        instrumentation.addHook(measurements.append)
+        logic.updateBoard(3, 3)
+        with self.assertRaises(OccupiedError):
+            logic.updateBoard(3, 3)
+        self.assertListEqual(
+            ['OK', 'OccupiedError'],
+            [measurement['result'] for measurement in measurements])
+        # The occupied check failed, so no phase was finished
+        self.assertDictEqual({}, measurements[1]['phases'])
+        instrumentation.removeHook(measurements.append)
+        logic.updateBoard(2, 2)
+        self.assertEqual(2, len(measurements))
+
+    def test_counts_captures(self):
+        board = [[Piece.NoPiece] * 7 for row in range(7)]
+        board[0][0] = Piece.Black
+        board[0][1] = Piece.White
+        logic, instrumentation = self.makeGame(board)
+        logic.updateBoard(1, 0)
+        counters = instrumentation.getSummary()['counters']
+        self.assertEqual(1, counters['chainsVisited'])
+        self.assertEqual(1, counters['chainsCaptured'])
+        self.assertEqual(1, counters['stonesCaptured'])
+        # The captured corner and the rest of the board
+        self.assertEqual(2, counters['regionsFilled'])
+        self.assertEqual(47, counters['cellsFilled'])
+
+    def test_removing_instrumentation(self):
+        logic, instrumentation = self.makeGame()
+        logic.setInstrumentation(None)
+        logic.updateBoard(3, 3)
+        self.assertEqual(0, instrumentation.getSummary()['moves'])
+        self.assertIn("0 moves", instrumentation.report())
@@ -0,0 +1,98 @@
+from app.game_logic import GameLogic
+from app.journal import Journal
+from app.piece import Piece
+import os
+import random
+import tempfile
+import unittest
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "game.journal")
+
+    def play(self, checkpointInterval):
+        logic = GameLogic(GameLogic.makeBoard(5))
+        journal = Journal(self.path, checkpointInterval)
+        logic.setJournal(journal)
+        for row, col in ((0, 1), (0, 0), (1, 0), (2, 2), (3, 3)):
+            logic.updateBoard(row, col)
+        logic.skip()
+        logic.undo()
+        logic.undo()
+        logic.redo()
+        logic.setJournal(None)
+        journal.close()
+        return logic
+
+    def assertResumed(self, logic, resumed):
+        self.assertListEqual(logic.board, resumed.board)
+        self.assertEqual(logic.player, resumed.player)
+        self.assertEqual(logic.positionHash, resumed.positionHash)
+        self.assertEqual(logic.getScores(), resumed.getScores())
+        self.assertEqual(logic.getHistory().getLength(),
+                         resumed.getHistory().getLength())
+        self.assertEqual(logic.getHistory().getPosition(),
+                         resumed.getHistory().getPosition())
+
+    def test_resumes_from_checkpoint_and_log(self):
+        logic = self.play(checkpointInterval=4)
+        resumed = Journal(self.path).recover()
+        self.assertResumed(logic, resumed)
+        # The (0, 0) piece was taken, and the history can still be undone
+        self.assertEqual(Piece.NoPiece, resumed.board[0][0])
+        resumed.undo()
+        logic.undo()
+        self.assertListEqual(logic.board, resumed.board)
+
+    def test_ignores_torn_records_and_old_logs(self):
+        logic = self.play(checkpointInterval=100)
+        with open(self.path, 'ab') as file:
+            file.write(b"\x01\x02")
+        self.assertResumed(logic, Journal(self.path).recover())
+        # A log from before the last checkpoint isn't replayed again
+        with open(self.path, 'rb') as file:
+            stale = file.read()
+        journal = Journal(self.path)
+        resumed = journal.recover()
+        resumed.setJournal(journal)
+        journal.close()
+        with open(self.path, 'wb') as file:
+            file.write(stale)
+        self.assertResumed(resumed, Journal(self.path).recover())
+
+    def test_checkpoints_seal_blocks(self):
+        logic = GameLogic(GameLogic.makeBoard(9))
+        journal = Journal(self.path, checkpointInterval=8)
+        logic.setJournal(journal)
+        points = list(range(81))
+        random.Random(1).shuffle(points)
+        sizes = []
+        for point in points[:70]:
+            if logic.isLegalPoint(point):
+                logic.updateBoard(*divmod(point, 9))
+            sizes.append(os.path.getsize(self.path + ".checkpoint"))
+        # Replace the moves back into the first block
+        for turn in range(logic.getHistory().getPosition() - 30):
+            logic.undo()
+        logic.skip()
+        journal.checkpoint()
+        logic.setJournal(None)
+        journal.close()
+        resumed = Journal(self.path).recover()
+        self.assertResumed(logic, resumed)
+        history, resumedHistory = logic.getHistory(), resumed.getHistory()
+        self.assertEqual(history.hashes, resumedHistory.hashes)
+        self.assertEqual([move.point for move in history.moves],
+                         [move.point for move in resumedHistory.moves])
+        # The checkpoint only holds the moves after the sealed blocks
+        self.assertLess(max(sizes[40:]), 2 * max(sizes[:32]))
+
+    def test_nothing_to_resume(self):
+        self.assertIsNone(Journal(self.path).recover())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+from app.game_logic import GameLogic, GameOverPassError
+from app.mcts import MCTS
+from app.piece import Piece
+from app.transposition import TranspositionTable
+import unittest
+
+
+class TestMCTS(unittest.TestCase):
+    def test_needs_a_limit(self):
+        with self.assertRaises(ValueError):
+            MCTS(timeLimit=None, playouts=None)
+
+    def test_playout_limit(self):
+        gl = GameLogic([[0 for i in range(0, 5)] for j in range(0, 5)])
+        mcts = MCTS(timeLimit=None, playouts=50, seed=1)
+        move = mcts.search(gl)
+        self.assertEqual(50, mcts.getStats()['playouts'])
+        self.assertEqual(50,
+                         sum(visits for _, visits, _ in mcts.getRankedMoves()))
+        gl.updateBoard(*divmod(move, 5))
+
+    def test_plays_a_game(self):
+        gl = GameLogic([[0 for i in range(0, 4)] for j in range(0, 4)])
+        mcts = MCTS(timeLimit=None, playouts=30, seed=2)
+        for turn in range(20):
+            move = mcts.search(gl)
+            try:
+                if move is None:
+                    gl.skip()
+                else:
+                    # Moves from the search are always legal
+                    gl.updateBoard(*divmod(move, 4))
+            except GameOverPassError:
+                break
+
+    def test_reuses_the_tree(self):
+        gl = GameLogic([[0 for i in range(0, 5)] for j in range(0, 5)])
+        mcts = MCTS(timeLimit=None, playouts=200, seed=3)
+        move = mcts.search(gl)
+        visits = dict(
+            (move, visits) for move, visits, _ in mcts.getRankedMoves())
+        gl.updateBoard(*divmod(move, 5))
+        mcts.search(gl)
+        self.assertEqual(visits[move], mcts.getStats()['reusedVisits'])
+        self.assertEqual(Piece.White, mcts.root.player)
+        # Starting a new game drops the tree
+        gl.reset()
+        mcts.search(gl)
+        self.assertEqual(0, mcts.getStats()['reusedVisits'])
+
+    def test_starts_from_the_table(self):
+        gl = GameLogic([[0 for i in range(0, 5)] for j in range(0, 5)])
+        table = TranspositionTable()
+        MCTS(timeLimit=None, playouts=40, seed=4, table=table).search(gl)
+        mcts = MCTS(timeLimit=None, playouts=40, seed=5, table=table)
+        mcts.search(gl)
+        self.assertEqual(80, mcts.root.visits)
+        self.assertEqual(1, table.getStats()['hits'])
+
+    def test_table_keeps_board_sizes_apart(self):
+        table = TranspositionTable()
+        small = GameLogic(GameLogic.makeBoard(5))
+        MCTS(timeLimit=None, playouts=20, seed=7, table=table).search(small)
+        large = GameLogic(GameLogic.makeBoard(7))
+        mcts = MCTS(timeLimit=None, playouts=20, seed=8, table=table)
+        mcts.search(large)
+        self.assertEqual(0, table.getStats()['hits'])
+        # The root has a move for every point on the larger board
+        points = {child.move for child in mcts.root.children}
+        self.assertEqual(set(range(49)) | {None}, points)
+
+    def test_stops_when_cancelled(self):
+        gl = GameLogic([[0 for i in range(0, 5)] for j in range(0, 5)])
+        mcts = MCTS(timeLimit=None, playouts=1000, seed=6)
+        board = mcts.prepare(gl)
+        mcts.run(board, lambda: mcts.root.visits >= 10)
+        self.assertEqual(10, mcts.getStats()['playouts'])
+        # The move picked is legal in the game
+        gl.updateBoard(*divmod(mcts.getLegalMove(gl), 5))
@@ -0,0 +1,61 @@
+from app.game_logic import (GameLogic, KOError, OccupiedError, SuicideError)
+from app.piece import Piece
+from app.playout import PlayoutBoard
+import random
+import unittest
+
+
+class TestPlayoutBoard(unittest.TestCase):
+    def test_matches_game_logic(self):
+        generator = random.Random(5)
+        gl = GameLogic([[0 for i in range(0, 5)] for j in range(0, 5)])
+        board = PlayoutBoard.fromGameLogic(gl)
+        for turn in range(300):
+            point = generator.randrange(25)
+            try:
+                gl.updateBoard(*divmod(point, 5))
+                legal = True
+            except (KOError, SuicideError, OccupiedError):
+                legal = False
+            self.assertEqual(legal, board.play(point))
+            self.assertDictEqual(gl.bitboards, board.bitboards)
+            self.assertEqual(gl.positionHash, board.positionHash)
+        self.assertDictEqual(
+            {
+                piece: score
+                for piece, (score, pieces) in gl.getScores().items()
+            }, board.getScores())
+
+    def test_simple_ko_without_superko(self):
+        board = PlayoutBoard(4, 4)
+        board.superko = False
+        # Black takes a white stone, then white can't take straight back
+        board.bitboards[Piece.White] = sum(1 << point
+                                           for point in (2, 5, 7, 10))
+        board.bitboards[Piece.Black] = sum(1 << point for point in (1, 4, 9))
+        board.player = Piece.Black
+        self.assertTrue(board.play(6))
+        self.assertEqual(5, board.ko)
+        self.assertFalse(board.play(5))
+        # Once a go has been played elsewhere, it can
+        board.skip()
+        board.skip()
+        self.assertTrue(board.play(5))
+        self.assertFalse(board.bitboards[Piece.Black] >> 6 & 1)
+
+    def test_copy_is_independent(self):
+        board = PlayoutBoard(3, 3)
+        copy = board.copy()
+        copy.play(4)
+        self.assertEqual(0, board.bitboards[Piece.White])
+        self.assertEqual(Piece.White, board.player)
+        self.assertSetEqual(set(), board.playedPositions)
+
+    def test_random_playout_ends(self):
+        board = PlayoutBoard(5, 5)
+        generator = random.Random(1)
+        for move in range(200):
+            if board.isOver():
+                break
+            board.playRandom(generator)
+        self.assertTrue(board.isOver())
@@ -0,0 +1,37 @@
+from app.piece import Piece
+from app.selfplay import getSeed, playGame, runSelfPlay
+import unittest
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_game_is_repeatable(self):
+        first = playGame(5, getSeed(3, 0)).toDict()
+        second = playGame(5, getSeed(3, 0)).toDict()
+        del first['timings'], second['timings']
+        self.assertDictEqual(first, second)
+
+    def test_record(self):
+        record = playGame(5, getSeed(0, 1), 1, 'capture')
+        self.assertEqual(record.moves, len(record.timings))
+        self.assertLessEqual(record.moves, 75)
+        scores = record.scores
+        if scores[Piece.White] == scores[Piece.Black]:
+            self.assertIsNone(record.winner)
+        else:
+            self.assertEqual(max(scores, key=scores.get), record.winner)
+
+    def test_move_limit(self):
+        self.assertEqual(4, playGame(5, getSeed(0, 0), maxMoves=4).moves)
+
+    def test_pool_matches_single_games(self):
+        records = sorted(runSelfPlay(4, 5, workers=2, seed=9),
+                         key=lambda record: record.game)
+        self.assertListEqual([0, 1, 2, 3], [record.game for record in records])
+        for record in records:
+            expected = playGame(5, getSeed(9, record.game), record.game)
+            self.assertEqual(expected.scores, record.scores)
+            self.assertEqual(expected.moves, record.moves)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            next(runSelfPlay(1, 5, policy='missing'))
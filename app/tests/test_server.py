@@ -0,0 +1,152 @@
+from app.server import GameServer
+import asyncio
+import json
+import tempfile
+import unittest
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_plays_moves_and_reports_errors(self):
+        async def play():
+            server = GameServer()
+            state = await server.handle({'op': 'create', 'size': 9})
+            session = state['session']
+            move = {'op': 'move', 'session': session, 'row': 4, 'col': 4}
+            played = await server.handle(dict(move, id=1))
+            occupied = await server.handle(move)
+            board = await server.handle({'op': 'state', 'session': session})
+            unknown = await server.handle({'op': 'state', 'session': 'x'})
+            await server.close()
+            return played, occupied, board, unknown
+
+        played, occupied, board, unknown = asyncio.run(play())
+        self.assertTrue(played['ok'])
+        self.assertEqual(1, played['id'])
+        self.assertEqual("Black", played['player'])
+        self.assertFalse(occupied['ok'])
+        self.assertEqual('OccupiedError', occupied['error'])
+        self.assertEqual("....W....", board['board'][4])
+        self.assertEqual('ProtocolError', unknown['error'])
+
+    def test_fields_of_the_wrong_type(self):
+        async def play():
+            server = GameServer()
+            responses = [
+                await server.handle(request) for request in (
+                    {'op': 'create', 'size': None},
+                    {'op': 'create', 'time': [1]},
+                    {'op': 'create', 'size': "nine"},
+                    {'op': 'move', 'session': [1]},
+                    {'op': 'state', 'session': {'id': 1}},
+                )
+            ]
+            await server.close()
+            return responses
+
+        for response in asyncio.run(play()):
+            self.assertFalse(response['ok'])
+            self.assertEqual('ProtocolError', response['error'])
+
+    def test_clock_ends_the_game(self):
+        async def play():
+            server = GameServer()
+            state = await server.handle({'op': 'create', 'time': 0.05})
+            await asyncio.sleep(0.1)
+            state = await server.handle({
+                'op': 'state',
+                'session': state['session']
+            })
+            await server.close()
+            return state
+
+        state = asyncio.run(play())
+        self.assertEqual('time', state['result']['reason'])
+        self.assertEqual(0, state['clocks']['White'])
+
+    def test_idle_sessions_are_saved_and_loaded(self):
+        async def play():
+            server = GameServer(self.directory, idleSeconds=0)
+            state = await server.handle({'op': 'create', 'size': 7})
+            session = state['session']
+            await server.handle({
+                'op': 'move',
+                'session': session,
+                'row': 0,
+                'col': 0
+            })
+            await server.handle({'op': 'skip', 'session': session})
+            self.assertEqual(1, server.evictIdle())
+            self.assertEqual(0, len(server.sessions))
+            state = await server.handle({'op': 'state', 'session': session})
+            await server.close()
+            return state
+
+        state = asyncio.run(play())
+        self.assertTrue(state['ok'])
+        self.assertEqual(2, state['moves'])
+        self.assertEqual("White", state['player'])
+        self.assertEqual("W......", state['board'][0])
+
+    def test_serves_lines_over_tcp(self):
+        async def play():
+            server = GameServer()
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"op": "create", "id": "a"}\nnot json\n')
+            created = json.loads(await reader.readline())
+            broken = json.loads(await reader.readline())
+            writer.close()
+            # Let the server see the connection close
+            await asyncio.sleep(0.01)
+            listener.close()
+            await listener.wait_closed()
+            await server.close()
+            return created, broken
+
+        created, broken = asyncio.run(play())
+        self.assertEqual("a", created['id'])
+        self.assertEqual(7, created['size'])
+        self.assertEqual('ProtocolError', broken['error'])
+
+    def test_watchers_get_deltas(self):
+        async def play():
+            server = GameServer()
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            state = await server.handle({'op': 'create'})
+            session = state['session']
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(
+                json.dumps({
+                    'op': 'watch',
+                    'session': session
+                }).encode() + b"\n")
+            keyframe = json.loads(await reader.readline())
+            await server.handle({
+                'op': 'move',
+                'session': session,
+                'row': 1,
+                'col': 2
+            })
+            delta = json.loads(await reader.readline())
+            watchers = server.getStats()['watchers']
+            writer.close()
+            await asyncio.sleep(0.01)
+            listener.close()
+            await listener.wait_closed()
+            await server.close()
+            return keyframe, delta, watchers
+
+        keyframe, delta, watchers = asyncio.run(play())
+        self.assertEqual('keyframe', keyframe['event'])
+        self.assertEqual(7, len(keyframe['board']))
+        self.assertEqual('delta', delta['event'])
+        self.assertEqual(('White', 9, []),
+                         (delta['piece'], delta['point'], delta['captured']))
+        self.assertEqual(1, watchers)
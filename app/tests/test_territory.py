@@ -0,0 +1,71 @@
+from app.bitboard import BitBoard
+from app.piece import Piece
+from app.territory import (NumpyTerritory, Regions, countTerritory,
+                           loadNumpy)
+import unittest
+
+BOARD = [[0, 0, 1, 0, 2, 0, 0], [0, 0, 1, 0, 2, 0, 0], [1, 1, 1, 0, 2, 2, 2],
+         [0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0], [2, 2, 2, 0, 0, 0, 0],
+         [0, 1, 2, 0, 0, 0, 0]]
+
+
+class TestTerritory(unittest.TestCase):
+    def countBits(self, board):
+        bitBoard = BitBoard.forSize(len(board), len(board[0]))
+        return countTerritory(
+            bitBoard, {
+                piece: bitBoard.fromBoard(board, piece)
+                for piece in (Piece.White, Piece.Black)
+            })
+
+    def test_count_territory(self):
+        self.assertEqual({
+            Piece.White: 4,
+            Piece.Black: 4
+        }, self.countBits(BOARD))
+
+    def test_count_territory_empty_board(self):
+        board = [[0 for i in range(0, 7)] for j in range(0, 7)]
+        self.assertEqual({
+            Piece.White: 49,
+            Piece.Black: 49
+        }, self.countBits(board))
+
+    def test_regions_match_count_after_updates(self):
+        bitBoard = BitBoard.forSize(7, 7)
+        bitboards = {
+            piece: bitBoard.fromBoard(BOARD, piece)
+            for piece in (Piece.White, Piece.Black)
+        }
+        regions = Regions(bitBoard, bitboards)
+        self.assertEqual(self.countBits(BOARD), regions.getTerritory())
+        # Split the open region in two with a wall of black
+        board = [list(row) for row in BOARD]
+        for col in range(3, 7):
+            board[4][col] = Piece.Black
+            bitboards[Piece.Black] |= bitBoard.bit(4, col)
+            regions.update(bitboards, bitBoard.bit(4, col), 0)
+            self.assertEqual(self.countBits(board), regions.getTerritory())
+        # Take the white pieces off the top left corner
+        for row, col in [(0, 2), (1, 2), (2, 0), (2, 1), (2, 2)]:
+            board[row][col] = Piece.NoPiece
+            bitboards[Piece.White] &= ~bitBoard.bit(row, col)
+        regions.update(bitboards, 0, bitBoard.fromBoard(BOARD, Piece.White)
+                       & ~bitBoard.bit(6, 1))
+        board[6][1] = Piece.White
+        self.assertEqual(self.countBits(board), regions.getTerritory())
+
+    @unittest.skipIf(loadNumpy() is None, "NumPy is not installed")
+    def test_numpy_matches_bitboards(self):
+        territory = NumpyTerritory.forSize(7, 7)
+        self.assertEqual(self.countBits(BOARD),
+                         territory.count(territory.makeArray(BOARD)))
+
+    @unittest.skipIf(loadNumpy() is None, "NumPy is not installed")
+    def test_numpy_labels_regions_with_lowest_point(self):
+        territory = NumpyTerritory.forSize(7, 7)
+        array = territory.makeArray(BOARD)
+        labels = territory.labelRegions(array == Piece.NoPiece)
+        self.assertEqual(0, labels[8])
+        self.assertEqual(3, labels[48])
+        self.assertEqual(5, labels[13])
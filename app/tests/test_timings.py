@@ -0,0 +1,20 @@
+from app.timings import getPercentile, summarise
+import unittest
+
+
+class TestTimings(unittest.TestCase):
+    def test_percentile(self):
+        ordered = list(range(101))
+        self.assertEqual(50, getPercentile(ordered, 50))
+        self.assertEqual(99, getPercentile(ordered, 99))
+
+    def test_summarise(self):
+        result = summarise([0.002, 0.001, 0.003], 4)
+        self.assertEqual(3, result['samples'])
+        self.assertEqual(4, result['repeat'])
+        self.assertAlmostEqual(500, result['opsPerSecond'])
+        self.assertAlmostEqual(2000, result['p50Micros'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+from app.game_logic import GameLogic
+from app.transposition import TranspositionTable, positionKey
+import unittest
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        table = TranspositionTable(2)
+        table.put('a', 1)
+        table.put('b', 2)
+        self.assertEqual(1, table.get('a'))
+        table.put('c', 3)
+        self.assertIsNone(table.get('b'))
+        self.assertEqual(2, len(table))
+        stats = table.getStats()
+        self.assertEqual((1, 1, 1),
+                         (stats['hits'], stats['misses'], stats['evictions']))
+
+    def test_keys_by_position_and_player(self):
+        first = GameLogic(GameLogic.makeBoard(5))
+        first.updateBoard(0, 1)
+        first.updateBoard(2, 2)
+        first.updateBoard(4, 3)
+        second = GameLogic(GameLogic.makeBoard(5))
+        second.updateBoard(4, 3)
+        second.updateBoard(2, 2)
+        second.updateBoard(0, 1)
+        self.assertEqual(positionKey(first), positionKey(second))
+        second.skip()
+        self.assertNotEqual(positionKey(first), positionKey(second))
+        # Every size's empty board hashes the same, the key tells them apart
+        self.assertNotEqual(positionKey(GameLogic(GameLogic.makeBoard(5))),
+                            positionKey(GameLogic(GameLogic.makeBoard(7))))
+
+    def test_symmetric_keys(self):
+        first = GameLogic(GameLogic.makeBoard(5))
+        first.updateBoard(0, 1)
+        first.updateBoard(1, 3)
+        # The same position turned a quarter
+        second = GameLogic(GameLogic.makeBoard(5))
+        second.updateBoard(1, 4)
+        second.updateBoard(3, 3)
+        self.assertNotEqual(positionKey(first), positionKey(second))
+        self.assertEqual(positionKey(first, True), positionKey(second, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+from app.game_logic import GameLogic, OccupiedError
+from app.mcts import MCTS
+from app.piece import Piece
+import unittest
+
+try:
+    from PyQt5.QtCore import QCoreApplication
+except ImportError:
+    QCoreApplication = None
+
+
+@unittest.skipIf(QCoreApplication is None, "PyQt5 is not installed")
+class TestEngineWorker(unittest.TestCase):
+    def setUp(self):
+        from app.worker import EngineWorker
+        self.application = (QCoreApplication.instance()
+                            or QCoreApplication([]))
+        self.worker = EngineWorker()
+        self.results = []
+        self.worker.resultSignal.connect(self.results.append)
+        self.logic = GameLogic(GameLogic.makeBoard(5))
+
+    def finish(self):
+        self.worker.wait()
+        self.application.processEvents()
+
+    def test_plays_one_move_per_go(self):
+        # Clicks made before the worker gets the game play one move
+        with self.worker.lock:
+            for col in range(3):
+                self.worker.play(self.logic, 0, col)
+        self.finish()
+        self.assertEqual(1, self.logic.getHistory().getPosition())
+        self.assertEqual(1, len(self.results))
+        self.assertIsNone(self.results[0]['error'])
+        self.assertEqual(Piece.Black, self.logic.player)
+        # An occupied point comes back as an error
+        point = self.results[0]['point']
+        self.worker.play(self.logic, *divmod(point, 5))
+        self.finish()
+        self.assertIsInstance(self.results[1]['error'], OccupiedError)
+
+    def test_cancel_stops_the_search(self):
+        computer = MCTS(timeLimit=30.0, seed=1)
+        self.worker.search(self.logic, computer)
+        self.worker.cancel()
+        self.finish()
+        self.assertEqual([], self.results)
+        self.assertEqual(0, self.logic.getHistory().getPosition())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+'''
+    Summarises timings as ops/sec and percentiles, for the benchmarks and
+    load tests
+'''
+PERCENTILES = (50, 90, 99)
+
+
+def getPercentile(ordered, percentile):
+    '''
+        Get a percentile of some sorted values, by nearest rank
+
+        Args:
+            ordered     (list):  The sorted values
+            percentile  (float): The percentile to get
+
+        Returns:
+            Float
+    '''
+    rank = int(round(percentile / 100.0 * (len(ordered) - 1)))
+    return ordered[rank]
+
+
+def summarise(timings, repeat=1):
+    '''
+        Summarise the seconds each call took as ops/sec and percentiles
+
+        Args:
+            timings (list): The seconds per call of each sample
+            repeat  (int):  The calls made in each sample
+
+        Returns:
+            Dict
+    '''
+    timings = sorted(timings)
+    mean = sum(timings) / len(timings)
+    result = {
+        'samples': len(timings),
+        'repeat': repeat,
+        'opsPerSecond': 1 / mean if mean else 0.0,
+        'meanMicros': mean * 1e6
+    }
+    for percentile in PERCENTILES:
+        result['p{}Micros'.format(percentile)] = getPercentile(
+            timings, percentile) * 1e6
+    return result
@@ -0,0 +1,120 @@
+'''
+    A bounded cache of positions, shared by the search and analysis code
+'''
+from collections import OrderedDict
+
+from .zobrist import ZobristTable
+
+
+class TranspositionTable:
+    '''
+        TranspositionTable caches a value for each position, so a position
+        reached by a different order of moves isn't worked out again. Keys
+        are made with positionKey, from the position's hash, the player to
+        move and the size of the board.
+
+        The table holds at most capacity entries. Looking an entry up makes
+        it the most recently used, and adding one to a full table evicts
+        the least recently used, so memory stays capped however long the
+        search runs
+
+        Args:
+            capacity (int): The most entries to hold
+    '''
+    CAPACITY = 1 << 16
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or self.CAPACITY
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        '''
+            Look up a position, counting the hit or miss
+
+            Args:
+                key     (tuple): The key from positionKey
+                default (any):   Returned if the position isn't cached
+
+            Returns:
+                Any
+        '''
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        '''
+            Cache the value for a position, evicting the least recently used
+            entry if the table is full
+
+            Args:
+                key     (tuple): The key from positionKey
+                value   (any):   The value to cache
+        '''
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = value
+
+    def clear(self):
+        '''
+            Empty the table and its stats
+        '''
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def getStats(self):
+        '''
+            Get the hits, misses and evictions
+
+            Returns:
+                Dict
+        '''
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hitRate': self.hits / lookups if lookups else 0.0
+        }
+
+
+def positionKey(board, symmetric=False):
+    '''
+        Make the key for a position, from its hash, the player to move and
+        the size of the board. The size keeps positions on different boards
+        apart, every size's hash of the empty board is 0. A symmetric key is
+        the same for every rotation, reflection and colour swap of the
+        position (with the player to move swapped too), it suits values for
+        the player to move (such as a win rate). Moves should be stored in
+        the canonical form, see ZobristTable.canonicalise
+
+        Args:
+            board       (GameLogic): The position, a GameLogic or PlayoutBoard
+            symmetric   (bool):      Make the key from the position's
+                                     canonical form
+
+        Returns:
+            Tuple
+    '''
+    size = (board.rows, board.columns)
+    if not symmetric:
+        return (board.positionHash, board.player) + size
+    zobrist = ZobristTable.forSize(board.rows, board.columns)
+    return zobrist.canonicalise(board.getSymmetryHash(),
+                                board.player)[:2] + size
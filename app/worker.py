@@ -0,0 +1,215 @@
+'''
+    Runs the game's moves and the computer player's searches off the GUI
+    thread
+'''
+import threading
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .game_logic import GameOverPassError, KOError, OccupiedError, SuicideError
+
+
+class EngineWorker(QThread):
+    '''
+        EngineWorker plays moves and runs the computer player's searches on
+        its own thread, so the GUI thread never waits for the engine.
+
+        Requests are coalesced, the worker holds at most one waiting request
+        and a new one replaces it. Each request is for the player whose go
+        it is when it's made, and is dropped if that's no longer the case
+        when it runs, so a burst of clicks plays one move.
+
+        cancel drops the waiting request and stops a running search at its
+        next playout, nothing is played for either. Each result carries the
+        generation it was requested in, a result from before a cancel is
+        stale and is left out of the game. The thread finishes once there
+        are no requests, and is started again by the next one.
+
+        The game is shared with the GUI thread, so anything reading or
+        changing it holds lock. The worker only holds it while it reads or
+        changes the game, not while the playouts run
+
+        Args:
+            parent (QObject): The worker's parent
+    '''
+    # Signal for a request's result, a dict with the generation, the point
+    # played (None for a skip), any error, and if the game ended
+    resultSignal = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Held by anything using the game
+        self.lock = threading.RLock()
+        # Guards the waiting request
+        self.guard = threading.Lock()
+        self.request = None
+        self.generation = 0
+        # Is the thread taking requests
+        self.active = False
+
+    def play(self, logic, row, col):
+        '''
+            Play the current player's piece at a row, col
+
+            Args:
+                logic   (GameLogic): The game
+                row     (int):       The row
+                col     (int):       The col
+        '''
+        self.submit('play', logic, row * logic.columns + col)
+
+    def search(self, logic, computer):
+        '''
+            Search for the current player's move and play it, or skip
+
+            Args:
+                logic       (GameLogic): The game
+                computer    (MCTS):      The computer player
+        '''
+        self.submit('search', logic, computer)
+
+    def submit(self, kind, logic, argument):
+        '''
+            Replace the waiting request, starting the thread if it has
+            finished
+
+            Args:
+                kind        (str):       The request, play or search
+                logic       (GameLogic): The game
+                argument    (any):       The point or computer player
+        '''
+        with self.guard:
+            self.request = (kind, logic, logic.player, argument,
+                            self.generation)
+            if self.active:
+                return
+            self.active = True
+        # Let a thread that's just run out of requests finish first
+        self.wait()
+        self.start()
+
+    def cancel(self):
+        '''
+            Drop the waiting request, and stop any running one
+        '''
+        with self.guard:
+            self.generation += 1
+            self.request = None
+
+    def isCancelled(self, generation):
+        '''
+            Has a request been cancelled
+
+            Args:
+                generation (int): The generation it was requested in
+
+            Returns:
+                Bool
+        '''
+        return generation != self.generation
+
+    def stop(self):
+        '''
+            Cancel any request and wait for the thread to finish
+        '''
+        self.cancel()
+        self.wait()
+
+    def run(self):
+        '''
+            Take requests until there are none left, emitting their results
+        '''
+        while True:
+            with self.guard:
+                if self.request is None:
+                    self.active = False
+                    return
+                request, self.request = self.request, None
+            kind, logic, player, argument, generation = request
+            if kind == 'play':
+                result = self.playPoint(logic, player, argument, generation)
+            else:
+                result = self.playSearch(logic, player, argument, generation)
+            if result is not None:
+                self.resultSignal.emit(result)
+
+    def playPoint(self, logic, player, point, generation):
+        '''
+            Play a piece for a player, if it's still their go
+
+            Args:
+                logic       (GameLogic): The game
+                player      (Piece):     The player to move
+                point       (int):       The flat point index
+                generation  (int):       The generation it was requested in
+
+            Returns:
+                Dict (the result, or None if nothing was tried)
+        '''
+        error = None
+        with self.lock:
+            if self.isCancelled(generation) or logic.player != player:
+                return None
+            try:
+                logic.updateBoard(*divmod(point, logic.columns))
+            except (KOError, SuicideError, OccupiedError) as exception:
+                error = exception
+        return self.makeResult(generation, point, error)
+
+    def playSearch(self, logic, player, computer, generation):
+        '''
+            Search for a player's move and play it, if it's still their go
+
+            Args:
+                logic       (GameLogic): The game
+                player      (Piece):     The player to move
+                computer    (MCTS):      The computer player
+                generation  (int):       The generation it was requested in
+
+            Returns:
+                Dict (the result, or None if nothing was played)
+        '''
+        with self.lock:
+            if self.isCancelled(generation) or logic.player != player:
+                return None
+            board = computer.prepare(logic)
+        # The playouts only use the copy of the position
+        computer.run(board, lambda: self.isCancelled(generation))
+        gameOver = False
+        with self.lock:
+            if self.isCancelled(generation) or logic.player != player:
+                return None
+            # Play the best move that's still legal, or skip
+            move = computer.getLegalMove(logic)
+            try:
+                if move is None:
+                    logic.skip()
+                else:
+                    logic.updateBoard(*divmod(move, logic.columns))
+            except GameOverPassError:
+                gameOver = True
+        result = self.makeResult(generation, move, gameOver=gameOver)
+        result['playoutsPerSecond'] = computer.getPlayoutsPerSecond()
+        return result
+
+    @staticmethod
+    def makeResult(generation, point, error=None, gameOver=False):
+        '''
+            Make the result of a request
+
+            Args:
+                generation  (int):       The generation it was requested in
+                point       (int):       The point played, None for a skip
+                error       (Exception): Why the move wasn't played, if it
+                                         wasn't
+                gameOver    (bool):      Did the move end the game
+
+            Returns:
+                Dict
+        '''
+        return {
+            'generation': generation,
+            'point': point,
+            'error': error,
+            'gameOver': gameOver
+        }
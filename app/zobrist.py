@@ -0,0 +1,161 @@
+'''
+    Zobrist hashing for board positions
+'''
+import random
+from .bitboard import BitBoard
+from .piece import Piece
+
+
+class ZobristTable:
+    '''
+        A table of random 64 bit keys, one for each piece on each point of
+        the board. The hash of a position is the xor of the keys of every
+        piece on the board, so placing or removing a piece is a single xor.
+
+        The keys are generated from a fixed seed so that hashes are the same
+        across processes. Use ZobristTable.forSize to share the table between
+        boards of the same size
+
+        Args:
+            rows    (int): The number of rows on the board
+            columns (int): The number of columns on the board
+    '''
+    SEED = 0x5EED
+    BITS = 64
+
+    _sizes = {}
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        generator = random.Random(self.SEED)
+        self.keys = {
+            piece: [
+                generator.getrandbits(self.BITS)
+                for point in range(rows * columns)
+            ]
+            for piece in (Piece.White, Piece.Black)
+        }
+        # The keys of each piece on each point under every symmetry, then
+        # for the other piece (as if the colours were swapped), packed into
+        # one int to update the hashes of every symmetry at once
+        symmetries = BitBoard.forSize(rows, columns).symmetries
+        self.symmetryCount = len(symmetries)
+        self.symmetryKeys = {}
+        for piece, other in ((Piece.White, Piece.Black),
+                             (Piece.Black, Piece.White)):
+            keys = []
+            for point in range(rows * columns):
+                images = [symmetry[point] for symmetry in symmetries]
+                hashes = ([self.keys[piece][image] for image in images] +
+                          [self.keys[other][image] for image in images])
+                keys.append(
+                    sum(key << (self.BITS * index)
+                        for index, key in enumerate(hashes)))
+            self.symmetryKeys[piece] = keys
+
+    @classmethod
+    def forSize(cls, rows, columns):
+        '''
+            Get the shared ZobristTable for the board size
+
+            Args:
+                rows    (int): The number of rows on the board
+                columns (int): The number of columns on the board
+
+            Returns:
+                ZobristTable
+        '''
+        key = (rows, columns)
+        if key not in cls._sizes:
+            cls._sizes[key] = cls(rows, columns)
+        return cls._sizes[key]
+
+    def getKey(self, piece, point):
+        '''
+            Get the key for a piece at the flat point index
+
+            Args:
+                piece (Piece): The piece
+                point (int):   The flat point index
+
+            Returns:
+                Int
+        '''
+        return self.keys[piece][point]
+
+    def hashBoard(self, board):
+        '''
+            Hash a board matrix from scratch
+
+            Args:
+                board (list): The board matrix
+
+            Returns:
+                Int
+        '''
+        positionHash = 0
+        for row, cells in enumerate(board):
+            for col, cell in enumerate(cells):
+                if cell != Piece.NoPiece:
+                    positionHash ^= self.keys[cell][row * self.columns + col]
+        return positionHash
+
+    def hashSymmetries(self, bitboards):
+        '''
+            Hash a position from scratch under every symmetry of the board,
+            and again with the colours swapped. The hashes are packed into
+            one int, BITS apiece, so they can all be updated with one xor of
+            a key from symmetryKeys
+
+            Args:
+                bitboards (dict): The bitboard for each piece
+
+            Returns:
+                Int
+        '''
+        packed = 0
+        for piece, bitboard in bitboards.items():
+            keys = self.symmetryKeys[piece]
+            for point in BitBoard.points(bitboard):
+                packed ^= keys[point]
+        return packed
+
+    def unpackSymmetries(self, packed):
+        '''
+            Split the hashes from hashSymmetries, the position under each
+            symmetry then the same with the colours swapped. The first is
+            the position's own hash
+
+            Args:
+                packed (int): The packed hashes
+
+            Returns:
+                List
+        '''
+        mask = (1 << self.BITS) - 1
+        return [(packed >> (self.BITS * index)) & mask
+                for index in range(2 * self.symmetryCount)]
+
+    def canonicalise(self, packed, player):
+        '''
+            Pick the canonical form of a position, the symmetry (and colour
+            swap) with the smallest hash. Positions that are rotations,
+            reflections or colour swaps of each other (with the player to
+            move swapped too) have the same canonical form
+
+            Args:
+                packed  (int):   The packed hashes from hashSymmetries
+                player  (Piece): The player to move
+
+            Returns:
+                Tuple (hash, player to move, symmetry, swapped), move a
+                point into the canonical form with BitBoard.transformPoint
+                and the symmetry
+        '''
+        hashes = self.unpackSymmetries(packed)
+        index = hashes.index(min(hashes))
+        swapped = index >= self.symmetryCount
+        if swapped:
+            player = Piece.Black if player == Piece.White else Piece.White
+        return (hashes[index], player, index % self.symmetryCount, swapped)
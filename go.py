@@ -1,10 +1,11 @@
 '''
     App Runner - Executes the QApplication
+
+    Pass a board size to start on it, e.g. go.py 19. Set PYGO_INSTRUMENT to
+    time each move, the report is written to stderr when the app closes. Set
+    PYGO_JOURNAL to a file to journal the game to, the game in it is resumed
 '''
-from PyQt5.QtWidgets import QApplication
-from app.go import Go
+from app.go import main
 import sys
 
-app = QApplication([])
-myGo = Go()
-sys.exit(app.exec_())
+sys.exit(main())
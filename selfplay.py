@@ -0,0 +1,8 @@
+'''
+    Self-play Runner - Plays headless games across every core, writing a
+    JSON record for each game as it finishes
+'''
+from app.selfplay import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+'''
+    Game Server - Hosts many games from one process over line-delimited
+    JSON, or load tests a running server with --load-test
+'''
+from app.server import main
+
+if __name__ == '__main__':
+    main()